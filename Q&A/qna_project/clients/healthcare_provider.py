@@ -1,10 +1,16 @@
 from pathlib import Path
-from typing import Dict, List, Optional, Literal
+from typing import Any, Dict, Optional, Literal, Tuple
+import copy
 import json
 import logging
+import sys
+import threading
+import time
 from dataclasses import dataclass
 
 from qna_project.config.settings import Settings
+from qna_project.clients.json_cache import JSONCache
+from qna_project.clients.knowledge_base import PLANS, PROVIDERS, filter_document, load_knowledge_base
 
 @dataclass
 class HealthcareFilter:
@@ -12,8 +18,8 @@ class HealthcareFilter:
     plan: Literal['gold', 'silver', 'bronze']           # Validation for plans
 
     def __post_init__(self):
-        valid_providers = {'maccabi', 'meuhedet', 'clalit'}
-        valid_plans = {'gold', 'silver', 'bronze'}
+        valid_providers = set(PROVIDERS)
+        valid_plans = set(PLANS)
         
         if self.provider not in valid_providers:
             raise ValueError(f"Invalid provider. Must be one of: {valid_providers}")
@@ -21,87 +27,168 @@ class HealthcareFilter:
         if self.plan not in valid_plans:
             raise ValueError(f"Invalid plan. Must be one of: {valid_plans}")
 
+class FrozenDict(dict):
+    """
+    Read-only dict; still a dict, so json.dumps serializes it as usual.
+
+    copy.copy and copy.deepcopy return plain, mutable dicts (deepcopy also turns
+    the nested tuples back into lists); pickling preserves the FrozenDict.
+    """
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Precomputed healthcare data is read-only")
+
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __copy__(self) -> Dict:
+        return dict(self)
+
+    def __deepcopy__(self, memo: Dict) -> Dict:
+        return thaw(self, memo)
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+def freeze(value: Any) -> Any:
+    """Recursively convert dicts to FrozenDict and lists to tuples, interning strings"""
+    if isinstance(value, str):
+        # The views repeat the same page texts, so each distinct string is kept once
+        return sys.intern(value)
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+def thaw(value: Any, memo: Optional[Dict] = None) -> Any:
+    """Recursively convert FrozenDicts to dicts and tuples to lists (a mutable deep copy)"""
+    if isinstance(value, dict):
+        return {key: thaw(item, memo) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw(item, memo) for item in value]
+    return copy.deepcopy(value, memo)
+
 class HealthcareProvider:
     def __init__(self, settings: Settings):
         self.settings = settings
         self.json_dir = self.settings.PROCESSED_HTML_DIR
-        self._cache = {}
+        self.knowledge_base_path = self.settings.KNOWLEDGE_BASE_PATH
+        self._cache = JSONCache(max_bytes=self.settings.JSON_CACHE_MAX_BYTES)
+        self._index: Dict[Tuple[str, str], FrozenDict] = {}
+        self._index_signature = None
+        self._last_validated = 0.0
+        # Tool calls run concurrently; revalidation and rebuilds happen one at a time
+        self._lock = threading.RLock()
+        self.build_index()
 
     def _load_json(self, file_path: Path) -> Dict:
-        """Load JSON file if not in cache"""
-        file_key = str(file_path)
-        if file_key not in self._cache:
+        """Load JSON file, re-reading it only if it changed since it was cached"""
+        try:
+            return self._cache.get(file_path)
+        except FileNotFoundError as e:
+            logging.error(f"Failed to load {file_path}: {e}")
+            return {}
+        except json.JSONDecodeError as e:
+            logging.error(f"Invalid JSON in {file_path}: {e}")
+            return {}
+
+    def _directory_signature(self) -> Tuple:
+        """
+        Names, mtimes and sizes of the JSON files and of the knowledge base; changes
+        when any file is added, removed or edited
+        """
+        signature = []
+        for file_path in sorted(self.json_dir.glob('*.json')) + [self.knowledge_base_path]:
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    self._cache[file_key] = json.load(f)
-            except FileNotFoundError as e:
-                logging.error(f"Failed to load {file_path}: {e}")
-                return {}
-            except json.JSONDecodeError as e:
-                logging.error(f"Invalid JSON in {file_path}: {e}")
-                return {}
-        return self._cache[file_key]
-
-    def _filter_services_by_provider(self, services: List[Dict], healthcare_filter: HealthcareFilter) -> List[Dict]:
-        """Filter services based on provider and plan"""
-        filtered_services = []
-        
-        for service in services:
-            if healthcare_filter.provider in service.get('providers', {}):
-                plan_data = service['providers'][healthcare_filter.provider].get(healthcare_filter.plan)
-                if plan_data:  # If we have data for this plan
-                    filtered_service = {
-                        'name': service['name'],
-                        'details': plan_data  # Keep the original text without parsing
-                    }
-                    filtered_services.append(filtered_service)
-        
-        return filtered_services
+                signature.append((file_path.name, *JSONCache.signature(file_path)))
+            except FileNotFoundError:
+                continue
+        return tuple(signature)
 
-    def _filter_contact_info(self, contact_info: Dict, provider: str) -> Dict:
-        """Filter contact information for specific provider"""
-        filtered_contact = {}
-        
-        if 'phone_numbers' in contact_info and provider in contact_info['phone_numbers']:
-            filtered_contact['phone_numbers'] = contact_info['phone_numbers'][provider]
-            
-        if 'additional_info' in contact_info and provider in contact_info['additional_info']:
-            filtered_contact['additional_info'] = contact_info['additional_info'][provider]
-            
-        return filtered_contact
+    def _revalidate(self) -> None:
+        """Rebuild the index if the data files changed, checking at most every DATA_REVALIDATE_SECONDS"""
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_validated < self.settings.DATA_REVALIDATE_SECONDS:
+                return
+            self._last_validated = now
 
-    def _process_json_file(self, file_path: Path, healthcare_filter: HealthcareFilter) -> Dict:
-        """Process a single JSON file and return filtered data"""
-        data = self._load_json(file_path)
-        result = {}
+            if self._directory_signature() != self._index_signature:
+                logging.info("Healthcare data files changed, rebuilding index")
+                self.build_index()
 
-        if 'general_info' in data:
-            result['general_info'] = data['general_info']
-            
-        if 'services' in data:
-            result['services'] = self._filter_services_by_provider(
-                data['services'],
-                healthcare_filter
-            )
-            
-        if 'contact_info' in data:
-            result['contact_info'] = self._filter_contact_info(
-                data['contact_info'],
-                healthcare_filter.provider
-            )
+    def cache_stats(self) -> Dict[str, int]:
+        """Hit/miss statistics of the JSON file cache"""
+        return self._cache.stats()
 
-        return result
+    def _process_json_file(self, file_path: Path, healthcare_filter: HealthcareFilter) -> Dict:
+        """Process a single JSON file and return filtered data"""
+        return filter_document(self._load_json(file_path), healthcare_filter.provider, healthcare_filter.plan)
 
-    def get_all_services_data(self, healthcare_filter: HealthcareFilter) -> Dict:
-        """Get data from all JSON files in the directory, filtered by provider and plan"""
+    def _collect_services_data(self, healthcare_filter: HealthcareFilter) -> Dict:
+        """Read all JSON files in the directory and filter them by provider and plan"""
         result = {}
         
         try:
-            for file_path in self.json_dir.glob('*.json'):
+            for file_path in sorted(self.json_dir.glob('*.json')):
                 file_name = file_path.stem
                 result[file_name] = self._process_json_file(file_path, healthcare_filter)
                 
         except Exception as e:
             logging.error(f"Error processing services data: {e}")
             
-        return result
\ No newline at end of file
+        return result
+
+    def _load_knowledge_base(self, signature: Tuple) -> Optional[Dict[Tuple[str, str], Dict]]:
+        """
+        Views of the compiled knowledge base, or None if it is missing, invalid or
+        out of date. JSON files modified after the knowledge base was written are
+        checked against the hashes it recorded, so touched but unchanged files
+        do not disable it.
+        """
+        files = {name: mtime for name, mtime, _ in signature}
+        knowledge_base_mtime = files.pop(self.knowledge_base_path.name, None)
+        if knowledge_base_mtime is None:
+            return None
+        newer = [self.json_dir / name for name, mtime in files.items() if mtime > knowledge_base_mtime]
+        return load_knowledge_base(self.knowledge_base_path, list(files), verify_paths=newer)
+
+    def build_index(self) -> None:
+        """
+        Precompute the filtered data of every (provider, plan) pair, read in one go from
+        the compiled knowledge base when it is current, otherwise from the JSON files
+        """
+        with self._lock:
+            # Taken before reading so a file changed while building triggers another rebuild
+            signature = self._directory_signature()
+            views = self._load_knowledge_base(signature)
+            if views is not None:
+                self._index = {key: freeze(view) for key, view in views.items()}
+                self._cache.clear()
+                self._index_signature = signature
+                self._last_validated = time.monotonic()
+                logging.info(f"Loaded healthcare services index from {self.knowledge_base_path}")
+                return
+
+            self._index = {
+                (provider, plan): freeze(self._collect_services_data(HealthcareFilter(provider=provider, plan=plan)))
+                for provider in PROVIDERS
+                for plan in PLANS
+            }
+            self._cache.retain(self.json_dir / name for name, *_ in signature)
+            self._index_signature = signature
+            self._last_validated = time.monotonic()
+            logging.info(f"Built healthcare services index for {len(self._index)} provider/plan pairs")
+
+    def get_all_services_data(self, healthcare_filter: HealthcareFilter) -> Dict:
+        """
+        Get data from all JSON files in the directory, filtered by provider and plan
+
+        Returns the precomputed, read-only view (see build_index); callers that need
+        to modify it should copy it first (copy.deepcopy returns plain dicts and lists).
+        Edited data files are picked up without a restart; only changed files are re-read.
+        """
+        with self._lock:
+            self._revalidate()
+            return self._index[(healthcare_filter.provider, healthcare_filter.plan)]
\ No newline at end of file
@@ -0,0 +1,112 @@
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+import json
+import logging
+import threading
+
+class JSONCache:
+    """
+    Parsed JSON files, re-read only when a file's mtime or size changes.
+
+    Entries are evicted least recently used first once the total size of the
+    cached files exceeds max_bytes (the on-disk size is used as the cost).
+    Safe to use from several threads.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        """
+        Args:
+            max_bytes: Optional bound on the summed file size of cached entries
+        """
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[Tuple[int, int], Any]]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def signature(file_path: Union[str, Path]) -> Tuple[int, int]:
+        """(mtime_ns, size) of a file, used to detect changes"""
+        stat = Path(file_path).stat()
+        return stat.st_mtime_ns, stat.st_size
+
+    def get(self, file_path: Union[str, Path]) -> Any:
+        """
+        Return the parsed content of a JSON file
+
+        Raises:
+            FileNotFoundError: If the file does not exist (any cached entry is dropped)
+            json.JSONDecodeError: If the file is not valid JSON
+        """
+        key = str(file_path)
+        with self._lock:
+            try:
+                signature = self.signature(file_path)
+            except FileNotFoundError:
+                self._discard(key)
+                raise
+
+            cached = self._entries.get(key)
+            if cached is not None and cached[0] == signature:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return cached[1]
+
+            if cached is None:
+                self.misses += 1
+            else:
+                self.reloads += 1
+                self._discard(key)
+
+            with open(file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+
+            self._entries[key] = (signature, data)
+            self._bytes += signature[1]
+            self._evict()
+            return data
+
+    def _discard(self, key: str) -> None:
+        """Drop an entry if present (caller holds the lock)"""
+        cached = self._entries.pop(key, None)
+        if cached is not None:
+            self._bytes -= cached[0][1]
+
+    def _evict(self) -> None:
+        """Evict least recently used entries until the size bound holds (the newest entry is kept; caller holds the lock)"""
+        if self.max_bytes is None:
+            return
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            key, (signature, _) = self._entries.popitem(last=False)
+            self._bytes -= signature[1]
+            self.evictions += 1
+            logging.debug(f"Evicted {key} from JSON cache")
+
+    def retain(self, file_paths: Iterable[Union[str, Path]]) -> None:
+        """Drop the entries of all files not in file_paths, e.g. files deleted from disk"""
+        keep = {str(file_path) for file_path in file_paths}
+        with self._lock:
+            for key in [key for key in self._entries if key not in keep]:
+                self._discard(key)
+
+    def clear(self) -> None:
+        """Drop all entries (statistics are kept)"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'reloads': self.reloads,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes
+            }
@@ -0,0 +1,137 @@
+"""
+Compiled knowledge base: the filtered view of every (provider, plan) pair,
+precomputed from the processed_html JSON files and stored as one JSON file,
+so the Q&A loads all healthcare data with a single read.
+"""
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+import hashlib
+import json
+import logging
+import os
+
+PROVIDERS = ('maccabi', 'meuhedet', 'clalit')
+PLANS = ('gold', 'silver', 'bronze')
+
+# Bump when the layout of the views changes; older knowledge bases are then ignored
+KNOWLEDGE_BASE_VERSION = 1
+
+def filter_services(services: List[Dict], provider: str, plan: str) -> List[Dict]:
+    """Services that have data for the provider's plan, as {'name', 'details'}"""
+    filtered_services = []
+
+    for service in services:
+        if provider in service.get('providers', {}):
+            plan_data = service['providers'][provider].get(plan)
+            if plan_data:  # If we have data for this plan
+                filtered_services.append({
+                    'name': service['name'],
+                    'details': plan_data  # Keep the original text without parsing
+                })
+
+    return filtered_services
+
+def filter_contact_info(contact_info: Dict, provider: str) -> Dict:
+    """Contact information of a specific provider"""
+    filtered_contact = {}
+
+    if 'phone_numbers' in contact_info and provider in contact_info['phone_numbers']:
+        filtered_contact['phone_numbers'] = contact_info['phone_numbers'][provider]
+
+    if 'additional_info' in contact_info and provider in contact_info['additional_info']:
+        filtered_contact['additional_info'] = contact_info['additional_info'][provider]
+
+    return filtered_contact
+
+def filter_document(data: Dict, provider: str, plan: str) -> Dict:
+    """View of one processed page for a provider and plan"""
+    result = {}
+
+    if 'general_info' in data:
+        result['general_info'] = data['general_info']
+
+    if 'services' in data:
+        result['services'] = filter_services(data['services'], provider, plan)
+
+    if 'contact_info' in data:
+        result['contact_info'] = filter_contact_info(data['contact_info'], provider)
+
+    return result
+
+def compile_knowledge_base(json_dir: Union[str, Path], output_path: Union[str, Path]) -> Dict:
+    """
+    Compile the processed JSON files of json_dir into one knowledge base file
+
+    The file holds a version stamp, the build time, the SHA-256 of each source
+    file and the views as {provider: {plan: {page name: view}}}. It is written
+    to a temporary file and moved into place.
+
+    Returns:
+        dict: The compiled knowledge base
+    """
+    documents = {}
+    sources = {}
+    for file_path in sorted(Path(json_dir).glob('*.json')):
+        content = file_path.read_bytes()
+        documents[file_path.stem] = json.loads(content)
+        sources[file_path.name] = hashlib.sha256(content).hexdigest()
+
+    knowledge_base = {
+        'version': KNOWLEDGE_BASE_VERSION,
+        'built_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'sources': sources,
+        'views': {
+            provider: {
+                plan: {name: filter_document(data, provider, plan) for name, data in documents.items()}
+                for plan in PLANS
+            }
+            for provider in PROVIDERS
+        }
+    }
+
+    output_path = Path(output_path)
+    tmp_path = output_path.with_name(f"{output_path.name}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(knowledge_base, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(tmp_path, output_path)
+    return knowledge_base
+
+def load_knowledge_base(path: Union[str, Path], source_names: List[str],
+                        verify_paths: Iterable[Path] = ()) -> Optional[Dict[Tuple[str, str], Dict]]:
+    """
+    Load the views of a compiled knowledge base
+
+    Args:
+        path: Knowledge base file
+        source_names: Names of the JSON files it must have been compiled from
+        verify_paths: Source files to check against their recorded SHA-256, e.g. files
+                      modified after the knowledge base was written
+
+    Returns:
+        Views keyed by (provider, plan), or None if the file is missing, invalid,
+        of another version, compiled from a different set of files or if a
+        verified file changed since
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            knowledge_base = json.load(f)
+    except FileNotFoundError:
+        return None
+    except json.JSONDecodeError as e:
+        logging.error(f"Invalid knowledge base {path}: {e}")
+        return None
+
+    if knowledge_base.get('version') != KNOWLEDGE_BASE_VERSION:
+        logging.warning(f"Ignoring knowledge base {path} of version {knowledge_base.get('version')}")
+        return None
+    if sorted(knowledge_base.get('sources', {})) != sorted(source_names):
+        logging.warning(f"Ignoring knowledge base {path}: compiled from different data files")
+        return None
+    for file_path in verify_paths:
+        if hashlib.sha256(Path(file_path).read_bytes()).hexdigest() != knowledge_base['sources'][Path(file_path).name]:
+            logging.info(f"Ignoring knowledge base {path}: {Path(file_path).name} changed since it was compiled")
+            return None
+
+    views = knowledge_base['views']
+    return {(provider, plan): views[provider][plan] for provider in PROVIDERS for plan in PLANS}
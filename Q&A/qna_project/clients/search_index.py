@@ -0,0 +1,66 @@
+from collections import Counter, defaultdict
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+import heapq
+import math
+
+from qna_project.processors.hebrew_text import tokenize
+
+class SearchIndex:
+    """
+    Inverted index ranking documents with Okapi BM25.
+
+    Each document is a dict; the text of every field listed in fields is indexed,
+    repeated by the field's weight (e.g. a weight of 2 counts a name twice).
+    """
+
+    def __init__(self, documents: Sequence[Dict[str, Any]], fields: Dict[str, int],
+                 tokenizer: Callable[[str], List[str]] = tokenize, k1: float = 1.5, b: float = 0.75):
+        """
+        Args:
+            documents: Documents to index; search returns them as is
+            fields: Document fields to index mapped to their integer weight
+            tokenizer: Splits field texts and queries into terms (Hebrew-aware by default)
+            k1: Term frequency saturation
+            b: Document length normalization
+        """
+        self.documents = list(documents)
+        self.tokenizer = tokenizer
+        self.k1 = k1
+        self.b = b
+
+        self._postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        self._lengths: List[int] = []
+        for doc_id, document in enumerate(self.documents):
+            terms = Counter()
+            for field, weight in fields.items():
+                for term in self.tokenizer(str(document.get(field) or '')):
+                    terms[term] += weight
+            self._lengths.append(sum(terms.values()))
+            for term, frequency in terms.items():
+                self._postings[term].append((doc_id, frequency))
+
+        count = len(self.documents)
+        self._average_length = sum(self._lengths) / count if count else 0.0
+        self._idf = {
+            term: math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for term, postings in self._postings.items()
+        }
+
+    def search(self, query: str, top_k: int = 5) -> List[Tuple[float, Dict[str, Any]]]:
+        """
+        Rank the documents matching any query term
+
+        Returns:
+            Up to top_k (score, document) pairs, best first
+        """
+        scores: Dict[int, float] = defaultdict(float)
+        for term in set(self.tokenizer(query)):
+            idf = self._idf.get(term)
+            if idf is None:
+                continue
+            for doc_id, frequency in self._postings[term]:
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[doc_id] / self._average_length)
+                scores[doc_id] += idf * frequency * (self.k1 + 1) / (frequency + norm)
+
+        best = heapq.nlargest(top_k, scores.items(), key=lambda item: (item[1], -item[0]))
+        return [(score, self.documents[doc_id]) for doc_id, score in best]
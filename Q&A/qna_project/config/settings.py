@@ -19,6 +19,7 @@ class Settings:
         self.RAW_HTML_DIR = self.RESOURCES_DIR / "raw_html"
         self.PROMPTS_DIR = self.RESOURCES_DIR / "prompts"
         self.PROCESSED_HTML_DIR = self.RESOURCES_DIR / "processed_html"
+        self.KNOWLEDGE_BASE_PATH = self.RESOURCES_DIR / "knowledge_base.json"  # Compiled from PROCESSED_HTML_DIR
         
         # Output subdirectories
         self.TEMP_DIR = self.OUTPUT_DIR / "temp"
@@ -34,6 +35,22 @@ class Settings:
             self.TEMP_DIR
         ]
 
+        # HTML parser backend: "auto" (lxml if installed), "html.parser", "bs4-lxml", "lxml" or "selectolax"
+        self.HTML_PARSER_BACKEND = "auto"
+
+        # Incremental HTML processing: source hashes of the last run and its report
+        self.HTML_PROCESSING_MANIFEST = self.OUTPUT_DIR / "html_manifest.json"
+        self.HTML_PROCESSING_REPORT = self.OUTPUT_DIR / "html_processing_report.json"
+        self.HTML_PROCESSING_WORKERS = 0  # 0 uses one process per CPU
+
+        # Healthcare data cache settings
+        self.JSON_CACHE_MAX_BYTES = 64 * 1024 * 1024
+        self.DATA_REVALIDATE_SECONDS = 2.0  # Minimum interval between checks for changed data files
+
+        # Service search tool: default and maximum number of services returned per query
+        self.SEARCH_TOP_K = 5
+        self.SEARCH_MAX_TOP_K = 20
+
         # Load environment variables
         load_dotenv(dotenv_path=self.PROJECT_ROOT / ".env", verbose=True)
 
@@ -0,0 +1,71 @@
+import argparse
+import json
+import re
+import time
+from typing import Callable, Dict, List, Optional
+
+from qna_project.config.settings import settings
+from qna_project.processors import hebrew_text
+
+SIMPLE_TOKEN_PATTERN = re.compile(r'\w+')
+
+def simple_tokenize(text: str) -> List[str]:
+    """Baseline: lowercased words, no normalization"""
+    return SIMPLE_TOKEN_PATTERN.findall(text.lower())
+
+def uncached_tokenize(text: str) -> List[str]:
+    """Hebrew tokenizer with the per word caches cleared, as for a text of only new words"""
+    hebrew_text.word_variants.cache_clear()
+    hebrew_text.normalize_word.cache_clear()
+    return hebrew_text.tokenize(text)
+
+TOKENIZERS: Dict[str, Callable[[str], List[str]]] = {
+    'simple': simple_tokenize,
+    'hebrew-uncached': uncached_tokenize,
+    'hebrew': hebrew_text.tokenize,
+}
+
+def load_texts() -> List[str]:
+    """Service names, plan details and page texts of the processed HTML files"""
+    texts = []
+    for file_path in sorted(settings.PROCESSED_HTML_DIR.glob('*.json')):
+        with open(file_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        texts += [data['general_info']['title'], data['general_info']['description']]
+        for service in data['services']:
+            texts.append(service['name'])
+            texts += [details for plans in service['providers'].values() for details in plans.values()]
+    return texts
+
+def benchmark(texts: List[str], repeat: int) -> Dict[str, tuple]:
+    """
+    Time each tokenizer over the texts
+
+    Returns:
+        Dict mapping tokenizer name to (best seconds of one pass, tokens produced)
+    """
+    timings = {}
+    for name, tokenizer in TOKENIZERS.items():
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            tokens = sum(len(tokenizer(text)) for text in texts)
+            best = min(best, time.perf_counter() - start)
+        timings[name] = (best, tokens)
+    return timings
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description="Measure the throughput of the Hebrew normalizer and tokenizer")
+    parser.add_argument('--copies', type=int, default=100, help="Times the processed texts are repeated")
+    parser.add_argument('--repeat', type=int, default=3, help="Timed passes per tokenizer (best is reported)")
+    args = parser.parse_args(argv)
+
+    texts = load_texts() * args.copies
+    size_mb = sum(len(text.encode('utf-8')) for text in texts) / 1e6
+
+    print(f"{len(texts)} texts, {size_mb:.1f} MB")
+    for name, (seconds, tokens) in benchmark(texts, args.repeat).items():
+        print(f"{name:<16} {seconds:8.3f}s  {size_mb / seconds:6.1f} MB/s  {tokens / seconds / 1e6:5.2f} M tokens/s")
+
+if __name__ == "__main__":
+    main()
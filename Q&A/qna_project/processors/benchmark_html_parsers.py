@@ -0,0 +1,69 @@
+import argparse
+import re
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from qna_project.config.settings import settings
+from qna_project.processors.html_backends import available_backends
+from qna_project.processors.html_processor import HTMLProcessor
+
+TABLE_ROW_PATTERN = re.compile(r'(<tr>\s*<td>.*?</tr>)', re.DOTALL)
+
+def enlarge_page(html_content: str, copies: int) -> str:
+    """Build a large provider page by repeating the service rows of a sample page"""
+    rows = TABLE_ROW_PATTERN.findall(html_content)
+    if not rows:
+        return html_content
+    extra = "\n  ".join(
+        row.replace('</td>', f' {i}</td>', 1) for i in range(copies) for row in rows
+    )
+    return html_content.replace('</table>', f"  {extra}\n</table>", 1)
+
+def benchmark(html_pages: List[str], backends: List[str], repeat: int) -> Dict[str, float]:
+    """
+    Time each backend on the pages and check they all produce the same JSON
+
+    Returns:
+        Dict mapping backend name to the best time (seconds) of one pass over all pages
+    """
+    processors = {name: HTMLProcessor(name) for name in backends}
+    reference = [processors[backends[0]].parse_html_to_json(page) for page in html_pages]
+
+    timings = {}
+    for name, processor in processors.items():
+        results = [processor.parse_html_to_json(page) for page in html_pages]
+        if results != reference:
+            raise AssertionError(f"Backend '{name}' output differs from '{backends[0]}'")
+
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for page in html_pages:
+                processor.parse_html_to_json(page)
+            best = min(best, time.perf_counter() - start)
+        timings[name] = best
+    return timings
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description="Compare HTML parser backends on enlarged provider pages")
+    parser.add_argument('--copies', type=int, default=200,
+                        help="Times each sample page's service rows are repeated")
+    parser.add_argument('--repeat', type=int, default=3, help="Timed passes per backend (best is reported)")
+    parser.add_argument('--backends', nargs='+', default=None,
+                        help=f"Backends to compare (default: all installed: {available_backends()})")
+    args = parser.parse_args(argv)
+
+    backends = args.backends or available_backends()
+    samples = [Path(path).read_text(encoding='utf-8') for path in settings.get_html_files()]
+    pages = [enlarge_page(page, args.copies) for page in samples]
+    size_mb = sum(len(page.encode('utf-8')) for page in pages) / 1e6
+
+    print(f"{len(pages)} pages, {size_mb:.1f} MB, {args.copies} copies of each service row")
+    timings = benchmark(pages, backends, args.repeat)
+    baseline = timings[backends[0]]
+    for name, seconds in timings.items():
+        print(f"{name:<12} {seconds:8.3f}s  {baseline / seconds:5.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Hebrew-aware text normalization and tokenization for the service search index.
+
+normalize() folds the spelling variations that should not affect a match:
+niqqud and cantillation marks, presentation forms, quote marks (ד"ר, ד״ר and
+דר are one word, as are ג׳ and ג), final letters and doubled vav/yod (ktiv male).
+tokenize() then splits words and adds, for each Hebrew word, the forms with up
+to two attached prefix letters (ו, ה, ב, ל, מ, ש, כ) removed. The surface form
+is always kept, since the leading letters may belong to the word itself
+(מרפאה); index and queries go through the same tokenizer, so "וניקוי" in a
+service name matches a query for "ניקוי" and vice versa.
+"""
+from functools import lru_cache
+from typing import List, Tuple
+import re
+import unicodedata
+
+PREFIX_LETTERS = frozenset('והבלמשכ')
+MAX_PREFIX_LENGTH = 2
+MIN_STEM_LENGTH = 2  # Shortest word left after removing prefixes
+
+# Niqqud, cantillation and Latin combining marks (maqaf, paseq and sof pasuq are left as separators),
+# and the quotes used inside acronyms and abbreviations: ASCII, typographic, geresh and gershayim
+REMOVED_CHARS_PATTERN = re.compile(
+    '[\u0300-\u036f\u0591-\u05bd\u05bf\u05c1\u05c2\u05c4\u05c5\u05c7"\'`\u2018\u2019\u201c\u201d\u05f3\u05f4]'
+)
+DOUBLED_LETTERS_PATTERN = re.compile(r'([וי])\1+')
+WORD_PATTERN = re.compile(r'\w+')
+HEBREW_WORD_PATTERN = re.compile('[\u05d0-\u05ea]+')
+FINAL_LETTERS = str.maketrans('ךםןףץ', 'כמנפצ')
+
+def _fold_text(text: str) -> str:
+    """Decompose presentation forms, drop marks and quotes, lowercase"""
+    return REMOVED_CHARS_PATTERN.sub('', unicodedata.normalize('NFKD', text)).lower()
+
+@lru_cache(maxsize=65536)
+def normalize_word(word: str) -> str:
+    """Fold the final letters and doubled vav/yod of a word"""
+    return DOUBLED_LETTERS_PATTERN.sub(r'\1', word.translate(FINAL_LETTERS))
+
+def normalize(text: str) -> str:
+    """Fold marks, quotes, case, final letters and doubled vav/yod"""
+    return WORD_PATTERN.sub(lambda match: normalize_word(match.group()), _fold_text(text))
+
+@lru_cache(maxsize=65536)
+def word_variants(word: str) -> Tuple[str, ...]:
+    """
+    The normalized word followed by its forms without 1 or 2 prefix letters
+
+    Only Hebrew words get variants, and only while MIN_STEM_LENGTH letters remain.
+    Per word folding happens here, so it runs once per distinct word.
+    """
+    word = normalize_word(word)
+    variants = [word]
+    if HEBREW_WORD_PATTERN.fullmatch(word):
+        for length in range(1, MAX_PREFIX_LENGTH + 1):
+            if word[length - 1] not in PREFIX_LETTERS or len(word) - length < MIN_STEM_LENGTH:
+                break
+            variants.append(word[length:])
+    return tuple(variants)
+
+def tokenize(text: str) -> List[str]:
+    """Index terms of a text: every normalized word and its prefix-stripped forms"""
+    tokens = []
+    for word in WORD_PATTERN.findall(_fold_text(text)):
+        tokens.extend(word_variants(word))
+    return tokens
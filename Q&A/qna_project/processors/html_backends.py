@@ -0,0 +1,177 @@
+"""
+HTML parser backends for HTMLProcessor.
+
+Each backend parses a provider page and returns only the parts HTMLProcessor
+uses, as raw text: the first h2 and p, the cells of the first table and the
+items of the two contact lists. All backends follow the lookups of the
+original BeautifulSoup implementation (html.parser backend), so they produce
+the same JSON.
+"""
+import re
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from bs4 import BeautifulSoup
+
+try:
+    import lxml.html
+except ImportError:  # lxml is optional
+    lxml = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # selectolax is optional
+    LexborHTMLParser = None
+
+PHONE_SECTION_TEXT = 'מספרי טלפון'
+ADDITIONAL_SECTION_TEXT = 'לפרטים נוספים'
+
+@dataclass
+class PageContent:
+    """Raw (unstripped) texts of the page parts HTMLProcessor reads"""
+    title: str
+    description: str
+    table_rows: Optional[List[List[str]]]      # Cell texts of every row of the first table, header included
+    phone_items: Optional[List[str]]           # Items of the list following the phone numbers heading
+    additional_items: Optional[List[str]]      # Items of the list following the additional info heading
+
+def _missing(what: str) -> ValueError:
+    return ValueError(f"No {what} found in HTML")
+
+def parse_with_bs4(html_content: str, features: str = 'html.parser') -> PageContent:
+    """Reference backend: BeautifulSoup with whole-document find calls"""
+    soup = BeautifulSoup(html_content, features)
+
+    h2, p = soup.find('h2'), soup.find('p')
+    if h2 is None or p is None:
+        raise _missing('h2/p')
+
+    table = soup.find('table')
+    table_rows = None
+    if table:
+        table_rows = [[cell.text for cell in row.find_all(['td', 'th'])] for row in table.find_all('tr')]
+
+    def list_items(section_text: str) -> Optional[List[str]]:
+        string = soup.find(string=re.compile(section_text))
+        if string is None:
+            raise _missing(f"'{section_text}' section")
+        items = string.find_parent().find_next('ul')
+        return [item.text for item in items.find_all('li')] if items else None
+
+    return PageContent(
+        title=h2.text,
+        description=p.text,
+        table_rows=table_rows,
+        phone_items=list_items(PHONE_SECTION_TEXT),
+        additional_items=list_items(ADDITIONAL_SECTION_TEXT)
+    )
+
+def parse_with_bs4_lxml(html_content: str) -> PageContent:
+    """BeautifulSoup tree built by the lxml parser"""
+    return parse_with_bs4(html_content, 'lxml')
+
+def parse_with_lxml(html_content: str) -> PageContent:
+    """lxml.html with targeted XPath lookups"""
+    root = lxml.html.document_fromstring(html_content)
+
+    h2, p = root.xpath('(//h2)[1]'), root.xpath('(//p)[1]')
+    if not h2 or not p:
+        raise _missing('h2/p')
+
+    table = root.xpath('(//table)[1]')
+    table_rows = None
+    if table:
+        table_rows = [
+            [cell.text_content() for cell in row.xpath('.//td | .//th')]
+            for row in table[0].xpath('.//tr')
+        ]
+
+    def list_items(section_text: str) -> Optional[List[str]]:
+        strings = root.xpath('//text()[contains(., $text)]', text=section_text)
+        if not strings:
+            raise _missing(f"'{section_text}' section")
+        # A tail string belongs to the element's parent, not to the element itself
+        string = strings[0]
+        parent = string.getparent().getparent() if string.is_tail else string.getparent()
+        # find_next: the first ul after the parent's start tag, its own descendants included
+        items = parent.xpath('(descendant::ul | following::ul)[1]')
+        return [item.text_content() for item in items[0].xpath('.//li')] if items else None
+
+    return PageContent(
+        title=h2[0].text_content(),
+        description=p[0].text_content(),
+        table_rows=table_rows,
+        phone_items=list_items(PHONE_SECTION_TEXT),
+        additional_items=list_items(ADDITIONAL_SECTION_TEXT)
+    )
+
+def parse_with_selectolax(html_content: str) -> PageContent:
+    """selectolax (lexbor) with CSS lookups and a single document-order walk for the contact lists"""
+    tree = LexborHTMLParser(html_content)
+
+    h2, p = tree.css_first('h2'), tree.css_first('p')
+    if h2 is None or p is None:
+        raise _missing('h2/p')
+
+    table = tree.css_first('table')
+    table_rows = None
+    if table is not None:
+        table_rows = [[cell.text(deep=True) for cell in row.css('td, th')] for row in table.css('tr')]
+
+    # Elements in document order, and the parents of the section heading strings
+    elements = []
+    section_parents: Dict[str, int] = {}
+    for node in tree.root.traverse(include_text=True):
+        if node.tag == '-text':
+            for section_text in (PHONE_SECTION_TEXT, ADDITIONAL_SECTION_TEXT):
+                if section_text not in section_parents and section_text in (node.text_content or ''):
+                    section_parents[section_text] = node.parent.mem_id
+        elif not node.tag.startswith(('-', '!')):
+            elements.append(node)
+    positions = {node.mem_id: i for i, node in enumerate(elements)}
+
+    def list_items(section_text: str) -> Optional[List[str]]:
+        if section_text not in section_parents:
+            raise _missing(f"'{section_text}' section")
+        start = positions[section_parents[section_text]] + 1
+        items = next((node for node in elements[start:] if node.tag == 'ul'), None)
+        return [item.text(deep=True) for item in items.css('li')] if items is not None else None
+
+    return PageContent(
+        title=h2.text(deep=True),
+        description=p.text(deep=True),
+        table_rows=table_rows,
+        phone_items=list_items(PHONE_SECTION_TEXT),
+        additional_items=list_items(ADDITIONAL_SECTION_TEXT)
+    )
+
+BACKENDS: Dict[str, Callable[[str], PageContent]] = {
+    'html.parser': parse_with_bs4,
+    'bs4-lxml': parse_with_bs4_lxml,
+    'lxml': parse_with_lxml,
+    'selectolax': parse_with_selectolax,
+}
+
+def available_backends() -> List[str]:
+    """Backends whose libraries are installed"""
+    names = ['html.parser']
+    if lxml is not None:
+        names += ['bs4-lxml', 'lxml']
+    if LexborHTMLParser is not None:
+        names.append('selectolax')
+    return names
+
+def get_backend(name: str = 'auto') -> Callable[[str], PageContent]:
+    """
+    Resolve a backend by name; "auto" picks lxml when installed, else html.parser
+
+    Raises:
+        ValueError: If the backend is unknown or its library is not installed
+    """
+    if name == 'auto':
+        name = 'lxml' if lxml is not None else 'html.parser'
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown HTML parser backend: {name}. Must be one of: {list(BACKENDS)}")
+    if name not in available_backends():
+        raise ValueError(f"HTML parser backend '{name}' is not installed")
+    return BACKENDS[name]
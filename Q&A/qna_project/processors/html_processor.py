@@ -1,20 +1,69 @@
-from bs4 import BeautifulSoup
+import hashlib
 import json
+import os
 import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
 from qna_project.config.settings import settings
+from qna_project.processors.html_backends import PageContent, get_backend
+
+PHONE_PATTERN = re.compile(r'\*\d+|\d+-[\d-]+')
+LONG_PHONE_PATTERN = re.compile(r'\d+-[\d-]+')
+WEBSITE_PATTERN = re.compile(r'https?://\S+')
+PROVIDER_NAMES = [('מכבי', 'maccabi'), ('מאוחדת', 'meuhedet'), ('כללית', 'clalit')]
+
+# Bump when the JSON produced from a page changes, so unchanged pages are reprocessed once
+PROCESSOR_VERSION = 1
+
+def write_json_atomic(path: Path, data: Any) -> None:
+    """Write JSON to a temporary file next to path and move it into place"""
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as file:
+        json.dump(data, file, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+@dataclass
+class ProcessingReport:
+    """Outcome of a process_all_files run"""
+    processed: List[str] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)    # Filename -> error message
+    seconds: float = 0.0
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+# Per-process state of the process pool workers
+_worker: Dict[str, 'HTMLProcessor'] = {}
+
+def _init_worker(backend: str) -> None:
+    _worker['processor'] = HTMLProcessor(backend)
+
+def _convert_in_worker(html_content: str, output_path: Path) -> None:
+    """Parse one page in a pool worker and write its JSON"""
+    write_json_atomic(output_path, _worker['processor'].parse_html_to_json(html_content))
 
 class HTMLProcessor:
-    def __init__(self):
-        """Initialize the HTML processor using project settings."""
+    def __init__(self, backend: Optional[str] = None):
+        """
+        Initialize the HTML processor using project settings.
+
+        Args:
+            backend: HTML parser backend (see html_backends.BACKENDS). Defaults to settings.HTML_PARSER_BACKEND
+        """
         self.raw_html_dir = settings.RAW_HTML_DIR
         self.output_dir = settings.PROCESSED_HTML_DIR
+        self.backend_name = backend or settings.HTML_PARSER_BACKEND
+        self.parse_page = get_backend(self.backend_name)
 
-    def _extract_general_info(self, soup):
+    def _extract_general_info(self, page: PageContent):
         """Extract title and general description from the HTML."""
-        title = soup.find('h2').text.strip()
-        description = soup.find('p').text.strip()
+        title = page.title.strip()
+        description = page.description.strip()
         
         return {
             "title": title,
@@ -49,28 +98,25 @@ class HTMLProcessor:
         
         return plans
 
-    def _extract_services(self, soup):
+    def _extract_services(self, page: PageContent):
         """Extract services information from the table."""
         services = []
-        table = soup.find('table')
         
-        if not table:
+        if not page.table_rows:
             return services
         
-        rows = table.find_all('tr')
-        for row in rows[1:]:  # Skip header row
-            cells = row.find_all(['td', 'th'])
+        for cells in page.table_rows[1:]:  # Skip header row
             if len(cells) < 4:  # Skip invalid rows
                 continue
                 
-            service_name = cells[0].text.strip()
+            service_name = cells[0].strip()
             
             service = {
                 "name": service_name,
                 "providers": {
-                    "maccabi": self._parse_service_cell(cells[1].text.strip()),
-                    "meuhedet": self._parse_service_cell(cells[2].text.strip()),
-                    "clalit": self._parse_service_cell(cells[3].text.strip())
+                    "maccabi": self._parse_service_cell(cells[1].strip()),
+                    "meuhedet": self._parse_service_cell(cells[2].strip()),
+                    "clalit": self._parse_service_cell(cells[3].strip())
                 }
             }
             
@@ -78,53 +124,45 @@ class HTMLProcessor:
         
         return services
 
-    def _extract_contact_info(self, soup):
+    def _extract_contact_info(self, page: PageContent):
         """Extract contact information including phone numbers and additional info."""
         contact_info = {
             "phone_numbers": {},
             "additional_info": {}
         }
         
-        phone_section = soup.find(string=re.compile('מספרי טלפון')).find_parent()
-        if phone_section:
-            phone_list = phone_section.find_next('ul')
-            if phone_list:
-                for item in phone_list.find_all('li'):
-                    text = item.text.strip()
-                    for provider, name in [('מכבי', 'maccabi'), ('מאוחדת', 'meuhedet'), ('כללית', 'clalit')]:
-                        if provider in text:
-                            numbers = re.findall(r'\*\d+|\d+-[\d-]+', text)
-                            contact_info["phone_numbers"][name] = {
-                                "short": numbers[0] if len(numbers) > 0 else "",
-                                "long": numbers[1] if len(numbers) > 1 else "",
-                                "extension": text.split('שלוחה')[-1].strip() if 'שלוחה' in text else ""
-                            }
+        for item in page.phone_items or []:
+            text = item.strip()
+            for provider, name in PROVIDER_NAMES:
+                if provider in text:
+                    numbers = PHONE_PATTERN.findall(text)
+                    contact_info["phone_numbers"][name] = {
+                        "short": numbers[0] if len(numbers) > 0 else "",
+                        "long": numbers[1] if len(numbers) > 1 else "",
+                        "extension": text.split('שלוחה')[-1].strip() if 'שלוחה' in text else ""
+                    }
         
-        additional_section = soup.find(string=re.compile('לפרטים נוספים')).find_parent()
-        if additional_section:
-            info_list = additional_section.find_next('ul')
-            if info_list:
-                for item in info_list.find_all('li'):
-                    text = item.text.strip()
-                    for provider, name in [('מכבי', 'maccabi'), ('מאוחדת', 'meuhedet'), ('כללית', 'clalit')]:
-                        if provider in text:
-                            phone = re.search(r'\d+-[\d-]+', text)
-                            website = re.search(r'https?://\S+', text)
-                            contact_info["additional_info"][name] = {
-                                "phone": phone.group() if phone else "",
-                                "website": website.group() if website else ""
-                            }
+        for item in page.additional_items or []:
+            text = item.strip()
+            for provider, name in PROVIDER_NAMES:
+                if provider in text:
+                    phone = LONG_PHONE_PATTERN.search(text)
+                    website = WEBSITE_PATTERN.search(text)
+                    contact_info["additional_info"][name] = {
+                        "phone": phone.group() if phone else "",
+                        "website": website.group() if website else ""
+                    }
         
         return contact_info
 
     def parse_html_to_json(self, html_content):
         """Parse the specialized HTML format into a structured JSON format."""
-        soup = BeautifulSoup(html_content, 'html.parser')
+        page = self.parse_page(html_content)
         
         result = {
-            "general_info": self._extract_general_info(soup),
-            "services": self._extract_services(soup),
-            "contact_info": self._extract_contact_info(soup)
+            "general_info": self._extract_general_info(page),
+            "services": self._extract_services(page),
+            "contact_info": self._extract_contact_info(page)
         }
         
         return result
@@ -156,8 +194,7 @@ class HTMLProcessor:
             result = self.parse_html_to_json(html_content)
             
             # Write to JSON file
-            with open(output_path, 'w', encoding='utf-8') as file:
-                json.dump(result, file, ensure_ascii=False, indent=2)
+            write_json_atomic(output_path, result)
             
             return result
             
@@ -166,20 +203,81 @@ class HTMLProcessor:
         except Exception as e:
             raise Exception(f"Error processing {input_filename}: {str(e)}")
 
-    def process_all_files(self) -> dict:
+    @staticmethod
+    def _load_manifest(manifest_path: Path) -> Dict[str, dict]:
+        """Source hashes of the last run, or {} if missing, unreadable or from another processor version"""
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as file:
+                manifest = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        if manifest.get('version') != PROCESSOR_VERSION:
+            return {}
+        return manifest.get('files', {})
+
+    def process_all_files(self, force: bool = False, workers: Optional[int] = None) -> ProcessingReport:
         """
-        Process all HTML files in the raw_html directory.
-        
+        Process the HTML files in the raw_html directory that changed since the last run.
+
+        A file is skipped when its SHA-256 matches the manifest (settings.HTML_PROCESSING_MANIFEST)
+        and its JSON output exists. Changed files are parsed in a process pool and every JSON
+        file is written atomically. The report is also saved to settings.HTML_PROCESSING_REPORT.
+
+        Args:
+            force: Reprocess all files regardless of the manifest
+            workers: Pool size. Defaults to settings.HTML_PROCESSING_WORKERS (0 = one per CPU)
+
         Returns:
-            dict: Dictionary mapping filenames to their parsed data
+            ProcessingReport: Processed, skipped and failed files
         """
-        results = {}
-        html_files = settings.get_html_files()
-        
-        for html_file in html_files:
+        start = time.perf_counter()
+        report = ProcessingReport()
+        previous = {} if force else self._load_manifest(settings.HTML_PROCESSING_MANIFEST)
+        manifest: Dict[str, dict] = {}
+        pending: List[Tuple[str, str, Path]] = []
+
+        for html_file in sorted(settings.get_html_files()):
             try:
-                results[html_file.name] = self.process_file(html_file.name)
-            except Exception as e:
-                print(f"Error processing {html_file.name}: {str(e)}")
-                
-        return results
\ No newline at end of file
+                content = html_file.read_bytes()
+                html_content = content.decode('utf-8')
+            except (OSError, UnicodeDecodeError) as e:
+                report.failed[html_file.name] = str(e)
+                continue
+
+            output_path = settings.get_output_path(html_file.name)
+            manifest[html_file.name] = {"sha256": hashlib.sha256(content).hexdigest(), "output": output_path.name}
+            if previous.get(html_file.name) == manifest[html_file.name] and output_path.exists():
+                report.skipped.append(html_file.name)
+            else:
+                pending.append((html_file.name, html_content, output_path))
+
+        workers = workers if workers is not None else settings.HTML_PROCESSING_WORKERS
+        workers = min(workers or os.cpu_count() or 1, len(pending))
+        if workers > 1:
+            with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(self.backend_name,)) as pool:
+                futures = {
+                    name: pool.submit(_convert_in_worker, html_content, output_path)
+                    for name, html_content, output_path in pending
+                }
+                for name, future in futures.items():
+                    try:
+                        future.result()
+                        report.processed.append(name)
+                    except Exception as e:
+                        report.failed[name] = str(e)
+        else:
+            for name, html_content, output_path in pending:
+                try:
+                    write_json_atomic(output_path, self.parse_html_to_json(html_content))
+                    report.processed.append(name)
+                except Exception as e:
+                    report.failed[name] = str(e)
+
+        # Failed files keep no entry, so they are retried on the next run
+        for name in report.failed:
+            manifest.pop(name, None)
+        write_json_atomic(settings.HTML_PROCESSING_MANIFEST, {"version": PROCESSOR_VERSION, "files": manifest})
+
+        report.seconds = time.perf_counter() - start
+        write_json_atomic(settings.HTML_PROCESSING_REPORT, report.to_dict())
+        return report
@@ -1,5 +1,6 @@
 import logging
 
+from qna_project.clients.knowledge_base import compile_knowledge_base
 from qna_project.processors.html_processor import HTMLProcessor
 from qna_project.config.settings import settings
 
@@ -30,7 +31,17 @@ class HTMLService:
         
         return logger
     
-    def process_all_files(self) -> dict:
+    def process_all_files(self, force: bool = False) -> dict:
+        """
+        Process the HTML files that changed since the last run and recompile the
+        knowledge base if any of them did.
+
+        Args:
+            force: Reprocess all files
+
+        Returns:
+            dict: Run report with processed, skipped and failed files ({} if validation fails)
+        """
         try:
             # Validate required files first
             is_valid, missing_files = settings.validate_required_files()
@@ -41,20 +52,36 @@ class HTMLService:
                 return {}
             
             self.logger.info("Starting batch processing of HTML files")
-            results = self.processor.process_all_files()
-            self.logger.info(f"Successfully processed {len(results)} files")
-            return results
+            report = self.processor.process_all_files(force=force)
+            self.logger.info(
+                f"Processed {len(report.processed)}, skipped {len(report.skipped)} unchanged, "
+                f"{len(report.failed)} failed in {report.seconds:.2f}s"
+            )
+            for filename, error in report.failed.items():
+                self.logger.error(f"Error processing {filename}: {error}")
+
+            if force or report.processed or not settings.KNOWLEDGE_BASE_PATH.exists():
+                self.compile_knowledge_base()
+            return report.to_dict()
             
         except Exception as e:
             self.logger.error(f"Error processing files: {str(e)}")
             return {}
 
+    def compile_knowledge_base(self) -> dict:
+        """Compile the processed JSON files into the knowledge base loaded by HealthcareProvider"""
+        knowledge_base = compile_knowledge_base(settings.PROCESSED_HTML_DIR, settings.KNOWLEDGE_BASE_PATH)
+        self.logger.info(
+            f"Compiled knowledge base of {len(knowledge_base['sources'])} files to {settings.KNOWLEDGE_BASE_PATH}"
+        )
+        return knowledge_base
+
 # Example usage:
 if __name__ == "__main__":
     service = HTMLService()
     
     # Process all files
-    results = service.process_all_files()
-    print(f"Processed {len(results)} files")
+    report = service.process_all_files()
+    print(f"Processed {len(report.get('processed', []))} files, skipped {len(report.get('skipped', []))} unchanged")
 
     settings.clean_pycache()
\ No newline at end of file
@@ -1,14 +1,21 @@
 import logging
-from typing import Dict
+import threading
+from typing import Dict, List, Tuple
 import json
 
 from qna_project.clients.healthcare_provider import HealthcareProvider, HealthcareFilter
+from qna_project.clients.search_index import SearchIndex
 from qna_project.config.settings import Settings
 
+# Indexed service fields and their weights: a match in the service name counts most
+SEARCH_FIELDS = {'name': 3, 'category': 1, 'details': 1}
+
 class CustomerService:
     def __init__(self, settings: Settings = None):
         self.settings = settings or Settings()
         self.customer_provider = HealthcareProvider(self.settings)
+        self._search_indexes: Dict[Tuple[str, str], Tuple[Dict, SearchIndex]] = {}
+        self._search_indexes_lock = threading.Lock()
     
     def get_all_provider_services(self, provider: str, plan: str) -> Dict:
         try:
@@ -18,14 +25,73 @@ class CustomerService:
             logging.error(f"Invalid provider or plan: {e}")
             return {}
 
+    def _get_search_index(self, provider: str, plan: str) -> Tuple[Dict, SearchIndex]:
+        """
+        BM25 index of the services of a provider's plan, rebuilt when the underlying data changes
+
+        Returns:
+            The services view the index was built from, and the index
+        """
+        services = self.get_all_provider_services(provider, plan)
+        with self._search_indexes_lock:
+            cached = self._search_indexes.get((provider, plan))
+            # The provider hands out a new view object whenever its data is reloaded
+            if cached is not None and cached[0] is services:
+                return cached
+
+            documents = [
+                {
+                    'category': data.get('general_info', {}).get('title', category),
+                    'category_id': category,
+                    'name': service['name'],
+                    'details': service['details']
+                }
+                for category, data in services.items()
+                for service in data.get('services', [])
+            ]
+            self._search_indexes[(provider, plan)] = (services, SearchIndex(documents, SEARCH_FIELDS))
+            return self._search_indexes[(provider, plan)]
+
+    def search_provider_services(self, provider: str, plan: str, query: str, top_k: int = 5) -> Dict:
+        """
+        Services of a provider's plan that best match a free text query
+
+        Returns:
+            dict: 'results' (category, name, details and score of up to top_k services, best first)
+                  and 'contact_info' of the categories they belong to; {} for an invalid provider or plan
+        """
+        try:
+            HealthcareFilter(provider=provider, plan=plan)
+        except ValueError as e:
+            logging.error(f"Invalid provider or plan: {e}")
+            return {}
+
+        # Contact info comes from the same snapshot as the index, even if the data is reloaded meanwhile
+        services, index = self._get_search_index(provider, plan)
+        results: List[Dict] = []
+        contact_info = {}
+        for score, document in index.search(query, top_k):
+            results.append({
+                'category': document['category'],
+                'name': document['name'],
+                'details': document['details'],
+                'score': round(score, 3)
+            })
+            contact_info[document['category']] = services[document['category_id']].get('contact_info', {})
+
+        return {'results': results, 'contact_info': contact_info}
+
 # Example usage:
 if __name__ == "__main__":
     settings = Settings()
     service = CustomerService(settings)
 
-    # Get all services for Maccabi Gold
+    # Get all services for Maccabi Gold, and the ones matching a question
     maccabi_gold_services = service.get_all_provider_services('maccabi', 'gold')
-    json_response = json.dumps(maccabi_gold_services, indent=4, ensure_ascii=False)
+    maccabi_gold_search = service.search_provider_services('maccabi', 'gold', 'טיפול שיניים', top_k=3)
+    json_response = json.dumps(
+        {'services': maccabi_gold_services, 'search': maccabi_gold_search}, indent=4, ensure_ascii=False
+    )
     print(json_response)
 
     settings.clean_pycache()
@@ -1,5 +1,5 @@
 import streamlit as st
-from typing import List, Dict, Optional
+from typing import Callable, Iterable, List, Dict, Optional
 from dataclasses import dataclass
 from datetime import datetime
 
@@ -41,6 +41,26 @@ class ChatManager:
                 st.markdown(content)
                 st.caption(f"Sent at: {message['timestamp'].strftime('%Y-%m-%d %H:%M:%S')}")
     
+    def stream_message(self, role: str, chunks: Iterable[str]) -> str:
+        """Display a message as its chunks arrive, then add it to the chat history."""
+        with st.chat_message(role):
+            placeholder = st.empty()
+            content = ""
+            for chunk in chunks:
+                content += chunk
+                placeholder.markdown(content + "▌")
+            placeholder.markdown(content)
+
+            message = {
+                "role": role,
+                "content": content,
+                "timestamp": datetime.now()
+            }
+            st.caption(f"Sent at: {message['timestamp'].strftime('%Y-%m-%d %H:%M:%S')}")
+
+        st.session_state.messages.append(message)
+        return content
+    
     def get_user_input(self, placeholder: str = "Type your message...") -> Optional[str]:
         """Get user input from the chat input field."""
         return st.chat_input(placeholder)
@@ -53,12 +73,20 @@ class ChatManager:
         """Return the complete chat history."""
         return st.session_state.messages
     
-    def handle_user_input(self, callback_fn=None):
-        """Handle user input and process it through an optional callback function."""
+    def handle_user_input(self, callback_fn=None, stream_fn: Optional[Callable[[str], Iterable[str]]] = None):
+        """
+        Handle user input and process it through an optional callback function.
+
+        If stream_fn is given, the response it yields is rendered as it arrives instead.
+        """
         if prompt := self.get_user_input():
             # Add user message
             self.add_message("user", prompt, display=True)
             
+            if stream_fn:
+                self.stream_message("assistant", stream_fn(prompt))
+                return prompt
+
             # Process response through callback if provided
             if callback_fn:
                 response = callback_fn(prompt)
@@ -1,4 +1,4 @@
-from typing import List, Dict, Any, Optional
+from typing import Iterator, List, Dict, Any, Optional
 import json
 from enum import Enum
 from gpt_client import GPTClient
@@ -17,6 +17,9 @@ class Message:
         self.tool_call_id = tool_call_id
         self.name = name
 
+# Model turns that may call tools before a streamed reply is given up on
+MAX_TOOL_ROUNDS = 3
+
 class ConversationManager:
     def __init__(self, client: GPTClient):
         self.client = client
@@ -41,38 +44,7 @@ class ConversationManager:
 
             # Handle tool calls
             if 'tool_calls' in response:
-                # Add assistant's message with tool calls
-                self.add_message(Message(
-                    role=MessageRole.ASSISTANT,
-                    content=response.get('content'),
-                    tool_calls=response['tool_calls']
-                ))
-
-                # Process tool results
-                tool_responses = []
-                for result in response.get('tool_results', []):
-                    try:
-                        tool_content = json.loads(result['response'])
-                        
-                        # Format tool response based on the type
-                        if 'current_data' in tool_content:
-                            # Handle user data updates
-                            formatted_data = self._format_user_data(tool_content['current_data'])
-                            tool_responses.append(formatted_data)
-                        elif 'services' in tool_content:
-                            # Handle healthcare services data
-                            formatted_services = self._format_services_data(tool_content)
-                            tool_responses.append(formatted_services)
-                        
-                        # Add tool response to history
-                        self.add_message(Message(
-                            role=MessageRole.TOOL,
-                            content=json.dumps(tool_content),
-                            tool_call_id=result['tool_call_id'],
-                            name=result['tool_call_id']
-                        ))
-                    except json.JSONDecodeError:
-                        continue
+                tool_responses = self._add_tool_results(response)
 
                 # Get follow-up response from GPT
                 follow_up_response = self.client.chat(self.history)
@@ -93,6 +65,52 @@ class ConversationManager:
             print(f"Error in process_response: {str(e)}")
             return "I encountered an error processing the response. Please try again."
 
+    def _add_tool_results(self, response: Dict[str, Any]) -> List[str]:
+        """
+        Add an assistant tool call message and the tool results to the history
+
+        Returns:
+            The tool results formatted for display
+        """
+        # Add assistant's message with tool calls
+        self.add_message(Message(
+            role=MessageRole.ASSISTANT,
+            content=response.get('content'),
+            tool_calls=response['tool_calls']
+        ))
+
+        # Process tool results
+        tool_responses = []
+        for result in response.get('tool_results', []):
+            try:
+                tool_content = json.loads(result['response'])
+                
+                # Format tool response based on the type
+                if 'current_data' in tool_content:
+                    # Handle user data updates
+                    formatted_data = self._format_user_data(tool_content['current_data'])
+                    tool_responses.append(formatted_data)
+                elif 'services' in tool_content:
+                    # Handle healthcare services data
+                    formatted_services = self._format_services_data(tool_content)
+                    tool_responses.append(formatted_services)
+                elif 'results' in tool_content:
+                    # Handle healthcare services search results
+                    formatted_results = self._format_search_results(tool_content)
+                    tool_responses.append(formatted_results)
+                
+                # Add tool response to history
+                self.add_message(Message(
+                    role=MessageRole.TOOL,
+                    content=result['response'],
+                    tool_call_id=result['tool_call_id'],
+                    name=result['tool_call_id']
+                ))
+            except json.JSONDecodeError:
+                continue
+
+        return tool_responses
+
     def _format_user_data(self, user_data: Dict[str, str]) -> str:
         """Format user data for display"""
         formatted_fields = [
@@ -121,6 +139,25 @@ class ConversationManager:
             print(f"Error formatting services: {str(e)}")
             return "Error formatting services information"
 
+    def _format_search_results(self, search_data: Dict[str, Any]) -> str:
+        """Format services search results for display"""
+        try:
+            if search_data.get('status') != 'success':
+                return f"Error: {search_data.get('message', 'Unknown error')}"
+
+            results = search_data.get('results', [])
+            if not results:
+                return f"No services matching '{search_data['query']}' were found for your plan."
+
+            formatted_text = f"Services matching '{search_data['query']}' for {search_data['hmo'].title()} {search_data['plan'].title()} Plan:\n\n"
+            for result in results:
+                formatted_text += f"• {result['category']} - {result['name']}: {result['details']}\n"
+
+            return formatted_text
+        except Exception as e:
+            print(f"Error formatting search results: {str(e)}")
+            return "Error formatting search results"
+
     def prompt_for_user_information(self) -> str:
         """Initialize the conversation with a structured prompt"""
         initial_prompt = """I'll help you collect your healthcare information. I need:
@@ -171,6 +208,62 @@ Please provide your information and I'll help collect it all. Let's start - what
             print(f"Error in send_message: {str(e)}")
             return "I apologize, but I encountered an error. Please try again."
 
+    def send_message_stream(self, content: str) -> Iterator[str]:
+        """
+        Like send_message, but yield the reply in pieces as the model streams it
+
+        Tool calls are executed as soon as the model has finished requesting them,
+        and the model is then asked again (at most MAX_TOOL_ROUNDS times).
+        """
+        try:
+            # Add user message to history
+            self.add_message(Message(role=MessageRole.USER, content=content))
+            
+            # Handle confirmation and transition
+            if self.user_data_complete and content.lower() in ['yes', 'confirm', 'ok']:
+                if not self.confirmed:
+                    self.confirmed = True
+                    yield self.transition_to_qa()
+                    return
+
+            tool_responses = []
+            for _ in range(MAX_TOOL_ROUNDS):
+                content_parts = []
+                tool_call_response = None
+                for event in self.client.chat_stream(self.history):
+                    if event['type'] == 'content':
+                        content_parts.append(event['delta'])
+                        yield event['delta']
+                    elif event['type'] == 'tool_calls':
+                        tool_call_response = event
+                    elif event['type'] == 'error':
+                        # Keep the failed reply out of the history sent to the model
+                        print(f"Error in send_message_stream: {event['message']}")
+                        yield ("\n\n" if content_parts else "") + "I apologize, but I encountered an error. Please try again."
+                        return
+
+                if tool_call_response is None:
+                    result = ''.join(content_parts)
+                    if result:
+                        self.add_message(Message(role=MessageRole.ASSISTANT, content=result))
+                        # Check if all information is collected
+                        if "summary" in result.lower() and "correct" in result.lower():
+                            self.user_data_complete = True
+                        return
+                    break
+
+                tool_responses = self._add_tool_results(tool_call_response)
+
+            # If no follow-up text, show formatted tool responses
+            if tool_responses:
+                yield "\n\n".join(tool_responses)
+            else:
+                yield "I apologize, but I couldn't process that properly. Please try again."
+
+        except Exception as e:
+            print(f"Error in send_message_stream: {str(e)}")
+            yield "I apologize, but I encountered an error. Please try again."
+
     def transition_to_qa(self) -> str:
         """Transition to Q&A phase with new system message"""
         self.collection_phase = False
@@ -178,12 +271,14 @@ Please provide your information and I'll help collect it all. Let's start - what
         system_message = Message(
             role=MessageRole.SYSTEM,
             content="""You are now a healthcare services assistant. Use the stored user information to:
-1. Answer questions about available services using the get_healthcare_services function
+1. Answer questions about available services using the search_healthcare_services function
 2. Handle information updates using the update_user_data function when needed
 3. Provide personalized responses based on the user's HMO and plan
 
 When users ask about services:
-- Call get_healthcare_services with their HMO and plan
+- Call search_healthcare_services with a short query describing the service, and their HMO and plan
+- Search again with other wording if the results do not answer the question
+- Only call get_healthcare_services when the user asks for an overview of all their services
 - Explain the benefits in a clear way
 - Mention any service limitations for their plan
 
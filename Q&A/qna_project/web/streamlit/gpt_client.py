@@ -1,5 +1,6 @@
 import json
-from typing import List, Dict, Any, Optional, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Callable, Iterator, Optional, Union
 from dataclasses import dataclass
 from enum import Enum
 import requests
@@ -18,8 +19,19 @@ class Message:
     tool_call_id: Optional[str] = None
     name: Optional[str] = None
 
+# Tool calls of all clients (one per Streamlit session) share one bounded pool, so sessions
+# that end without cleanup do not leave threads behind
+MAX_TOOL_WORKERS = 4
+_tool_executor = ThreadPoolExecutor(max_workers=MAX_TOOL_WORKERS, thread_name_prefix='tool')
+
 class GPTClient:
     def __init__(self, api_key: str, endpoint: str, tools: Dict[str, Dict[str, Any]]):
+        """
+        Args:
+            api_key: Azure OpenAI API key
+            endpoint: Chat completions endpoint
+            tools: Tool definitions by name (see tools.get_registry)
+        """
         self.api_key = api_key
         self.endpoint = endpoint
         self.tools = tools
@@ -27,6 +39,19 @@ class GPTClient:
             "Content-Type": "application/json",
             "api-key": api_key,
         }
+        self.tool_functions = self._resolve_tool_functions()
+
+    def _resolve_tool_functions(self) -> Dict[str, Callable[..., str]]:
+        """Map every registered tool to its function in the tools module"""
+        import tools as tools_module
+
+        tool_functions = {}
+        for tool_name in self.tools:
+            function = getattr(tools_module, tool_name, None)
+            if not callable(function):
+                raise ValueError(f"Tool function {tool_name} not implemented")
+            tool_functions[tool_name] = function
+        return tool_functions
 
     def _format_messages(self, messages: List[Message]) -> List[Dict]:
         formatted_messages = []
@@ -53,23 +78,44 @@ class GPTClient:
 
     def _execute_tool(self, tool_name: str, arguments: Dict[str, Any]) -> str:
         """Execute a registered tool"""
-        if tool_name not in self.tools:
+        if tool_name not in self.tool_functions:
             raise ValueError(f"Tool {tool_name} not found in registered tools")
-            
-        # Import tools dynamically
-        from tools import update_user_data, get_healthcare_services
-        
-        # Map tool names to functions
-        tool_functions = {
-            'update_user_data': update_user_data,
-            'get_healthcare_services': get_healthcare_services
-        }
-        
-        if tool_name not in tool_functions:
-            raise ValueError(f"Tool function {tool_name} not implemented")
-            
+
         # Execute the tool function with the provided arguments
-        return tool_functions[tool_name](**arguments)
+        return self.tool_functions[tool_name](**arguments)
+
+    def _execute_tool_calls(self, tool_calls: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+        """
+        Execute the tool calls of one model turn, concurrently when there are several
+
+        Returns:
+            Tool results ({'tool_call_id', 'response'}) in the order of tool_calls
+        """
+        calls = []
+        for tool_call in tool_calls:
+            tool_name = tool_call['function']['name']
+            try:
+                args = json.loads(tool_call['function']['arguments'])
+            except json.JSONDecodeError:
+                raise ValueError(f"Invalid arguments for tool {tool_name}")
+            calls.append((tool_name, args))
+
+        if len(calls) == 1:
+            responses = [self._execute_tool(*calls[0])]
+        else:
+            futures = [_tool_executor.submit(self._execute_tool, tool_name, args) for tool_name, args in calls]
+            responses = [future.result() for future in futures]
+
+        tool_results = []
+        for tool_call, (tool_name, _), tool_response in zip(tool_calls, calls, responses):
+            if not self._validate_tool_response(tool_response):
+                raise ValueError(f"Invalid response from tool {tool_name}")
+
+            tool_results.append({
+                'tool_call_id': tool_call['id'],
+                'response': tool_response
+            })
+        return tool_results
 
     def _validate_tool_response(self, response: str) -> bool:
         """Basic validation of tool response"""
@@ -79,10 +125,8 @@ class GPTClient:
         except json.JSONDecodeError:
             return False
 
-    def chat(self, messages: List[Message]) -> Dict[str, Any]:
-        """
-        Send a chat request with optional tool calls
-        """
+    def _build_payload(self, messages: List[Message], stream: bool = False) -> Dict[str, Any]:
+        """Chat completions request body"""
         payload = {
             "messages": self._format_messages(messages),
             "tools": list(self.tools.values()),
@@ -90,6 +134,15 @@ class GPTClient:
             "temperature": 0.7,
             "max_tokens": 800
         }
+        if stream:
+            payload["stream"] = True
+        return payload
+
+    def chat(self, messages: List[Message]) -> Dict[str, Any]:
+        """
+        Send a chat request with optional tool calls
+        """
+        payload = self._build_payload(messages)
 
         response = requests.post(
             self.endpoint,
@@ -107,23 +160,7 @@ class GPTClient:
         
             # Process tool calls if present
             if 'tool_calls' in message:
-                tool_results = []
-                for tool_call in message['tool_calls']:
-                    tool_name = tool_call['function']['name']
-                    try:
-                        args = json.loads(tool_call['function']['arguments'])
-                    except json.JSONDecodeError:
-                        raise ValueError(f"Invalid arguments for tool {tool_name}")
-                        
-                    tool_response = self._execute_tool(tool_name, args)
-                    
-                    if not self._validate_tool_response(tool_response):
-                        raise ValueError(f"Invalid response from tool {tool_name}")
-                        
-                    tool_results.append({
-                        'tool_call_id': tool_call['id'],
-                        'response': tool_response
-                    })
+                tool_results = self._execute_tool_calls(message['tool_calls'])
                 
                 return {
                     'content': message.get('content'),
@@ -139,4 +176,91 @@ class GPTClient:
         
         except ValueError as e:
             print(e)
-            return {"content": str(e)}
\ No newline at end of file
+            return {"content": str(e)}
+
+    @staticmethod
+    def _iter_sse_chunks(response: requests.Response) -> Iterator[Dict[str, Any]]:
+        """Parsed JSON chunks of a server-sent events response, up to the [DONE] marker"""
+        # chunk_size=None hands over each chunk as it arrives instead of filling a buffer first
+        for line in response.iter_lines(chunk_size=None):
+            # Decode explicitly: the content type of the stream carries no charset
+            line = line.decode('utf-8').strip()
+            if not line.startswith('data:'):
+                continue
+            data = line[len('data:'):].strip()
+            if data == '[DONE]':
+                break
+            yield json.loads(data)
+
+    def chat_stream(self, messages: List[Message]) -> Iterator[Dict[str, Any]]:
+        """
+        Send a streaming chat request and yield events as the completion arrives
+
+        Events:
+            {'type': 'content', 'delta': str}: the next piece of the assistant's text
+            {'type': 'tool_call_delta', 'index': int, 'name': str, 'arguments': str}: a piece
+                of a tool call (the name is only sent in the call's first delta)
+            {'type': 'tool_calls', 'content', 'tool_calls', 'tool_results'}: last event of a
+                turn that called tools, once the calls are assembled and executed
+            {'type': 'error', 'message': str}: the request or the API failed; last event
+                of the stream (content yielded before it is incomplete)
+        """
+        try:
+            response = requests.post(
+                self.endpoint,
+                headers=self.headers,
+                json=self._build_payload(messages, stream=True),
+                stream=True
+            )
+
+            content_parts = []
+            tool_calls: Dict[int, Dict[str, Any]] = {}
+            with response:
+                if response.status_code != 200:
+                    raise ValueError(f"API request failed ({response.status_code}): {response.text}")
+
+                for chunk in self._iter_sse_chunks(response):
+                    # Content filter results arrive as chunks without choices
+                    if not chunk.get('choices'):
+                        continue
+                    delta = chunk['choices'][0].get('delta', {})
+
+                    if delta.get('content'):
+                        content_parts.append(delta['content'])
+                        yield {'type': 'content', 'delta': delta['content']}
+
+                    for tool_call_delta in delta.get('tool_calls') or []:
+                        index = tool_call_delta.get('index', 0)
+                        tool_call = tool_calls.setdefault(index, {
+                            'id': None,
+                            'type': 'function',
+                            'function': {'name': '', 'arguments': ''}
+                        })
+                        if tool_call_delta.get('id'):
+                            tool_call['id'] = tool_call_delta['id']
+                        function = tool_call_delta.get('function') or {}
+                        tool_call['function']['name'] += function.get('name') or ''
+                        tool_call['function']['arguments'] += function.get('arguments') or ''
+                        yield {
+                            'type': 'tool_call_delta',
+                            'index': index,
+                            'name': function.get('name') or '',
+                            'arguments': function.get('arguments') or ''
+                        }
+
+            if tool_calls:
+                ordered_calls = [tool_calls[index] for index in sorted(tool_calls)]
+                yield {
+                    'type': 'tool_calls',
+                    'content': ''.join(content_parts) or None,
+                    'tool_calls': ordered_calls,
+                    'tool_results': self._execute_tool_calls(ordered_calls)
+                }
+
+        except requests.RequestException as e:
+            print(f"Request failed: {e}")
+            yield {'type': 'error', 'message': "Error: Request failed"}
+
+        except ValueError as e:
+            print(e)
+            yield {'type': 'error', 'message': str(e)}
@@ -6,7 +6,7 @@ from conversation_manager import ConversationManager
 from gpt_client import GPTClient
 from tools import get_registry
 from chat_manager import ChatManager
-from typing import Optional
+from typing import Iterator, Optional
 
 def load_config() -> dict:
     """Load configuration from .env file"""
@@ -59,6 +59,18 @@ class HealthcareAssistant:
             st.error(f"Error processing response: {str(e)}")
             return "I apologize, but I encountered an error. Please try again."
 
+    def handle_response_stream(self, user_input: str) -> Iterator[str]:
+        """Handle user input and yield the response as it is streamed"""
+        try:
+            if not user_input:
+                return
+                
+            yield from self.conversation.send_message_stream(user_input)
+            
+        except Exception as e:
+            st.error(f"Error processing response: {str(e)}")
+            yield "I apologize, but I encountered an error. Please try again."
+
 def main():
     st.set_page_config(
         page_title="Healthcare Assistant",
@@ -96,7 +108,7 @@ def main():
         
         # Handle user input
         st.session_state.assistant.chat_manager.handle_user_input(
-            callback_fn=st.session_state.assistant.handle_response
+            stream_fn=st.session_state.assistant.handle_response_stream
         )
         
     except ValueError as e:
@@ -1,6 +1,9 @@
 from functools import wraps
-from typing import Callable, Dict, Any
+from typing import Callable, Dict, Any, Optional, Tuple
+import hashlib
 import json
+import threading
+import time
 from pathlib import Path
 import sys
 from datetime import datetime
@@ -31,29 +34,30 @@ service = CustomerService(settings)
 TOOL_REGISTRY = {}
 
 def log_tool_call(func):
-    """Decorator to log tool calls"""
+    """Decorator to log tool calls (the result is logged by size and hash only)"""
     @wraps(func)
     def wrapper(*args, **kwargs):
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        logger.info(f"Tool Call - {timestamp}")
-        logger.info(f"Function: {func.__name__}")
-        logger.info(f"Arguments: {kwargs}")
-        
+        start = time.perf_counter()
         try:
             result = func(*args, **kwargs)
-            logger.info(f"Result: {result}")
-            return result
         except Exception as e:
             logger.error(f"Error in {func.__name__}: {str(e)}")
             raise
+
+        digest = hashlib.sha256(result.encode('utf-8')).hexdigest()[:12] if isinstance(result, str) else None
+        logger.info(
+            f"Tool Call - {func.__name__} {kwargs} -> {len(result or '')} chars, "
+            f"sha256 {digest}, {(time.perf_counter() - start) * 1000:.2f} ms"
+        )
+        return result
     return wrapper
 
 def register_tool(name: str, description: str, parameters: Dict[str, Any]):
     """Decorator to register a function as a tool"""
     global TOOL_REGISTRY
     def decorator(func: Callable):
-        @wraps(func)
         @log_tool_call
+        @wraps(func)
         def wrapper(*args, **kwargs):
             return func(*args, **kwargs)
         
@@ -68,8 +72,38 @@ def register_tool(name: str, description: str, parameters: Dict[str, Any]):
         return wrapper
     return decorator
 
-# Initialize user data
+# Initialize user data (tool calls of one model turn may run concurrently)
 user_data = {}
+_user_data_lock = threading.Lock()
+
+# Serialized get_healthcare_services responses by (hmo, plan), with the services view they were built from
+_services_responses: Dict[Tuple[str, str], Tuple[Any, str]] = {}
+_services_responses_lock = threading.Lock()
+
+def _services_response(hmo_name: str, insurance_plan: str) -> Optional[str]:
+    """
+    Serialized services response of an HMO plan, or None if it has no services
+
+    The JSON is built on the plan's first request and reused until the provider
+    reloads its data (it then hands out a new services view).
+    """
+    services = service.get_all_provider_services(hmo_name, insurance_plan)
+    if not services:
+        return None
+
+    with _services_responses_lock:
+        cached = _services_responses.get((hmo_name, insurance_plan))
+        if cached is not None and cached[0] is services:
+            return cached[1]
+
+        response = json.dumps({
+            "status": "success",
+            "hmo": hmo_name,
+            "plan": insurance_plan,
+            "services": services
+        }, ensure_ascii=False)
+        _services_responses[(hmo_name, insurance_plan)] = (services, response)
+        return response
 
 @register_tool(
     name="update_user_data",
@@ -99,19 +133,21 @@ def update_user_data(updates: Dict[str, str]) -> str:
     global user_data
     updated_fields = {}
     
-    for field, value in updates.items():
-        user_data[field] = value
-        updated_fields[field] = value
+    with _user_data_lock:
+        for field, value in updates.items():
+            user_data[field] = value
+            updated_fields[field] = value
 
-    response = {
-        "updated_fields": updated_fields,
-        "current_data": user_data
-    }
+        response = {
+            "updated_fields": updated_fields,
+            "current_data": dict(user_data)
+        }
     return json.dumps(response)
 
 @register_tool(
     name="get_healthcare_services",
-    description="Get available healthcare services based on HMO and insurance plan",
+    description="Get all available healthcare services based on HMO and insurance plan. "
+                "Returns the full catalog; use search_healthcare_services for questions about specific services.",
     parameters={
         "type": "object",
         "properties": {
@@ -135,10 +171,65 @@ def get_healthcare_services(hmo_name: str, insurance_plan: str) -> str:
         hmo_name = hmo_name.lower()
         insurance_plan = insurance_plan.lower()
 
-        # Get services from the database
-        services = service.get_all_provider_services(hmo_name, insurance_plan)
+        # Get the serialized services of the plan
+        response = _services_response(hmo_name, insurance_plan)
+        
+        if response is None:
+            return json.dumps({
+                "status": "error",
+                "message": f"No services found for {hmo_name} {insurance_plan}"
+            })
+
+        return response
         
-        if not services:
+    except Exception as e:
+        logger.error(f"Error in get_healthcare_services: {str(e)}")
+        return json.dumps({
+            "status": "error",
+            "message": str(e)
+        })
+
+@register_tool(
+    name="search_healthcare_services",
+    description="Search the services covered by the user's HMO and insurance plan. "
+                "Returns only the services that best match the query, with their plan details "
+                "and the contact information of their category. Prefer this over get_healthcare_services.",
+    parameters={
+        "type": "object",
+        "properties": {
+            "query": {
+                "type": "string",
+                "description": "What the user is asking about, e.g. a service or treatment name (Hebrew or English)"
+            },
+            "hmo_name": {
+                "type": "string",
+                "description": "Name of the HMO provider (maccabi/meuhedet/clalit)",
+                "enum": ["maccabi", "meuhedet", "clalit"]
+            },
+            "insurance_plan": {
+                "type": "string",
+                "description": "Insurance plan level (gold/silver/bronze)",
+                "enum": ["gold", "silver", "bronze"]
+            },
+            "top_k": {
+                "type": "integer",
+                "description": f"Maximum number of services to return (default {settings.SEARCH_TOP_K})",
+                "minimum": 1,
+                "maximum": settings.SEARCH_MAX_TOP_K
+            }
+        },
+        "required": ["query", "hmo_name", "insurance_plan"]
+    }
+)
+def search_healthcare_services(query: str, hmo_name: str, insurance_plan: str, top_k: int = None) -> str:
+    try:
+        hmo_name = hmo_name.lower()
+        insurance_plan = insurance_plan.lower()
+        top_k = min(max(int(top_k or settings.SEARCH_TOP_K), 1), settings.SEARCH_MAX_TOP_K)
+
+        matches = service.search_provider_services(hmo_name, insurance_plan, query, top_k)
+
+        if not matches:
             return json.dumps({
                 "status": "error",
                 "message": f"No services found for {hmo_name} {insurance_plan}"
@@ -148,18 +239,19 @@ def get_healthcare_services(hmo_name: str, insurance_plan: str) -> str:
             "status": "success",
             "hmo": hmo_name,
             "plan": insurance_plan,
-            "services": services
+            "query": query,
+            **matches
         }, ensure_ascii=False)
-        
+
     except Exception as e:
-        logger.error(f"Error in get_healthcare_services: {str(e)}")
+        logger.error(f"Error in search_healthcare_services: {str(e)}")
         return json.dumps({
             "status": "error",
             "message": str(e)
         })
 
 # Ensure TOOL_REGISTRY is populated before export
-if "update_user_data" not in TOOL_REGISTRY or "get_healthcare_services" not in TOOL_REGISTRY:
+if any(name not in TOOL_REGISTRY for name in ("update_user_data", "get_healthcare_services", "search_healthcare_services")):
     raise RuntimeError("Tools were not properly registered")
 
 # Function to get the registry
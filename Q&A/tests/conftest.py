@@ -0,0 +1,26 @@
+import shutil
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+QNA_ROOT = Path(__file__).resolve().parents[1]
+# The Streamlit modules import each other as top-level modules
+for path in (QNA_ROOT, QNA_ROOT / "qna_project" / "web" / "streamlit"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+RESOURCES_DIR = QNA_ROOT / "resources"
+
+@pytest.fixture
+def data_settings(tmp_path):
+    """Settings for HealthcareProvider over a temporary copy of the processed JSON files"""
+    json_dir = tmp_path / "processed_html"
+    shutil.copytree(RESOURCES_DIR / "processed_html", json_dir)
+    return SimpleNamespace(
+        PROCESSED_HTML_DIR=json_dir,
+        KNOWLEDGE_BASE_PATH=tmp_path / "knowledge_base.json",
+        JSON_CACHE_MAX_BYTES=64 * 1024 * 1024,
+        DATA_REVALIDATE_SECONDS=0.0
+    )
@@ -0,0 +1,98 @@
+import json
+
+import pytest
+
+import gpt_client
+from conversation_manager import ConversationManager
+from gpt_client import GPTClient, Message, MessageRole
+
+class FakeStreamResponse:
+    """Stands in for a streamed requests.Response"""
+
+    status_code = 200
+
+    def __init__(self, lines):
+        self.lines = lines
+        self.closed = False
+
+    def iter_lines(self, chunk_size=512):
+        for line in self.lines:
+            yield line.encode('utf-8')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.closed = True
+        return False
+
+def _sse(*chunks):
+    lines = []
+    for chunk in chunks:
+        lines += [f"data: {json.dumps(chunk, ensure_ascii=False)}", ""]
+    return lines + ["data: [DONE]", "", "data: {\"ignored\": true}"]
+
+def _delta(**delta):
+    return {'choices': [{'index': 0, 'delta': delta}]}
+
+def _respond(monkeypatch, response):
+    monkeypatch.setattr(gpt_client.requests, 'post', lambda *args, **kwargs: response)
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # Importing the tools module opens tool_calls.log in the working directory
+    client = GPTClient(api_key='key', endpoint='https://example.invalid/chat', tools={})
+    client.tool_functions = {
+        'lookup': lambda query: json.dumps({'query': query}, ensure_ascii=False)
+    }
+    return client
+
+def test_iter_sse_chunks_stops_at_done():
+    response = FakeStreamResponse([": keep-alive", "", 'data: {"a": "שלום"}', "", "data: [DONE]", 'data: {"b": 1}'])
+    assert list(GPTClient._iter_sse_chunks(response)) == [{'a': 'שלום'}]
+
+def test_chat_stream_yields_content_deltas(client, monkeypatch):
+    chunks = _sse({'choices': []}, _delta(role='assistant'), _delta(content='של'), _delta(content='ום'))
+    _respond(monkeypatch, FakeStreamResponse(chunks))
+    events = list(client.chat_stream([Message(role=MessageRole.USER, content='היי')]))
+    assert events == [{'type': 'content', 'delta': 'של'}, {'type': 'content', 'delta': 'ום'}]
+
+def test_chat_stream_assembles_tool_calls(client, monkeypatch):
+    _respond(monkeypatch, FakeStreamResponse(_sse(
+        _delta(tool_calls=[{'index': 1, 'id': 'call_b', 'function': {'name': 'lookup', 'arguments': ''}}]),
+        _delta(tool_calls=[{'index': 0, 'id': 'call_a', 'function': {'name': 'lookup', 'arguments': '{"query": '}}]),
+        _delta(tool_calls=[{'index': 0, 'function': {'arguments': '"שיניים"}'}}]),
+        _delta(tool_calls=[{'index': 1, 'function': {'arguments': '{"query": "עיניים"}'}}]),
+    )))
+    events = list(client.chat_stream([Message(role=MessageRole.USER, content='היי')]))
+
+    assert [event['type'] for event in events] == ['tool_call_delta'] * 4 + ['tool_calls']
+    assert events[0] == {'type': 'tool_call_delta', 'index': 1, 'name': 'lookup', 'arguments': ''}
+    final = events[-1]
+    assert final['content'] is None
+    assert [(call['id'], call['function']['arguments']) for call in final['tool_calls']] == [
+        ('call_a', '{"query": "שיניים"}'), ('call_b', '{"query": "עיניים"}')
+    ]
+    assert final['tool_results'] == [
+        {'tool_call_id': 'call_a', 'response': '{"query": "שיניים"}'},
+        {'tool_call_id': 'call_b', 'response': '{"query": "עיניים"}'}
+    ]
+
+def test_chat_stream_reports_http_errors(client, monkeypatch):
+    response = FakeStreamResponse([])
+    response.status_code = 429
+    response.text = 'rate limited'
+    _respond(monkeypatch, response)
+    events = list(client.chat_stream([Message(role=MessageRole.USER, content='היי')]))
+    assert events == [{'type': 'error', 'message': 'API request failed (429): rate limited'}]
+    assert response.closed
+
+def test_stream_errors_stay_out_of_history(client, monkeypatch):
+    response = FakeStreamResponse([])
+    response.status_code = 500
+    response.text = 'server error'
+    _respond(monkeypatch, response)
+    conversation = ConversationManager(client)
+    reply = ''.join(conversation.send_message_stream('שלום'))
+    assert 'server error' not in reply and reply.startswith('I apologize')
+    assert [message.role.value for message in conversation.history] == ['user']
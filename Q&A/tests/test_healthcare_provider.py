@@ -0,0 +1,50 @@
+import copy
+import os
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from qna_project.clients.healthcare_provider import FrozenDict, HealthcareFilter, HealthcareProvider, freeze
+
+def test_views_are_precomputed_and_shared(data_settings):
+    provider = HealthcareProvider(data_settings)
+    view = provider.get_all_services_data(HealthcareFilter(provider='maccabi', plan='gold'))
+    assert view is provider.get_all_services_data(HealthcareFilter(provider='maccabi', plan='gold'))
+    assert set(view) == {path.stem for path in data_settings.PROCESSED_HTML_DIR.glob('*.json')}
+    with pytest.raises(TypeError):
+        view.clear()
+
+def test_frozen_views_are_read_only_but_copyable():
+    frozen = freeze({'services': [{'name': 'a', 'details': 'b'}]})
+    assert isinstance(frozen, FrozenDict) and isinstance(frozen['services'], tuple)
+    with pytest.raises(TypeError):
+        frozen['services'] = []
+
+    copied = copy.deepcopy(frozen)
+    copied['services'].append({'name': 'c'})
+    assert type(copied) is dict and len(frozen['services']) == 1
+    assert type(copy.copy(frozen)) is dict
+
+    restored = pickle.loads(pickle.dumps(frozen))
+    assert type(restored) is FrozenDict and restored == frozen
+
+def test_concurrent_reads_while_files_change(data_settings):
+    provider = HealthcareProvider(data_settings)
+    healthcare_filter = HealthcareFilter(provider='clalit', plan='silver')
+    expected = provider.get_all_services_data(healthcare_filter)
+    json_file = sorted(data_settings.PROCESSED_HTML_DIR.glob('*.json'))[0]
+
+    def read(i):
+        if i % 4 == 0:
+            # Same content, new mtime: every revalidation sees a change and rebuilds
+            mtime_ns = json_file.stat().st_mtime_ns + 1_000_000 * (i + 1)
+            os.utime(json_file, ns=(mtime_ns, mtime_ns))
+        return provider.get_all_services_data(healthcare_filter)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        views = list(executor.map(read, range(40)))
+
+    assert len({id(view) for view in views}) > 1  # the index was rebuilt meanwhile
+    assert all(view == expected for view in views)
+    assert provider.cache_stats()['entries'] <= len(list(data_settings.PROCESSED_HTML_DIR.glob('*.json')))
@@ -0,0 +1,28 @@
+import pytest
+
+from qna_project.clients.search_index import SearchIndex
+from qna_project.processors.hebrew_text import normalize, tokenize
+
+@pytest.mark.parametrize('text, expected', [
+    ('ד"ר', 'דר'),
+    ('ד״ר', 'דר'),
+    ('שׁוּלְחָן', 'שולחנ'),
+    ('קווים', 'קוימ'),
+    ('ABC Test', 'abc test'),
+])
+def test_normalize(text, expected):
+    assert normalize(text) == expected
+
+def test_tokenize_strips_up_to_two_prefix_letters():
+    assert tokenize('בדיקות וניקוי שיניים') == ['בדיקות', 'דיקות', 'וניקוי', 'ניקוי', 'שינימ', 'ינימ']
+    assert tokenize('ושבמ') == ['ושבמ', 'שבמ', 'במ']
+    assert tokenize('וב') == ['וב']  # No stem would be left
+    assert tokenize('test 123') == ['test', '123']
+
+def test_prefixed_query_matches_bare_word():
+    index = SearchIndex(
+        [{'name': 'ניקוי אבנית'}, {'name': 'הלבנת שיניים'}, {'name': 'בדיקת ראייה'}],
+        {'name': 1}
+    )
+    assert [doc['name'] for _, doc in index.search('וניקוי')] == ['ניקוי אבנית']
+    assert [doc['name'] for _, doc in index.search('שן')] == []
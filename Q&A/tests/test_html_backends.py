@@ -0,0 +1,27 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from qna_project.processors.html_backends import available_backends, get_backend
+from qna_project.processors.html_processor import HTMLProcessor
+
+RESOURCES_DIR = Path(__file__).resolve().parents[1] / "resources"
+
+HTML_FILES = sorted((RESOURCES_DIR / "raw_html").glob('*.html'))
+
+@pytest.mark.parametrize('html_path', HTML_FILES, ids=lambda path: path.stem)
+def test_backends_produce_identical_json(html_path):
+    html_content = html_path.read_text(encoding='utf-8')
+    results = {backend: HTMLProcessor(backend).parse_html_to_json(html_content) for backend in available_backends()}
+    expected = results.pop('html.parser')
+    for backend, result in results.items():
+        assert result == expected, backend
+
+    processed_path = RESOURCES_DIR / "processed_html" / f"{html_path.stem}.json"
+    if processed_path.exists():
+        assert expected == json.loads(processed_path.read_text(encoding='utf-8'))
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        get_backend('regex')
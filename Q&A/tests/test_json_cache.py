@@ -0,0 +1,57 @@
+import json
+import os
+
+import pytest
+
+from qna_project.clients.json_cache import JSONCache
+
+def _write(path, data, mtime_ns=None):
+    path.write_text(json.dumps(data), encoding='utf-8')
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+def test_hits_and_reloads(tmp_path):
+    path = tmp_path / "a.json"
+    _write(path, {'value': 1}, mtime_ns=10**18)
+    cache = JSONCache()
+    first = cache.get(path)
+    assert cache.get(path) is first
+
+    _write(path, {'value': 2}, mtime_ns=2 * 10**18)
+    assert cache.get(path) == {'value': 2}
+    assert cache.stats() == {
+        'hits': 1, 'misses': 1, 'reloads': 1, 'evictions': 0, 'entries': 1, 'bytes': path.stat().st_size
+    }
+
+def test_evicts_least_recently_used(tmp_path):
+    paths = [tmp_path / f"{name}.json" for name in 'abc']
+    for path in paths:
+        _write(path, {'padding': 'x' * 10})
+    size = paths[0].stat().st_size
+
+    cache = JSONCache(max_bytes=2 * size)
+    cache.get(paths[0])
+    cache.get(paths[1])
+    cache.get(paths[0])
+    cache.get(paths[2])
+    assert cache.stats()['evictions'] == 1
+
+    cache.get(paths[0])
+    cache.get(paths[1])
+    assert cache.stats()['misses'] == 4
+
+def test_retain_and_deleted_files(tmp_path):
+    paths = [tmp_path / f"{name}.json" for name in 'ab']
+    for path in paths:
+        _write(path, [])
+    cache = JSONCache()
+    for path in paths:
+        cache.get(path)
+
+    cache.retain([paths[0]])
+    assert cache.stats()['entries'] == 1
+
+    paths[0].unlink()
+    with pytest.raises(FileNotFoundError):
+        cache.get(paths[0])
+    assert cache.stats()['entries'] == 0 and cache.stats()['bytes'] == 0
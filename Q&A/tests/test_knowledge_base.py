@@ -0,0 +1,67 @@
+import json
+import os
+
+from qna_project.clients.healthcare_provider import HealthcareFilter, HealthcareProvider
+from qna_project.clients.knowledge_base import (
+    PLANS, PROVIDERS, compile_knowledge_base, filter_document, load_knowledge_base
+)
+
+def _views(provider):
+    return {
+        (name, plan): provider.get_all_services_data(HealthcareFilter(provider=name, plan=plan))
+        for name in PROVIDERS for plan in PLANS
+    }
+
+def test_compiled_views_match_json_files(data_settings):
+    from_json = _views(HealthcareProvider(data_settings))
+
+    compile_knowledge_base(data_settings.PROCESSED_HTML_DIR, data_settings.KNOWLEDGE_BASE_PATH)
+    provider = HealthcareProvider(data_settings)
+    assert provider.cache_stats()['misses'] == 0  # Loaded from the knowledge base only
+    assert _views(provider) == from_json
+
+def test_compile_records_sources_and_filters(data_settings):
+    json_dir = data_settings.PROCESSED_HTML_DIR
+    knowledge_base = compile_knowledge_base(json_dir, data_settings.KNOWLEDGE_BASE_PATH)
+    names = sorted(path.name for path in json_dir.glob('*.json'))
+    assert sorted(knowledge_base['sources']) == names
+
+    data = json.loads((json_dir / names[0]).read_text(encoding='utf-8'))
+    view = knowledge_base['views']['maccabi']['gold'][names[0][:-len('.json')]]
+    assert view == filter_document(data, 'maccabi', 'gold')
+    assert all(set(service) == {'name', 'details'} for service in view['services'])
+
+def test_load_rejects_stale_or_foreign_knowledge_base(data_settings):
+    path = data_settings.KNOWLEDGE_BASE_PATH
+    names = [p.name for p in data_settings.PROCESSED_HTML_DIR.glob('*.json')]
+    assert load_knowledge_base(path, names) is None
+
+    compile_knowledge_base(data_settings.PROCESSED_HTML_DIR, path)
+    assert load_knowledge_base(path, names) is not None
+    assert load_knowledge_base(path, names[1:]) is None
+
+    knowledge_base = json.loads(path.read_text(encoding='utf-8'))
+    knowledge_base['version'] = -1
+    path.write_text(json.dumps(knowledge_base), encoding='utf-8')
+    assert load_knowledge_base(path, names) is None
+
+def test_edited_json_file_overrides_older_knowledge_base(data_settings):
+    compile_knowledge_base(data_settings.PROCESSED_HTML_DIR, data_settings.KNOWLEDGE_BASE_PATH)
+    json_path = sorted(data_settings.PROCESSED_HTML_DIR.glob('*.json'))[0]
+    data = json.loads(json_path.read_text(encoding='utf-8'))
+    data['general_info'] = {'title': 'עודכן'}
+    json_path.write_text(json.dumps(data, ensure_ascii=False), encoding='utf-8')
+    mtime_ns = data_settings.KNOWLEDGE_BASE_PATH.stat().st_mtime_ns + 10**9
+    os.utime(json_path, ns=(mtime_ns, mtime_ns))
+
+    view = HealthcareProvider(data_settings).get_all_services_data(HealthcareFilter('maccabi', 'gold'))
+    assert view[json_path.stem]['general_info'] == {'title': 'עודכן'}
+
+def test_touched_json_file_keeps_knowledge_base(data_settings):
+    compile_knowledge_base(data_settings.PROCESSED_HTML_DIR, data_settings.KNOWLEDGE_BASE_PATH)
+    json_path = sorted(data_settings.PROCESSED_HTML_DIR.glob('*.json'))[0]
+    mtime_ns = data_settings.KNOWLEDGE_BASE_PATH.stat().st_mtime_ns + 10**9
+    os.utime(json_path, ns=(mtime_ns, mtime_ns))
+
+    provider = HealthcareProvider(data_settings)
+    assert provider.cache_stats()['misses'] == 0  # Hash unchanged, still loaded from the knowledge base
@@ -0,0 +1,24 @@
+from qna_project.clients.search_index import SearchIndex
+from qna_project.services.search_healthcare import CustomerService
+
+def test_bm25_ranking():
+    documents = [
+        {'name': 'בדיקת עיניים', 'details': 'בדיקה שנתית'},
+        {'name': 'טיפול שיניים', 'details': 'בדיקת שיניים וניקוי'},
+        {'name': 'ניקוי שיניים', 'details': 'שיניים'},
+        {'name': 'פיזיותרפיה', 'details': ''},
+    ]
+    index = SearchIndex(documents, {'name': 3, 'details': 1})
+    results = index.search('ניקוי שיניים', top_k=2)
+    assert [doc['name'] for _, doc in results] == ['ניקוי שיניים', 'טיפול שיניים']
+    assert results[0][0] > results[1][0] > 0
+    assert index.search('אין התאמה') == []
+    assert SearchIndex([], {'name': 1}).search('שיניים') == []
+
+def test_provider_search_returns_matches_with_contact_info(data_settings):
+    service = CustomerService(data_settings)
+    response = service.search_provider_services('maccabi', 'gold', 'שיניים', top_k=3)
+    assert 0 < len(response['results']) <= 3
+    assert all(result['score'] > 0 for result in response['results'])
+    assert set(response['contact_info']) == {result['category'] for result in response['results']}
+    assert service.search_provider_services('unknown', 'gold', 'שיניים') == {}
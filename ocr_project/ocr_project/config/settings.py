@@ -23,7 +23,10 @@ class Settings:
         self.GENERATED_PDFS_DIR = self.OUTPUT_DIR / "generated_pdfs"
         self.TEMP_DIR = self.OUTPUT_DIR / "temp"
         self.MASTER_DATA_CSV = self.OUTPUT_DIR / "master_data.csv"
+        self.GENERATION_MANIFEST = self.GENERATED_PDFS_DIR / "manifest.csv"
         self.ANALYZED_FORMS_DIR = self.OUTPUT_DIR / "analyzed_forms"
+        self.RESULTS_DB = self.OUTPUT_DIR / "analysis_results.db"
+        self.COMPARISON_CACHE_PATH = self.OUTPUT_DIR / "comparison_cache.pkl"
         
         # All directories that need to be created
         self.GENERATED_DIRS = [
@@ -53,16 +56,36 @@ class Settings:
         
         # Font settings
         self.FONT_PATH = "/usr/share/fonts/dejavu/DejaVuSans.ttf"
+        # Tried in order when FONT_PATH is missing or has no Hebrew glyphs
+        self.FALLBACK_FONT_PATHS = [
+            "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+            "/usr/share/fonts/truetype/noto/NotoSansHebrew-Regular.ttf",
+            "/usr/share/fonts/truetype/freefont/FreeSans.ttf",
+            "/Library/Fonts/Arial Unicode.ttf",
+            "C:/Windows/Fonts/arial.ttf"
+        ]
         
         # Processing settings
         self.PDF_ZOOM = 3
+        self.PDF_RENDER_MODE = "raster"  # "raster" (scan-like) or "vector" (PDF text)
+        self.TEMPLATE_CACHE_SIZE = 4  # Rendered templates kept per process, keyed by (template, zoom)
         self.NUM_PDFS_TO_GENERATE = 100
+        self.GENERATION_SEED = 42
+        self.GENERATION_DATA_MODE = "faker"  # "faker" (per form) or "batch" (vectorized blocks)
+        self.GENERATION_BLOCK_SIZE = 1024
+        self.GENERATION_SHARD_SIZE = 0  # Forms per shard_XXXX subdirectory; 0 writes all PDFs flat
+        self.GENERATION_BUNDLE = "none"  # "none" (one PDF per form), "pdf" or "zip" bundles
+        self.GENERATION_BUNDLE_SIZE = 1000
 
         # Form processing settings
         self.FORM_CONFIG_DIR = self.CONFIG_DIR
         self.SCHEMA_FILE = self.RESOURCES_DIR / "schema.json"
         self.SECTIONS_FILE = self.RESOURCES_DIR / "sections.json"
         
+        # Comparison settings
+        self.COMPARE_CHUNK_SIZE = 100_000
+        self.FIELD_INDEX_MAX_FILES = 4096
+        
         # Image processing settings
         self.DEFAULT_DPI = 300
 
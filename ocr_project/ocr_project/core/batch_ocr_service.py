@@ -1,17 +1,32 @@
 import logging
 from pathlib import Path
 import pandas as pd
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import re
 
 from ocr_project.config.settings import settings
 from ocr_project.core.ocr_service import OCRService
+from ocr_project.utils.manifest import manifest_entries
 
 def get_form_number(filename: str) -> int:
     """Extract form number from filename."""
     match = re.search(r'form_(\d+)\.pdf', filename)
     return int(match.group(1)) if match else 0
 
+def directory_entries(input_dir: Path) -> List[Tuple[Path, int, str]]:
+    """
+    Forms generated into a directory, as (file, page, filename) entries
+
+    Read from the directory's manifest.csv when present (required for sharded or
+    bundled output), otherwise from its form_*.pdf files in form number order.
+    """
+    manifest_path = input_dir / settings.GENERATION_MANIFEST.name
+    if manifest_path.exists():
+        return manifest_entries(manifest_path)
+
+    pdf_files = sorted(input_dir.glob("form_*.pdf"), key=lambda x: get_form_number(x.name))
+    return [(pdf_file, 0, pdf_file.name) for pdf_file in pdf_files]
+
 class BatchOCRService:
     def __init__(self):
         self._setup_logging()
@@ -54,16 +69,29 @@ class BatchOCRService:
         Returns:
             Dict containing results for all processed files
         """
-        self.logger.info(f"Starting batch processing of {len(pdf_files)} PDF files")
+        return self.process_form_entries([(pdf_file, 0, pdf_file.name) for pdf_file in pdf_files], output_dir)
+
+    def process_form_entries(self, entries: List[Tuple[Path, int, str]], output_dir: Optional[Path] = None) -> Dict:
+        """
+        Process forms given as (file, page, filename) entries, where file may be a bundle
+        
+        Args:
+            entries: Form locations, e.g. from manifest_entries
+            output_dir: Optional directory to save outputs. If not provided, uses default from settings
+            
+        Returns:
+            Dict containing results for all processed files, keyed by form filename
+        """
+        self.logger.info(f"Starting batch processing of {len(entries)} PDF files")
         output_dir = output_dir or settings.ANALYZED_FORMS_DIR
         
         results = {}
-        for pdf_file in pdf_files:
+        for pdf_file, page, filename in entries:
             try:
-                results[pdf_file.name] = self.ocr_service.process_pdf(pdf_file, output_dir)
+                results[filename] = self.ocr_service.process_pdf(pdf_file, output_dir, page=page, filename=filename)
             except Exception as e:
-                self.logger.error(f"Error processing {pdf_file.name}: {str(e)}")
-                results[pdf_file.name] = {"error": str(e)}
+                self.logger.error(f"Error processing {filename}: {str(e)}")
+                results[filename] = {"error": str(e)}
         
         return results
 
@@ -85,27 +113,51 @@ class BatchOCRService:
             self.logger.error(f"Error generating analysis report: {str(e)}")
             raise
 
-    def process_directory(self, input_dir: Optional[Path] = None) -> Dict:
+    def process_manifest(self, manifest_path: Optional[Path] = None) -> Dict:
+        """
+        Process the PDF files listed in a generation manifest, in manifest order
+        
+        Args:
+            manifest_path: Path to manifest.csv. If not provided, uses default from settings
+            
+        Returns:
+            Dict containing results for all processed files
+        """
+        manifest_path = Path(manifest_path or settings.GENERATION_MANIFEST)
+        entries = manifest_entries(manifest_path)
+        
+        if not entries:
+            self.logger.error(f"No PDF files listed in manifest: {manifest_path}")
+            return {}
+            
+        # Bundled forms are read from their bundle by page index, without unpacking
+        self.logger.info(f"Read {len(entries)} forms from manifest {manifest_path}")
+        return self.process_form_entries(entries)
+
+    def process_directory(self, input_dir: Optional[Path] = None,
+                          entries: Optional[List[Tuple[Path, int, str]]] = None) -> Dict:
         """
         Process all PDF files in a directory
         
+        Uses the directory's manifest.csv when present (required for sharded
+        output), and falls back to globbing form_*.pdf otherwise (see directory_entries).
+        
         Args:
             input_dir: Directory containing PDF files. If not provided, uses default from settings
+            entries: The directory's entries if already read with directory_entries
             
         Returns:
             Dict containing results for all processed files
         """
         input_dir = input_dir or settings.GENERATED_PDFS_DIR
+        if entries is None:
+            entries = directory_entries(input_dir)
         
-        # Get all PDF files and sort them by form number
-        pdf_files = list(input_dir.glob("form_*.pdf"))
-        pdf_files.sort(key=lambda x: get_form_number(x.name))
-        
-        if not pdf_files:
+        if not entries:
             self.logger.error(f"No PDF files found in directory: {input_dir}")
             return {}
             
-        return self.process_pdf_batch(pdf_files)
+        return self.process_form_entries(entries)
 
 # if __name__ == "__main__": 
 #     # For single file processing:
@@ -12,6 +12,7 @@ from pathlib import Path
 from ocr_project.config.settings import settings
 from ocr_project.core.document_analyzer import DocumentAnalyzer
 from ocr_project.core.gpt_client import GPTClient, Message, MessageRole
+from ocr_project.utils.bundle import open_form_page
 
 @dataclass
 class Section:
@@ -117,9 +118,15 @@ class ExtractFormFields:
 
         logger.addFilter(ContextFilter(self))
 
-    def process_form(self, pdf_path: Path, output_dir: Path = None, dpi: int = None) -> Dict:
-        """Process a single form and return structured data."""
-        self.current_file = pdf_path.name  # Set current file being processed
+    def process_form(self, pdf_path: Path, output_dir: Path = None, dpi: int = None,
+                     page: int = 0, form_name: str = None) -> Dict:
+        """
+        Process a single form and return structured data.
+
+        pdf_path may also be a PDF or ZIP bundle from gen_files, with page the
+        form's index in it and form_name its filename for logging.
+        """
+        self.current_file = form_name or pdf_path.name  # Set current file being processed
         output_dir = output_dir or settings.ANALYZED_FORMS_DIR
         dpi = dpi or settings.DEFAULT_DPI
         
@@ -128,7 +135,7 @@ class ExtractFormFields:
         
         try:
             # First pass - process sections
-            first_pass_results = self._process_sections(pdf_path, output_dir, dpi)
+            first_pass_results = self._process_sections(pdf_path, output_dir, dpi, page)
             
             # Second pass - post-process entire form
             self.logger.info("Starting second pass - post-processing form data...")
@@ -145,13 +152,13 @@ class ExtractFormFields:
         finally:
             self.current_file = None  # Clear current file when done
 
-    def _process_sections(self, pdf_path: Path, output_dir: Path, dpi: int) -> Dict:
+    def _process_sections(self, pdf_path: Path, output_dir: Path, dpi: int, page: int = 0) -> Dict:
         """Process individual sections of the form."""
         sections_dir = output_dir / "sections"
         sections_dir.mkdir(exist_ok=True)
         
         # Split PDF into sections
-        sections = self._split_pdf_sections(pdf_path, sections_dir, dpi)
+        sections = self._split_pdf_sections(pdf_path, sections_dir, dpi, page)
         
         # Process each section
         results = {}
@@ -211,14 +218,15 @@ class ExtractFormFields:
             self.logger.error(f"Error in post-processing: {str(e)}")
             return first_pass_results
 
-    def _split_pdf_sections(self, pdf_path: Path, output_dir: Path, dpi: int) -> List[Section]:
+    def _split_pdf_sections(self, pdf_path: Path, output_dir: Path, dpi: int, page: int = 0) -> List[Section]:
         """Split PDF into sections based on configuration."""
         self.logger.info("Starting PDF splitting process...")
         
         try:
             self.logger.info("Opening PDF document...")
-            pdf_document = fitz.open(str(pdf_path))
-            page = pdf_document[0]  # First page only
+            # Bundles are read in place: a PDF bundle page directly, a ZIP entry from memory
+            pdf_document, page_index = open_form_page(pdf_path, page)
+            page = pdf_document[page_index]  # The form's first page only
             self.logger.info("✓ PDF opened successfully")
             
             # Render high-res image
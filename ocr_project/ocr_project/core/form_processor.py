@@ -1,8 +1,86 @@
 import csv
 import json
-from typing import Dict, Set, Tuple
+from functools import lru_cache
+from typing import Dict, Iterable, List, Set, Tuple
 import re
 
+SLASH_SPACES_PATTERN = re.compile(r'\s*/\s*')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+@lru_cache(maxsize=4096)
+def normalize_field_name(field_name: str) -> str:
+    """Normalize field name for consistent comparison"""
+    # Replace different types of quotes with a standard one
+    normalized = field_name.replace('״', '"').replace('"', '"')
+    
+    # Normalize spaces around forward slashes
+    normalized = SLASH_SPACES_PATTERN.sub('/', normalized)
+    
+    # Remove any double spaces
+    normalized = WHITESPACE_PATTERN.sub(' ', normalized)
+    
+    # Trim whitespace
+    return normalized.strip()
+
+class CompiledFormTemplate:
+    """
+    Form elements template with its label index built once.
+
+    fill() produces the same element list as flatten_json_elements applied to
+    FormProcessor.update_json_with_records output, without copying or walking
+    the nested template for every form.
+    """
+
+    def __init__(self, json_template: Dict):
+        """
+        Args:
+            json_template: Parsed form_elements.json (sections/fields/sub_fields)
+        """
+        self.elements: List[Dict] = []
+        self.index: Dict[Tuple[str, str], List[int]] = {}
+        self.all_fields: Set[Tuple[str, str]] = set()
+
+        for section in json_template['sections']:
+            section_id = section['id']
+            for field in section['fields']:
+                if 'sub_fields' in field:
+                    for sub_field in field['sub_fields']:
+                        self._add(section_id, f"{field['label']}/{sub_field['label']}", sub_field)
+                else:
+                    self._add(section_id, field['label'], field)
+
+    def _add(self, section_id: str, field_name: str, element: Dict) -> None:
+        """Register a template element; only placed elements (non-zero x or y) are drawn"""
+        self.all_fields.add((section_id, field_name))
+        if element.get("x", 0) == 0 and element.get("y", 0) == 0:
+            return
+
+        key = (section_id, normalize_field_name(field_name))
+        self.index.setdefault(key, []).append(len(self.elements))
+        self.elements.append({
+            "text": element.get("value", ""),
+            "x": element.get("x", 0),
+            "y": element.get("y", 0),
+            "font_size": element.get("font_size", 12),
+            "label": element.get("label", "")
+        })
+
+    def fill(self, records: Iterable[Tuple[str, str, str]]) -> List[Dict]:
+        """
+        Build the flattened elements of one form
+
+        Args:
+            records: (section, field, value) records; later records override earlier ones
+
+        Returns:
+            New list of element dicts, independent of the template and of other forms
+        """
+        elements = [dict(element) for element in self.elements]
+        for section, field, value in records:
+            for position in self.index.get((section, normalize_field_name(field)), ()):
+                elements[position]["text"] = value
+        return elements
+
 class FormProcessor:
     def __init__(self):
         self.updated_fields: Set[Tuple[str, str]] = set()
@@ -10,19 +88,7 @@ class FormProcessor:
         
     def normalize_field_name(self, field_name: str) -> str:
         """Normalize field name for consistent comparison"""
-        # Replace different types of quotes with a standard one
-        normalized = field_name.replace('״', '"').replace('"', '"')
-        
-        # Normalize spaces around forward slashes
-        normalized = re.sub(r'\s*/\s*', '/', normalized)
-        
-        # Remove any double spaces
-        normalized = re.sub(r'\s+', ' ', normalized)
-        
-        # Trim whitespace
-        normalized = normalized.strip()
-        
-        return normalized
+        return normalize_field_name(field_name)
 
     def collect_all_fields(self, json_data: Dict) -> None:
         """Collect all fields from JSON structure"""
@@ -36,21 +102,25 @@ class FormProcessor:
                     self.all_fields.add((section_id, field['label']))
 
     def update_json_with_csv(self, json_data: Dict, csv_file: str) -> Dict:
+        # Read CSV data
+        with open(csv_file, 'r', encoding='utf-8') as f:
+            csv_reader = csv.DictReader(f, delimiter='|')
+            records = [(row['section'], row['field'], row['value']) for row in csv_reader]
+
+        return self.update_json_with_records(json_data, records)
+
+    def update_json_with_records(self, json_data: Dict, records: Iterable[Tuple[str, str, str]]) -> Dict:
+        """Update the JSON template in place with (section, field, value) records"""
         # Collect all fields first
         self.collect_all_fields(json_data)
         
-        # Read CSV data
         csv_data = {}
-        with open(csv_file, 'r', encoding='utf-8') as f:
-            csv_reader = csv.DictReader(f, delimiter='|')
-            for row in csv_reader:
-                section = row['section']
-                field = self.normalize_field_name(row['field'])
-                value = row['value']
-                
-                if section not in csv_data:
-                    csv_data[section] = {}
-                csv_data[section][field] = value
+        for section, field, value in records:
+            field = self.normalize_field_name(field)
+            
+            if section not in csv_data:
+                csv_data[section] = {}
+            csv_data[section][field] = value
 
         # Update JSON data
         for section in json_data['sections']:
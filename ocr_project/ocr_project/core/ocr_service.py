@@ -3,12 +3,14 @@ from pathlib import Path
 import json
 from typing import Dict, Optional
 import os
+import sqlite3
 from dotenv import load_dotenv
 
 from ocr_project.config.settings import settings
 from ocr_project.core.extract_form_fields import ExtractFormFields
 from ocr_project.core.document_analyzer import DocumentAnalyzer
 from ocr_project.core.gpt_client import GPTClient
+from ocr_project.core.result_store import ResultStore
 
 class OCRService:
     def __init__(self):
@@ -23,6 +25,7 @@ class OCRService:
         
         # Initialize processors
         self.form_processor = ExtractFormFields()
+        self.result_store = ResultStore()
 
     def _validate_env_vars(self):
         """Validate that all required environment variables are set"""
@@ -53,18 +56,22 @@ class OCRService:
             ]
         )
 
-    def process_pdf(self, pdf_path: Path, output_dir: Optional[Path] = None) -> Dict:
+    def process_pdf(self, pdf_path: Path, output_dir: Optional[Path] = None,
+                    page: int = 0, filename: Optional[str] = None) -> Dict:
         """
         Process a single PDF file and return analysis results
         
         Args:
-            pdf_path: Path to the PDF file
+            pdf_path: Path to the PDF file, or to a PDF/ZIP bundle holding the form
             output_dir: Optional directory to save the output. If not provided, uses default from settings
+            page: Index of the form in a bundle
+            filename: Name of the form's PDF (defaults to pdf_path's name); names the outputs
             
         Returns:
             Dict containing the analysis results
         """
-        self.logger.info(f"Processing PDF: {pdf_path}")
+        filename = filename or pdf_path.name
+        self.logger.info(f"Processing PDF: {pdf_path}" + (f" (page {page})" if page else ""))
         output_dir = output_dir or settings.ANALYZED_FORMS_DIR
         output_dir.mkdir(parents=True, exist_ok=True)
         
@@ -72,17 +79,25 @@ class OCRService:
             # Process the form using ExtractFormFields
             form_data = self.form_processor.process_form(
                 pdf_path=pdf_path,
-                output_dir=output_dir
+                output_dir=output_dir,
+                page=page,
+                form_name=filename
             )
             
             # Save individual form results
-            output_path = output_dir / f"{pdf_path.stem}_analysis.json"
+            output_path = output_dir / f"{Path(filename).stem}_analysis.json"
             with open(output_path, 'w', encoding='utf-8') as f:
                 json.dump(form_data, f, ensure_ascii=False, indent=2)
             
-            self.logger.info(f"✓ Successfully processed {pdf_path.name}")
+            # Index the results by section and field for querying
+            try:
+                self.result_store.save_form(filename, form_data)
+            except (sqlite3.Error, ValueError) as e:
+                self.logger.error(f"Error storing results for {filename}: {str(e)}")
+            
+            self.logger.info(f"✓ Successfully processed {filename}")
             return form_data
             
         except Exception as e:
-            self.logger.error(f"Error processing {pdf_path.name}: {str(e)}")
+            self.logger.error(f"Error processing {filename}: {str(e)}")
             raise
\ No newline at end of file
@@ -0,0 +1,241 @@
+import json
+import hashlib
+import logging
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+
+from ocr_project.config.settings import settings
+from ocr_project.utils.field_index import FieldMap, field_key, parse_analysis_json
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS forms (
+    filename TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL,
+    data TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS fields (
+    filename TEXT NOT NULL REFERENCES forms(filename) ON DELETE CASCADE,
+    section TEXT NOT NULL,
+    label TEXT NOT NULL,
+    sub_label TEXT,
+    field TEXT NOT NULL,
+    value TEXT,
+    position INTEGER NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_fields_filename ON fields(filename);
+CREATE INDEX IF NOT EXISTS idx_fields_section ON fields(section);
+CREATE INDEX IF NOT EXISTS idx_fields_field ON fields(field, section);
+"""
+
+class ResultStore:
+    """SQLite store for form analysis results, one row per extracted field."""
+
+    def __init__(self, db_path: Optional[Path] = None):
+        self.db_path = Path(db_path or settings.RESULTS_DB)
+        self.logger = logging.getLogger('ResultStore')
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # One connection for the store's lifetime, shared by all queries
+        self._conn = sqlite3.connect(self.db_path)
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Use the store's connection, committing on success and rolling back on error"""
+        try:
+            yield self._conn
+            self._conn.commit()
+        except Exception:
+            self._conn.rollback()
+            raise
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def __enter__(self) -> 'ResultStore':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @staticmethod
+    def _as_dict(form_data: Union[Dict, str]) -> Dict:
+        """Accept analysis results either as a dict or as (possibly escaped) JSON text"""
+        if isinstance(form_data, dict):
+            return form_data
+        return parse_analysis_json(form_data)
+
+    @staticmethod
+    def _field_rows(filename: str, form_data: Dict) -> List[tuple]:
+        """Flatten the section/fields/sub_fields layout into table rows"""
+        rows = []
+        position = 0
+        for section, section_data in form_data.items():
+            if not isinstance(section_data, dict):
+                continue
+            for field in section_data.get('fields') or []:
+                label = field.get('label')
+                if label is None:
+                    continue
+                value = field.get('value')
+                rows.append((
+                    filename, section, label, None, label,
+                    str(value) if value is not None else None, position
+                ))
+                position += 1
+
+                for sub in field.get('sub_fields') or []:
+                    sub_label = sub.get('label')
+                    if sub_label is None:
+                        continue
+                    sub_value = sub.get('value')
+                    rows.append((
+                        filename, section, label, sub_label, f"{label}/{sub_label}",
+                        str(sub_value) if sub_value is not None else None, position
+                    ))
+                    position += 1
+        return rows
+
+    def save_form(self, filename: str, form_data: Union[Dict, str]) -> None:
+        """
+        Persist the analysis results of a single form, replacing any previous version
+
+        Args:
+            filename: Name of the analyzed PDF (e.g. form_1.pdf)
+            form_data: Analysis results in the section/fields JSON layout
+        """
+        form_data = self._as_dict(form_data)
+        data = json.dumps(form_data, ensure_ascii=False)
+        content_hash = hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+        with self._connect() as conn:
+            conn.execute("DELETE FROM fields WHERE filename = ?", (filename,))
+            conn.execute(
+                "INSERT OR REPLACE INTO forms (filename, content_hash, data, updated_at) "
+                "VALUES (?, ?, ?, ?)",
+                (filename, content_hash, data, datetime.now().isoformat(timespec='seconds'))
+            )
+            conn.executemany(
+                "INSERT INTO fields (filename, section, label, sub_label, field, value, position) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                self._field_rows(filename, form_data)
+            )
+
+        self.logger.info(f"Stored analysis results for {filename}")
+
+    def get_form(self, filename: str) -> Dict:
+        """Return the analysis results of a form in the original JSON layout"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT data FROM forms WHERE filename = ?", (filename,)
+            ).fetchone()
+
+        if row is None:
+            raise KeyError(f"No analysis results stored for {filename}")
+        return json.loads(row[0])
+
+    def get_field_map(self, filename: str) -> FieldMap:
+        """Return the section/label[/sub_label] -> value map of a form, read from the field rows"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT section, field, value FROM fields WHERE filename = ? ORDER BY position",
+                (filename,)
+            ).fetchall()
+            # A stored form may have no fields at all
+            if not rows and conn.execute(
+                "SELECT 1 FROM forms WHERE filename = ?", (filename,)
+            ).fetchone() is None:
+                raise KeyError(f"No analysis results stored for {filename}")
+
+        field_map = {}
+        for section, field, value in rows:
+            field_map.setdefault(field_key(section, field), value)
+        return field_map
+
+    def get_content_hashes(self) -> Dict[str, str]:
+        """Return the content hash of every stored form, keyed by filename"""
+        with self._connect() as conn:
+            return dict(conn.execute("SELECT filename, content_hash FROM forms").fetchall())
+
+    def list_filenames(self) -> List[str]:
+        """Return the names of all forms with stored results"""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT filename FROM forms ORDER BY filename").fetchall()
+        return [row[0] for row in rows]
+
+    def get_field_values(self, field: str, section: Optional[str] = None) -> Dict[str, Optional[str]]:
+        """
+        Get the value of one field across all forms
+
+        Args:
+            field: Field label, or label/sub_label for sub-fields
+            section: Optional section to restrict the lookup to
+
+        Returns:
+            Dict mapping filename to the stored value
+        """
+        query = "SELECT filename, value FROM fields WHERE field = ?"
+        params = [field]
+        if section:
+            query += " AND section = ?"
+            params.append(section)
+
+        with self._connect() as conn:
+            return dict(conn.execute(query, params).fetchall())
+
+    def find_forms_missing(self, field: str, section: Optional[str] = None) -> List[str]:
+        """
+        Find forms where a field was not extracted or came back empty
+
+        Args:
+            field: Field label, or label/sub_label for sub-fields (e.g. "ת.ז")
+            section: Optional section the field belongs to
+
+        Returns:
+            Sorted list of filenames missing a value for the field
+        """
+        query = (
+            "SELECT f.filename FROM forms f WHERE NOT EXISTS ("
+            "SELECT 1 FROM fields x WHERE x.filename = f.filename AND x.field = ? "
+            "AND x.value IS NOT NULL AND TRIM(x.value) != ''"
+        )
+        params = [field]
+        if section:
+            query += " AND x.section = ?"
+            params.append(section)
+        query += ") ORDER BY f.filename"
+
+        with self._connect() as conn:
+            return [row[0] for row in conn.execute(query, params).fetchall()]
+
+    def export_json(self, output_dir: Optional[Path] = None) -> List[Path]:
+        """
+        Write every stored form back out as <form>_analysis.json files
+
+        Args:
+            output_dir: Target directory. If not provided, uses ANALYZED_FORMS_DIR
+
+        Returns:
+            List of written file paths
+        """
+        output_dir = Path(output_dir or settings.ANALYZED_FORMS_DIR)
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        written = []
+        with self._connect() as conn:
+            for filename, data in conn.execute("SELECT filename, data FROM forms ORDER BY filename"):
+                output_path = output_dir / f"{Path(filename).stem}_analysis.json"
+                with open(output_path, 'w', encoding='utf-8') as f:
+                    json.dump(json.loads(data), f, ensure_ascii=False, indent=2)
+                written.append(output_path)
+
+        self.logger.info(f"Exported {len(written)} forms to {output_dir}")
+        return written
@@ -2,7 +2,37 @@ import fitz  # PyMuPDF
 from PIL import Image, ImageDraw, ImageFont
 from io import BytesIO
 import os
+import re
 import json
+import inspect
+import logging
+from functools import lru_cache
+
+from ocr_project.config.settings import settings
+
+logger = logging.getLogger('InsertPDF')
+
+RENDER_MODES = ("raster", "vector")
+
+# Characters covered by the font subset precomputed for vector mode: printable ASCII,
+# Hebrew letters, maqaf, geresh, gershayim and the shekel sign
+VECTOR_CHARSET = frozenset(map(chr, [*range(0x20, 0x7F), *range(0x5D0, 0x5EB), 0x5BE, 0x5F3, 0x5F4, 0x20AA]))
+
+# Object streams (PyMuPDF 1.24+) pack the template's many small objects, which makes
+# vector output smaller and faster to write
+VECTOR_SAVE_OPTIONS = {"deflate": True, "no_new_id": True}
+if "use_objstms" in inspect.signature(fitz.Document.save).parameters:
+    VECTOR_SAVE_OPTIONS["use_objstms"] = 1
+
+HEBREW_PATTERN = re.compile(r"[\u0590-\u05FF]")
+
+# Left-to-right runs (numbers, dates, times, Latin words) or any single character
+LTR_RUN_PATTERN = re.compile(r"[0-9A-Za-z]+(?:[.:/,\-][0-9A-Za-z]+)*|.", re.DOTALL)
+
+MIRRORED_CHARS = {"(": ")", ")": "(", "[": "]", "]": "[", "{": "}", "}": "{", "<": ">", ">": "<"}
+
+# Character used to check that a font can draw Hebrew (alef)
+HEBREW_SAMPLE_CHAR = "\u05d0"
 
 def flatten_json_elements(json_data):
     """Flatten nested JSON structure into a list of elements with x,y coordinates"""
@@ -36,30 +66,147 @@ def flatten_json_elements(json_data):
     
     return flattened_elements
 
-def add_text_to_pdf(input_pdf, output_pdf, form_elements_path, zoom=2):
+def visual_order(text):
+    """
+    Reorder a right-to-left string for left-to-right glyph placement.
+    
+    Hebrew characters are reversed while runs of digits and Latin letters
+    (dates, times, numbers) keep their reading order. Text without Hebrew
+    is returned unchanged.
+    """
+    if not HEBREW_PATTERN.search(text):
+        return text
+    tokens = LTR_RUN_PATTERN.findall(text)
+    return "".join(MIRRORED_CHARS.get(token, token) for token in reversed(tokens))
+
+@lru_cache(maxsize=None)
+def _covers_hebrew(font_path):
+    """Check whether a font file has a glyph for Hebrew letters"""
+    try:
+        return fitz.Font(fontfile=font_path).has_glyph(ord(HEBREW_SAMPLE_CHAR)) != 0
+    except Exception:
+        return False
+
+@lru_cache(maxsize=None)
+def _select_font_path(candidates):
+    """Pick the first existing candidate with Hebrew glyphs, else the first existing one"""
+    existing = [path for path in candidates if os.path.exists(path)]
+    if not existing:
+        raise FileNotFoundError(f"No usable font found, tried: {', '.join(candidates)}")
+    for path in existing:
+        if _covers_hebrew(path):
+            return path
+    logger.warning(f"No font with Hebrew glyphs found, falling back to {existing[0]}")
+    return existing[0]
+
+def get_font_path():
+    """Return the font used for form text: settings.FONT_PATH or the first Hebrew-capable fallback"""
+    return _select_font_path((str(settings.FONT_PATH), *map(str, settings.FALLBACK_FONT_PATHS)))
+
+@lru_cache(maxsize=None)
+def get_font(font_path, size):
+    """Load a TrueType font once per (path, size) and process"""
+    return ImageFont.truetype(font_path, size)
+
+@lru_cache(maxsize=None)
+def _vector_font(font_path):
+    """Load a font once per process for embedding in vector output"""
+    return fitz.Font(fontfile=font_path)
+
+def _subset_fonts(pdf_document):
+    """Keep only the glyphs in use; returns False if subsetting failed (it needs fontTools on older PyMuPDF)"""
+    try:
+        pdf_document.subset_fonts()
+        return True
+    except Exception as e:
+        logger.warning(f"Could not subset embedded fonts: {str(e)}")
+        return False
+
+def _font_file_xrefs(pdf_document, first_xref):
+    """Embedded font programs among the objects numbered first_xref and up"""
+    return [
+        xref for xref in range(first_xref, pdf_document.xref_length())
+        if pdf_document.xref_get_key(xref, "Length1")[0] != "null"
+    ]
+
+@lru_cache(maxsize=None)
+def _vector_font_subset(font_path):
+    """
+    Font program of font_path reduced to VECTOR_CHARSET, built once per process
+
+    Subsetting keeps glyph ids, so the program can stand in for the full font embedded
+    with any text made of VECTOR_CHARSET. Returns None if subsetting is not available.
+    """
+    with fitz.open() as pdf_document:
+        page = pdf_document.new_page()
+        writer = fitz.TextWriter(page.rect)
+        writer.append((0, 100), "".join(sorted(VECTOR_CHARSET)), font=_vector_font(font_path))
+        writer.write_text(page)
+        if not _subset_fonts(pdf_document):
+            return None
+        return pdf_document.xref_stream(_font_file_xrefs(pdf_document, 1)[0])
+
+@lru_cache(maxsize=settings.TEMPLATE_CACHE_SIZE)
+def _render_template(input_pdf, zoom):
+    """Render every page of a blank template once per (template, zoom) and process"""
+    logger.debug(f"Rendering template {input_pdf} at zoom {zoom}")
+    with fitz.open(input_pdf) as pdf_document:
+        mat = fitz.Matrix(zoom, zoom)
+        pages = []
+        for page in pdf_document:
+            pix = page.get_pixmap(matrix=mat, alpha=False)
+            pages.append(Image.frombytes("RGB", [pix.width, pix.height], pix.samples))
+    return tuple(pages)
+
+@lru_cache(maxsize=settings.TEMPLATE_CACHE_SIZE)
+def _vector_template(input_pdf):
+    """
+    Template PDF with its own fonts subset and unused objects dropped, prepared once
+    per process; each form opens its own document from the bytes
+    """
+    with fitz.open(input_pdf) as pdf_document:
+        _subset_fonts(pdf_document)
+        return pdf_document.tobytes(garbage=3, **VECTOR_SAVE_OPTIONS)
+
+def clear_template_cache():
+    """Drop cached templates, e.g. after the template file changed on disk"""
+    _render_template.cache_clear()
+    _vector_template.cache_clear()
+
+def add_text_to_pdf(input_pdf, output_pdf, form_elements_path, zoom=2, mode="raster"):
+    # Read form elements from file
+    with open(form_elements_path, 'r', encoding='utf-8') as f:
+        form_data = json.load(f)
+    
+    # Flatten the nested JSON structure
+    add_elements_to_pdf(input_pdf, output_pdf, flatten_json_elements(form_data), zoom=zoom, mode=mode)
+
+def add_elements_to_pdf(input_pdf, output_pdf, flattened_elements, zoom=2, mode="raster"):
+    """
+    Draw already flattened text elements (see flatten_json_elements) onto the PDF
+    
+    Args:
+        output_pdf: Output path, or None to return the PDF as bytes instead of writing it
+        mode: "raster" renders each page to a bitmap at zoom and draws the text on it
+              (scan-like output). "vector" writes the text as real PDF text over the
+              original page with an embedded font.
+    """
+    if mode == "vector":
+        return _add_vector_text(input_pdf, output_pdf, flattened_elements)
+    if mode != "raster":
+        raise ValueError(f"Unknown render mode: {mode}. Must be one of: {RENDER_MODES}")
+    
     try:
-        # Read form elements from file
-        with open(form_elements_path, 'r', encoding='utf-8') as f:
-            form_data = json.load(f)
-        
-        # Flatten the nested JSON structure
-        flattened_elements = flatten_json_elements(form_data)
-        
         # Create text_data in the format expected by the PDF processing
         text_data = {"0": flattened_elements}  # Assuming all elements go on first page
         
-        # Create a single font instance that will be reused
-        font = ImageFont.truetype("/usr/share/fonts/dejavu/DejaVuSans.ttf", int(12 * zoom))
+        font_path = get_font_path()
         
-        print(f"Attempting to open PDF at: {input_pdf}")
-        pdf_document = fitz.open(input_pdf)
         pdf_bytes = []
 
-        for page_num in range(pdf_document.page_count):
-            page = pdf_document[page_num]
-            mat = fitz.Matrix(zoom, zoom)
-            pix = page.get_pixmap(matrix=mat, alpha=False)
-            img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+        # Draw on a copy of the cached blank page instead of re-rendering the template
+        for page_num, template_img in enumerate(_render_template(str(input_pdf), zoom)):
+            img = template_img.copy()
             draw = ImageDraw.Draw(img)
 
             if str(page_num) in text_data:
@@ -72,11 +219,7 @@ def add_text_to_pdf(input_pdf, output_pdf, form_elements_path, zoom=2):
                         x = text_item["x"] * zoom
                         y = text_item["y"] * zoom
                         
-                        if "font_size" in text_item and text_item["font_size"] != 12:
-                            item_font = ImageFont.truetype("/usr/share/fonts/dejavu/DejaVuSans.ttf", 
-                                                         int(text_item["font_size"] * zoom))
-                        else:
-                            item_font = font
+                        item_font = get_font(font_path, int(text_item.get("font_size", 12) * zoom))
                         
                         draw.text((x, y), text_item["text"], fill="black", font=item_font, anchor="ls")
                         
@@ -88,11 +231,60 @@ def add_text_to_pdf(input_pdf, output_pdf, form_elements_path, zoom=2):
             img.save(img_byte_arr, format="PDF", resolution=300)
             pdf_bytes.append(img_byte_arr.getvalue())
 
-        with open(output_pdf, "wb") as f:
-            pdf_writer = fitz.open()
+        with fitz.open() as pdf_writer:
             for page_data in pdf_bytes:
-                pdf_writer.insert_pdf(fitz.open("pdf", page_data))
-            pdf_writer.save(f)
+                with fitz.open("pdf", page_data) as page_document:
+                    pdf_writer.insert_pdf(page_document)
+            if output_pdf is None:
+                return pdf_writer.tobytes(no_new_id=True)
+            with open(output_pdf, "wb") as f:
+                pdf_writer.save(f, no_new_id=True)
+
+    except Exception as e:
+        raise Exception(f"Error processing PDF: {str(e)}")
+
+def _add_vector_text(input_pdf, output_pdf, flattened_elements):
+    """Write the elements as PDF text on the first page of the original document"""
+    try:
+        with fitz.open("pdf", _vector_template(str(input_pdf))) as pdf_document:
+            page = pdf_document[0]  # Assuming all elements go on first page
+            font_path = get_font_path()
+            first_new_xref = pdf_document.xref_length()
+
+            # Collect all text in one writer so the font is embedded and the page written only once
+            writer = fitz.TextWriter(page.rect, color=(0, 0, 0))
+            characters = set()
+
+            for text_item in flattened_elements:
+                # Skip empty values and items with x=0 and y=0
+                if not text_item["text"] or (text_item["x"] == 0 and text_item["y"] == 0):
+                    continue
+
+                # PDF text is placed at its baseline start, like the raster "ls" anchor
+                text = visual_order(str(text_item["text"]))
+                characters.update(text)
+                writer.append(
+                    (text_item["x"], text_item["y"]),
+                    text,
+                    font=_vector_font(font_path),
+                    fontsize=text_item.get("font_size", 12)
+                )
+            writer.write_text(page)
+
+            # Swap the precomputed subset in for the embedded full font; other text needs
+            # the whole document subset (and the replaced full font dropped with garbage=1)
+            font_subset = _vector_font_subset(font_path)
+            garbage = 0
+            if font_subset is not None and characters <= VECTOR_CHARSET:
+                for xref in _font_file_xrefs(pdf_document, first_new_xref):
+                    pdf_document.update_stream(xref, font_subset)
+                    pdf_document.xref_set_key(xref, "Length1", str(len(font_subset)))
+            elif _subset_fonts(pdf_document):
+                garbage = 1
+
+            if output_pdf is None:
+                return pdf_document.tobytes(garbage=garbage, **VECTOR_SAVE_OPTIONS)
+            pdf_document.save(output_pdf, garbage=garbage, **VECTOR_SAVE_OPTIONS)
 
     except Exception as e:
         raise Exception(f"Error processing PDF: {str(e)}")
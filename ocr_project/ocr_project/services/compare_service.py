@@ -1,16 +1,35 @@
 from pathlib import Path
-import json
+import argparse
+import hashlib
 import logging
+import os
+import pickle
 import re
 from typing import Dict, List, Optional, Tuple
+import numpy as np
 import pandas as pd
 
 from ocr_project.config.settings import settings
+from ocr_project.core.result_store import ResultStore
+from ocr_project.utils.field_index import FieldIndex, FieldMap, field_key, load_analysis_json
+
+RESULT_COLUMNS = [
+    'filename', 'section', 'field', 'expected_value', 'extracted_value',
+    'normalized_expected', 'normalized_extracted', 'matches'
+]
+
+# Bump when the comparison logic changes so cached per-file results are recomputed
+COMPARISON_CACHE_VERSION = 1
 
 class CompareService:
-    def __init__(self):
+    def __init__(self, store: Optional[ResultStore] = None):
         self._setup_logging()
         self.logger = logging.getLogger('CompareService')
+        
+        # Prefer analysis results from the result store when given; forms it lacks
+        # (e.g. analyzed before the store existed) are read from their JSON files
+        self.store = store
+        self.field_index = FieldIndex(max_files=settings.FIELD_INDEX_MAX_FILES)
 
         # Field definitions for specialized handling
         self.date_fields = {
@@ -48,11 +67,17 @@ class CompareService:
             ]
         )
 
+    def _available_files(self) -> List[str]:
+        """Get the names of all forms with analysis results, in the store or as JSON files"""
+        filenames = {f.stem.replace('_analysis', '') + '.pdf'
+                     for f in settings.ANALYZED_FORMS_DIR.glob('*_analysis.json')}
+        if self.store:
+            filenames.update(self.store.list_filenames())
+        return sorted(filenames)
+
     def _load_data(self) -> pd.DataFrame:
         """Load and filter master data for available files"""
-        # Get available files
-        available_files = [f.stem.replace('_analysis', '') + '.pdf' 
-                         for f in settings.ANALYZED_FORMS_DIR.glob('*_analysis.json')]
+        available_files = self._available_files()
         
         # Load and filter master data
         df = pd.read_csv(settings.MASTER_DATA_CSV)
@@ -63,50 +88,35 @@ class CompareService:
 
     def _load_json(self, filename: str) -> Dict:
         """Load and parse JSON file"""
+        if self.store:
+            try:
+                return self.store.get_form(filename)
+            except KeyError:
+                pass
+        
         try:
-            json_path = settings.ANALYZED_FORMS_DIR / f"{Path(filename).stem}_analysis.json"
-            with open(json_path, 'r', encoding='utf-8') as f:
-                content = f.read().strip()
-                # Handle escaped JSON if needed
-                if content.startswith('"') and content.endswith('"'):
-                    content = content[1:-1].replace('\\n', '\n').replace('\\"', '"')
-                return json.loads(content)
+            return load_analysis_json(self._json_path(filename))
         except Exception as e:
             self.logger.error(f"Error loading JSON {filename}: {str(e)}")
             raise
 
-    def _extract_value(self, data: Dict, section: str, field: str) -> Optional[str]:
-        """Extract value from JSON using section and field path"""
-        try:
-            section_data = data.get(section, {})
-            if not section_data or 'fields' not in section_data:
-                return None
-
-            # Handle regular and sub-fields
-            field_parts = field.split('/')
-            main_field = field_parts[0]
-
-            # Find field in section
-            for f in section_data['fields']:
-                if f['label'] == main_field:
-                    # Simple field
-                    if len(field_parts) == 1:
-                        return str(f['value']) if f['value'] is not None else None
-                    
-                    # Sub-field
-                    if len(field_parts) == 2 and 'sub_fields' in f:
-                        sub_name = field_parts[1]
-                        for sub in f['sub_fields']:
-                            if sub['label'] == sub_name:
-                                return str(sub['value']) if sub['value'] is not None else None
-            return None
-        except Exception as e:
-            self.logger.error(f"Error extracting {section}/{field}: {str(e)}")
-            return None
+    def _json_path(self, filename: str) -> Path:
+        """Path of the analysis JSON for a form"""
+        return settings.ANALYZED_FORMS_DIR / f"{Path(filename).stem}_analysis.json"
+
+    def _load_field_map(self, filename: str) -> FieldMap:
+        """Load the flattened section/label[/sub_label] -> value map of a form"""
+        if self.store:
+            try:
+                return self.store.get_field_map(filename)
+            except KeyError:
+                pass
+        return self.field_index.get(self._json_path(filename))
 
     def _normalize_value(self, value: Optional[str]) -> str:
         """Normalize extracted value for comparison"""
-        if value is None:
+        # Missing values arrive as None, or as NaN once they pass through a pandas Series
+        if value is None or pd.isna(value):
             return ""
         
         # Convert to string and normalize
@@ -167,84 +177,337 @@ class CompareService:
 
         return normalized_expected == normalized_extracted
 
-    def compare_data(self) -> pd.DataFrame:
-        """Compare master data with analyzed forms"""
+    def _field_type(self, field: str) -> str:
+        """Classify a field the same way _normalize_expected_value does"""
+        if field in self.boolean_fields:
+            return 'boolean'
+        if field in self.numeric_fields:
+            return 'numeric'
+        if any(date_field in field for date_field in self.date_fields):
+            return 'date'
+        if any(text_field in field for text_field in self.text_fields):
+            return 'text'
+        return 'default'
+
+    def _normalize_expected_series(self, values: pd.Series, fields: pd.Series) -> pd.Series:
+        """Vectorized _normalize_expected_value, grouped by field type"""
+        values = values.fillna('').astype(str)
+        field_types = fields.map({field: self._field_type(field) for field in fields.unique()})
+
+        # Dates and defaults drop spaces, dots and slashes. Numeric and text fields
+        # only drop whitespace (digit-only values come out the same either way).
+        normalized = values.str.replace(r'[\s./]+', '', regex=True)
+        whitespace_only = field_types.isin(['numeric', 'text'])
+        normalized[whitespace_only] = values[whitespace_only].str.replace(r'\s+', '', regex=True)
+
+        is_boolean = field_types == 'boolean'
+        normalized[is_boolean] = values[is_boolean].where(values[is_boolean] == 'V', '')
+        return normalized
+
+    def _normalize_extracted_series(self, values: pd.Series) -> pd.Series:
+        """Vectorized _normalize_value"""
+        values = values.fillna('').astype(str).str.strip()
+        lowered = values.str.lower()
+
+        normalized = values.str.replace(r'[\s./]+', '', regex=True)
+        normalized[lowered == 'true'] = 'V'
+        normalized[lowered == 'false'] = ''
+        return normalized
+
+    def _match_series(self, fields: pd.Series, expected: pd.Series, extracted: pd.Series) -> pd.Series:
+        """Vectorized _compare_values over normalized columns"""
+        matches = expected == extracted
+
+        # Medical diagnosis codes match on containment in either direction
+        is_diagnosis = fields.str.contains('אבחנה רפואית', regex=False) & ~matches
+        if is_diagnosis.any():
+            matches[is_diagnosis] = [
+                exp in ext or ext in exp
+                for exp, ext in zip(expected[is_diagnosis], extracted[is_diagnosis])
+            ]
+
+        return matches
+
+    def _compare_rows(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Compare the given master data rows with their analyzed forms"""
+        if df.empty:
+            return pd.DataFrame(columns=RESULT_COLUMNS)
+
+        # Split the pipe-joined column once for all rows
+        df = df.sort_values('filename', kind='stable')
+        parts = df['section|field|value'].str.split('|', n=2, expand=True).reindex(columns=range(3))
+        result = pd.DataFrame({
+            'filename': df['filename'].to_numpy(),
+            'section': parts[0].to_numpy(),
+            'field': parts[1].to_numpy(),
+            'expected_value': parts[2].to_numpy()
+        })
+
+        # Flatten each file once, dropping rows of files that fail to load
+        field_maps = {}
+        for filename in result['filename'].unique():
+            try:
+                field_maps[filename] = self._load_field_map(filename)
+            except Exception as e:
+                self.logger.error(f"Error loading {filename}: {str(e)}")
+        result = result[result['filename'].isin(field_maps)].reset_index(drop=True)
+
+        result['extracted_value'] = [
+            field_maps[filename].get(field_key(section, field))
+            for filename, section, field in zip(result['filename'], result['section'], result['field'])
+        ]
+
+        # Normalize and match column-wise
+        result['normalized_expected'] = self._normalize_expected_series(
+            result['expected_value'], result['field']
+        )
+        result['normalized_extracted'] = self._normalize_extracted_series(result['extracted_value'])
+        result['matches'] = self._match_series(
+            result['field'], result['normalized_expected'], result['normalized_extracted']
+        )
+
+        return result[RESULT_COLUMNS]
+
+    def compare_data(self, incremental: bool = False) -> pd.DataFrame:
+        """
+        Compare master data with analyzed forms
+        
+        Args:
+            incremental: Reuse cached per-file results and only recompare new or changed files
+        """
+        if incremental:
+            return self._compare_incremental()[0]
+        return self._compare_rows(self._load_data())
+
+    def _load_cache(self) -> Tuple[Dict, pd.DataFrame]:
+        """Load cached per-file comparison state and the cached result rows"""
+        cache_path = settings.COMPARISON_CACHE_PATH
+        if cache_path.exists():
+            try:
+                with open(cache_path, 'rb') as f:
+                    cache = pickle.load(f)
+                if cache.get('version') == COMPARISON_CACHE_VERSION:
+                    return cache['files'], cache['rows']
+                self.logger.info("Comparison cache version changed, recomputing all files")
+            except Exception as e:
+                self.logger.warning(f"Ignoring unreadable comparison cache: {str(e)}")
+        return {}, pd.DataFrame(columns=RESULT_COLUMNS)
+
+    def _save_cache(self, files: Dict, rows: pd.DataFrame) -> None:
+        """Atomically write per-file comparison state and result rows"""
+        cache_path = settings.COMPARISON_CACHE_PATH
+        tmp_path = cache_path.with_suffix(cache_path.suffix + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({'version': COMPARISON_CACHE_VERSION, 'files': files, 'rows': rows}, f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+
+    def _master_hashes(self, df: pd.DataFrame) -> Dict[str, str]:
+        """Hash the master data rows of each file (order-sensitive, vectorized)"""
+        if df.empty:
+            return {}
+
+        df = df.sort_values('filename', kind='stable')
+        row_hashes = pd.util.hash_pandas_object(
+            df['section|field|value'].astype(str), index=False
+        ).to_numpy()
+        positions = df.groupby('filename', sort=False).cumcount().to_numpy().astype(np.uint64) + np.uint64(1)
+        mixed = row_hashes ^ (positions * np.uint64(0x9E3779B97F4A7C15))
+
+        # Sum the mixed row hashes of each contiguous file block (wrapping at 64 bits)
+        filenames = df['filename'].to_numpy()
+        starts = np.flatnonzero(np.r_[True, filenames[1:] != filenames[:-1]])
+        sizes = np.diff(np.r_[starts, len(filenames)])
+        sums = np.add.reduceat(mixed, starts)
+        return {
+            filenames[start]: f"{total:016x}-{size}"
+            for start, total, size in zip(starts, sums, sizes)
+        }
+
+    def _analysis_hashes(self, filenames: List[str], cache: Dict) -> Dict[str, Tuple[Optional[Tuple], str]]:
+        """
+        Hash the analysis results of each file
+        
+        Returns:
+            Dict mapping filename to (file signature, content hash). Files are only
+            re-hashed when their mtime or size differs from the cached signature;
+            forms read from the result store have no signature.
+        """
+        content_hashes = self.store.get_content_hashes() if self.store else {}
+
+        hashes = {}
+        for filename in filenames:
+            # Stored results take precedence over the form's JSON file
+            if filename in content_hashes:
+                hashes[filename] = (None, content_hashes[filename])
+                continue
+
+            json_path = self._json_path(filename)
+            try:
+                stat = json_path.stat()
+            except OSError:
+                continue
+            signature = (stat.st_mtime_ns, stat.st_size)
+            
+            cached = cache.get(filename)
+            if cached and cached['signature'] == signature:
+                hashes[filename] = (signature, cached['analysis_hash'])
+            else:
+                hashes[filename] = (signature, hashlib.sha256(json_path.read_bytes()).hexdigest())
+        return hashes
+
+    def _count_matches(self, df: pd.DataFrame) -> Dict[str, Dict[str, Tuple[int, int]]]:
+        """Count (total, matched) fields per file and section"""
+        counts = {}
+        grouped = df.groupby(['filename', 'section'])['matches'].agg(['count', 'sum'])
+        for (filename, section), total, matched in zip(grouped.index, grouped['count'], grouped['sum']):
+            counts.setdefault(filename, {})[section] = (int(total), int(matched))
+        return counts
+
+    def _compare_incremental(self) -> Tuple[pd.DataFrame, Dict[str, Dict[str, Tuple[int, int]]]]:
+        """Compare only new or changed files, reusing cached results for the rest"""
         df = self._load_data()
-        results = []
-        json_cache = {}
-
-        # Process each file
-        for filename, group in df.groupby('filename'):
-            # Load JSON once per file
-            if filename not in json_cache:
-                try:
-                    json_cache[filename] = self._load_json(filename)
-                except Exception as e:
-                    self.logger.error(f"Error loading {filename}: {str(e)}")
-                    continue
-
-            json_data = json_cache[filename]
-
-            # Process each field
-            for _, row in group.iterrows():
-                section, field, expected = row['section|field|value'].split('|')
-                
-                # Get and normalize values
-                extracted = self._extract_value(json_data, section, field)
-                norm_expected = self._normalize_expected_value(expected, field)
-                norm_extracted = self._normalize_value(extracted)
-                
-                results.append({
-                    'filename': filename,
-                    'section': section,
-                    'field': field,
-                    'expected_value': expected,
-                    'extracted_value': extracted,
-                    'normalized_expected': norm_expected,
-                    'normalized_extracted': norm_extracted,
-                    'matches': self._compare_values(pd.Series({
-                        'field': field,
-                        'expected_value': expected,
-                        'extracted_value': extracted
-                    }))
-                })
-
-        return pd.DataFrame(results)
-
-    def generate_report(self) -> Dict:
-        """Generate comparison report"""
-        df = self.compare_data()
+        files, rows = self._load_cache()
+
+        master_hashes = self._master_hashes(df)
+        analysis_hashes = self._analysis_hashes(list(master_hashes), files)
+
+        # A file is recomputed when its analysis results or its master rows changed
+        stale = {
+            filename for filename, (_, analysis_hash) in analysis_hashes.items()
+            if filename not in files
+            or files[filename]['analysis_hash'] != analysis_hash
+            or files[filename]['master_hash'] != master_hashes[filename]
+        }
+        self.logger.info(
+            f"Comparing {len(stale)} new or changed files, "
+            f"reusing {len(analysis_hashes) - len(stale)} cached results"
+        )
+
+        fresh = self._compare_rows(df[df['filename'].isin(stale)])
+        fresh_counts = self._count_matches(fresh)
+
+        # Drop stale files and files that are no longer available, then add fresh results
+        removed = {filename for filename in files if filename not in analysis_hashes} | stale
+        for filename in removed:
+            files.pop(filename, None)
+        for filename, section_counts in fresh_counts.items():
+            signature, analysis_hash = analysis_hashes[filename]
+            files[filename] = {
+                'signature': signature,
+                'analysis_hash': analysis_hash,
+                'master_hash': master_hashes[filename],
+                'section_counts': section_counts
+            }
+
+        frames = [frame for frame in (rows[~rows['filename'].isin(removed)], fresh) if not frame.empty]
+        if frames:
+            rows = pd.concat(frames, ignore_index=True)
+            rows = rows.sort_values('filename', kind='stable').reset_index(drop=True)
+        else:
+            rows = pd.DataFrame(columns=RESULT_COLUMNS)
+        self._save_cache(files, rows)
+
+        counts = {filename: files[filename]['section_counts'] for filename in sorted(files)}
+        return rows, counts
+
+    def compare_streaming(self, details_path: Optional[Path] = None,
+                          chunksize: Optional[int] = None) -> Dict:
+        """
+        Compare master data in chunks without loading the whole CSV into memory
         
-        # Calculate section statistics
-        section_stats = df.groupby('section').agg({
-            'matches': ['count', 'sum']
-        })
-        section_stats.columns = ['total', 'matched']
-        section_stats['match_rate'] = (section_stats['matched'] / section_stats['total'] * 100)
+        Master rows are read chunksize at a time, joined against the analysis
+        results by filename, and only per-file, per-section counts are kept.
         
-        # Calculate file statistics
-        file_stats = df.groupby('filename').agg({
-            'matches': ['count', 'sum']
-        })
-        file_stats.columns = ['total', 'matched']
-        file_stats['match_rate'] = (file_stats['matched'] / file_stats['total'] * 100)
+        Args:
+            details_path: Optional CSV path to append the detailed comparison rows to
+            chunksize: Number of master rows per chunk. Defaults to settings.COMPARE_CHUNK_SIZE
+            
+        Returns:
+            Comparison report, as returned by generate_report
+        """
+        chunksize = chunksize or settings.COMPARE_CHUNK_SIZE
+        available_files = set(self._available_files())
+        counts = {}
+        total_rows = 0
+
+        if details_path:
+            Path(details_path).unlink(missing_ok=True)
+
+        for chunk in pd.read_csv(settings.MASTER_DATA_CSV, chunksize=chunksize):
+            chunk = chunk[chunk['filename'].isin(available_files)]
+            if chunk.empty:
+                continue
+
+            result = self._compare_rows(chunk)
+            total_rows += len(result)
+
+            # A file's rows may span chunks, so counts are added up
+            for filename, section_counts in self._count_matches(result).items():
+                file_counts = counts.setdefault(filename, {})
+                for section, (total, matched) in section_counts.items():
+                    previous_total, previous_matched = file_counts.get(section, (0, 0))
+                    file_counts[section] = (previous_total + total, previous_matched + matched)
+
+            if details_path:
+                result.to_csv(details_path, mode='a', index=False,
+                              header=not Path(details_path).exists())
+
+        self.logger.info(f"Compared {total_rows} rows for {len(counts)} files in chunks of {chunksize}")
+        return self._build_report(counts)
+
+    def _build_report(self, counts: Dict[str, Dict[str, Tuple[int, int]]]) -> Dict:
+        """Aggregate per-file, per-section (total, matched) counts into the report"""
+        section_totals = {}
+        file_stats = {}
+        for filename in sorted(counts):
+            file_total = file_matched = 0
+            for section, (total, matched) in counts[filename].items():
+                section_total = section_totals.setdefault(section, [0, 0])
+                section_total[0] += total
+                section_total[1] += matched
+                file_total += total
+                file_matched += matched
+            file_stats[filename] = {
+                'total': file_total,
+                'matched': file_matched,
+                'match_rate': file_matched / file_total * 100
+            }
+
+        section_stats = {
+            section: {'total': total, 'matched': matched, 'match_rate': matched / total * 100}
+            for section, (total, matched) in sorted(section_totals.items())
+        }
+
+        total_fields = sum(stats['total'] for stats in file_stats.values())
+        matched_fields = sum(stats['matched'] for stats in file_stats.values())
         
         # Compile stats
-        stats = {
-            'total_files': len(df['filename'].unique()),
-            'total_fields': len(df),
-            'matched_fields': int(df['matches'].sum()),
-            'overall_match_rate': (df['matches'].sum() / len(df) * 100),
-            'section_stats': section_stats.to_dict('index'),
-            'file_stats': file_stats.to_dict('index')
+        return {
+            'total_files': len(file_stats),
+            'total_fields': total_fields,
+            'matched_fields': matched_fields,
+            'overall_match_rate': matched_fields / total_fields * 100 if total_fields else 0.0,
+            'section_stats': section_stats,
+            'file_stats': file_stats
         }
-        
-        return stats
 
-    def save_results(self, output_path: Optional[Path] = None):
-        """Save comparison results to Excel"""
-        df = self.compare_data()
-        report = self.generate_report()
+    def generate_report(self, df: Optional[pd.DataFrame] = None, incremental: bool = False) -> Dict:
+        """Generate comparison report, reusing an existing comparison frame if given"""
+        if df is not None:
+            return self._build_report(self._count_matches(df))
+        if incremental:
+            return self._build_report(self._compare_incremental()[1])
+        return self._build_report(self._count_matches(self.compare_data()))
+
+    def save_results(self, output_path: Optional[Path] = None, incremental: bool = False) -> Dict:
+        """Save comparison results to Excel and return the report"""
+        if incremental:
+            df, counts = self._compare_incremental()
+        else:
+            df = self.compare_data()
+            counts = self._count_matches(df)
+        report = self._build_report(counts)
         
         output_path = output_path or settings.OUTPUT_DIR / "comparison_results.xlsx"
         
@@ -261,17 +524,53 @@ class CompareService:
             file_stats.to_excel(writer, sheet_name='File Statistics')
         
         self.logger.info(f"Results saved to: {output_path}")
+        return report
+
+    def save_streaming_results(self, output_path: Optional[Path] = None,
+                               details_path: Optional[Path] = None,
+                               chunksize: Optional[int] = None) -> Dict:
+        """Run a streaming comparison, writing detailed rows to CSV and statistics to Excel"""
+        details_path = details_path or settings.OUTPUT_DIR / "comparison_results.csv"
+        report = self.compare_streaming(details_path=details_path, chunksize=chunksize)
+        
+        output_path = output_path or settings.OUTPUT_DIR / "comparison_results.xlsx"
+        
+        with pd.ExcelWriter(output_path) as writer:
+            # Section statistics
+            section_stats = pd.DataFrame.from_dict(report['section_stats'], orient='index')
+            section_stats.to_excel(writer, sheet_name='Section Statistics')
+            
+            # File statistics
+            file_stats = pd.DataFrame.from_dict(report['file_stats'], orient='index')
+            file_stats.to_excel(writer, sheet_name='File Statistics')
+        
+        self.logger.info(f"Detailed results saved to: {details_path}")
+        self.logger.info(f"Statistics saved to: {output_path}")
+        return report
 
 
 def main():
     """Main function to run comparison"""
-    service = CompareService()
+    parser = argparse.ArgumentParser(description="Compare OCR results with the generated master data")
+    parser.add_argument('--full', action='store_true',
+                        help="Recompare all files instead of reusing cached per-file results")
+    parser.add_argument('--streaming', action='store_true',
+                        help="Read master_data.csv in chunks and write detailed results to CSV")
+    parser.add_argument('--chunksize', type=int, default=settings.COMPARE_CHUNK_SIZE,
+                        help="Master data rows per chunk in streaming mode")
+    parser.add_argument('--store', action='store_true',
+                        help="Read analysis results from the SQLite result store "
+                             "(forms missing from it are read from their JSON files)")
+    args = parser.parse_args()
+
+    store = ResultStore() if args.store else None
+    service = CompareService(store)
     try:
-        # Generate and save results
-        service.save_results()
-        
-        # Generate and print report
-        report = service.generate_report()
+        # Generate and save results, reusing the report for printing
+        if args.streaming:
+            report = service.save_streaming_results(chunksize=args.chunksize)
+        else:
+            report = service.save_results(incremental=not args.full)
         
         print("\n=== Comparison Report ===")
         print(f"Total files processed: {report['total_files']}")
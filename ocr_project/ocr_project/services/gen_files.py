@@ -1,84 +1,293 @@
+import argparse
+import hashlib
 import json
-import csv
-import pandas as pd
-from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
 
-from ocr_project.utils.fake_csv import FakeFormDataGenerator
-from ocr_project.core.form_processor import FormProcessor
-from ocr_project.processors.insert_pdf import add_text_to_pdf
+from ocr_project.utils.fake_csv import FakeFormDataGenerator, iter_batch_records
+from ocr_project.utils.master_csv import MasterCSVWriter
+from ocr_project.utils.manifest import ManifestWriter, shard_name
+from ocr_project.utils.bundle import BUNDLE_FORMATS, bundle_filename, open_bundle_writer
+from ocr_project.core.form_processor import CompiledFormTemplate
+from ocr_project.processors.insert_pdf import RENDER_MODES, add_elements_to_pdf
 from ocr_project.config.settings import settings
 
-def main():
+DATA_MODES = ("faker", "batch")
+
+# Per-process generation state, created once by _init_worker
+_worker: Dict = {}
+
+def derive_seed(master_seed: int, index: int) -> int:
+    """Derive the seed of a single form from the master seed and the form index"""
+    digest = hashlib.sha256(f"{master_seed}:{index}".encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big')
+
+def _init_worker(render_mode: str = None, shard_size: int = 0, bundle: str = "none"):
+    """Create the generator and compiled form template once per process"""
+    _worker['render_mode'] = render_mode or settings.PDF_RENDER_MODE
+    _worker['shard_size'] = shard_size
+    _worker['bundle'] = bundle
+    _worker['generator'] = FakeFormDataGenerator()
+    with open(settings.FORM_ELEMENTS_JSON, 'r', encoding='utf-8') as f:
+        _worker['template'] = CompiledFormTemplate(json.load(f))
+
+def form_filename(index: int) -> str:
+    """Name of the PDF generated for a form index"""
+    return f"form_{index+1}.pdf"
+
+def form_index(filename: str) -> int:
+    """Form index of a generated PDF name (inverse of form_filename)"""
+    return int(filename[len("form_"):-len(".pdf")]) - 1
+
+def _write_form(i: int, seed: int, records: List[Tuple[str, str, str]]) -> Dict:
+    """
+    Render the PDF of one form from its records
+
+    Args:
+        i: Form index
+        seed: Seed the records were generated from (form seed, or block seed in batch mode)
+        records: The form's (section, field, value) records
+
+    Returns:
+        Dict with index, filename, file (relative to GENERATED_PDFS_DIR), page, seed, sha256,
+        shard and the form's records. When bundling, the PDF is not written; its bytes are
+        returned under "pdf" and file/page are set once it is added to a bundle.
+    """
+    pdf_filename = form_filename(i)
+    pdf_bytes = add_elements_to_pdf(
+        settings.RAW_PDF_PATH,
+        None,
+        _worker['template'].fill(records),
+        zoom=settings.PDF_ZOOM,
+        mode=_worker['render_mode']
+    )
+    form = {
+        'index': i,
+        'filename': pdf_filename,
+        'file': None,
+        'page': 0,
+        'seed': seed,
+        'sha256': hashlib.sha256(pdf_bytes).hexdigest(),
+        'shard': "",
+        'records': records
+    }
+
+    if _worker['bundle'] != "none":
+        form['pdf'] = pdf_bytes
+        return form
+
+    shard = shard_name(i, _worker['shard_size'])
+    output_dir = settings.GENERATED_PDFS_DIR / shard
+    output_dir.mkdir(parents=True, exist_ok=True)
+    output_pdf = output_dir / pdf_filename
+    with open(output_pdf, 'wb') as f:
+        f.write(pdf_bytes)
+
+    form['file'] = output_pdf.relative_to(settings.GENERATED_PDFS_DIR).as_posix()
+    form['shard'] = shard
+    return form
+
+def _generate_form(task: Tuple[int, int]) -> Dict:
+    """
+    Generate a single form with per-field Faker calls
+
+    Args:
+        task: Tuple of (form index, form seed)
+
+    Returns:
+        The form's manifest entry and records (see _write_form)
+    """
+    i, seed = task
+    generator = _worker['generator']
+
+    # Every form starts from its own seed, independent of which process runs it
+    generator.reseed(seed)
+    return _write_form(i, seed, generator.generate_records())
+
+def _generate_block(task: Tuple[int, int, int, Tuple[int, ...]]) -> List[Dict]:
+    """
+    Generate a block of forms from one vectorized batch
+
+    Args:
+        task: Tuple of (first form index, block seed, block size, indices of the forms to render).
+              The whole block is always generated so its data does not depend on which forms
+              were already done.
+
+    Returns:
+        Manifest entries and records of the rendered forms, in form order
+    """
+    start, seed, size, pending = task
+    batch = _worker['generator'].generate_batch(size, seed)
+    pending = set(pending)
+    return [
+        _write_form(start + offset, seed, records)
+        for offset, records in enumerate(iter_batch_records(batch))
+        if start + offset in pending
+    ]
+
+def _generation_tasks(args: argparse.Namespace, completed) -> List[tuple]:
+    """Build the per-form (faker) or per-block (batch) tasks for the forms not yet completed"""
+    pending = [i for i in range(args.count) if form_filename(i) not in completed]
+    if args.data_mode == "faker":
+        return [(i, derive_seed(args.seed, i)) for i in pending]
+
+    # Every block is generated whole, even past --count, so the data of a form depends only on
+    # the seed and block size (a run with a larger --count reproduces the forms of a smaller one)
+    pending_set = set(pending)
+    tasks = []
+    for block in sorted({i // args.block_size for i in pending}):
+        start = block * args.block_size
+        block_pending = tuple(i for i in range(start, start + args.block_size) if i in pending_set)
+        tasks.append((start, derive_seed(args.seed, block), args.block_size, block_pending))
+    return tasks
+
+def _check_bundle_resume(args: argparse.Namespace, completed) -> None:
+    """Bundles are written whole, so a resumed run must not need to add forms to an existing bundle"""
+    done = {i // args.bundle_size for i in range(args.count) if form_filename(i) in completed}
+    todo = {i // args.bundle_size for i in range(args.count) if form_filename(i) not in completed}
+    if done & todo:
+        raise ValueError("Completed forms do not line up with bundle boundaries; "
+                         "resume with the same --bundle-size as the interrupted run")
+
+def _generated_forms(args: argparse.Namespace, tasks: List[tuple]) -> Iterator[Dict]:
+    """Run the generation tasks and yield the generated forms in form order"""
+    batched = args.data_mode == "batch"
+    generate = _generate_block if batched else _generate_form
+
+    # map() yields results in task order regardless of completion order
+    if args.workers > 1:
+        with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker,
+                                 initargs=(args.render_mode, args.shard_size, args.bundle)) as executor:
+            chunksize = 1 if batched else max(1, len(tasks) // (args.workers * 4))
+            results = executor.map(generate, tasks, chunksize=chunksize)
+            for result in results:
+                yield from (result if batched else [result])
+    else:
+        _init_worker(args.render_mode, args.shard_size, args.bundle)
+        for task in tasks:
+            result = generate(task)
+            yield from (result if batched else [result])
+
+class CorpusOutput:
+    """
+    Records generated forms in the manifest and master CSV, in form order.
+
+    Without bundling each form is recorded as soon as it is done. With bundling
+    the PDFs are packed into bundle_XXXX.pdf/.zip files of bundle_size forms, and
+    a bundle's forms are recorded only once the bundle file is complete, so the
+    manifest never points into a missing or partial bundle.
+    """
+
+    def __init__(self, writer: MasterCSVWriter, manifest: ManifestWriter, count: int,
+                 bundle: str = "none", bundle_size: int = 1000):
+        self.writer = writer
+        self.manifest = manifest
+        self.count = count
+        self.bundle = bundle
+        self.bundle_size = bundle_size
+        self._bundle_writer = None
+        self._bundle_index = None
+        self._bundled_forms: List[Dict] = []
+
+    def add(self, form: Dict) -> None:
+        """Record a generated form, or add it to the current bundle"""
+        if self.bundle == "none":
+            self._record(form)
+            return
+
+        bundle_index = form['index'] // self.bundle_size
+        if self._bundle_writer is not None and bundle_index != self._bundle_index:
+            self._close_bundle()
+        if self._bundle_writer is None:
+            self._bundle_index = bundle_index
+            self._bundle_writer = open_bundle_writer(
+                settings.GENERATED_PDFS_DIR / bundle_filename(bundle_index, self.bundle), self.bundle
+            )
+
+        form['page'] = self._bundle_writer.add(form['filename'], form.pop('pdf'))
+        form['file'] = bundle_filename(bundle_index, self.bundle)
+        self._bundled_forms.append(form)
+
+    def _record(self, form: Dict) -> None:
+        """Write a form's rows; the manifest row goes first so every form in the master CSV is listed"""
+        self.manifest.write(form['filename'], form['file'], form['page'], form['seed'],
+                            form['sha256'], form['shard'])
+        self.writer.write_form(form['filename'], form['records'])
+        print(f"✓ Generated PDF {len(self.writer.completed)}/{self.count}: {form['file']}"
+              + (f" (page {form['page']})" if self.bundle != "none" else ""))
+
+    def _close_bundle(self) -> None:
+        """Finish the current bundle file and record its forms"""
+        self._bundle_writer.close()
+        for form in self._bundled_forms:
+            self._record(form)
+        self._bundle_writer = None
+        self._bundled_forms = []
+
+    def close(self) -> None:
+        if self._bundle_writer is not None:
+            self._close_bundle()
+
+def parse_args(argv: Optional[list] = None) -> argparse.Namespace:
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Generate synthetic filled forms")
+    parser.add_argument('--count', type=int, default=settings.NUM_PDFS_TO_GENERATE,
+                        help="Number of forms to generate")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Number of worker processes")
+    parser.add_argument('--seed', type=int, default=settings.GENERATION_SEED,
+                        help="Master seed; each form's seed is derived from it and the form index")
+    parser.add_argument('--render-mode', choices=RENDER_MODES, default=settings.PDF_RENDER_MODE,
+                        help="raster: scan-like bitmap pages; vector: real PDF text over the template")
+    parser.add_argument('--resume', action='store_true',
+                        help="Keep the forms already in the master CSV and generate only the rest "
+                             "(use the same --seed as the interrupted run)")
+    parser.add_argument('--shard-size', type=int, default=settings.GENERATION_SHARD_SIZE,
+                        help="Write PDFs into shard_XXXX subdirectories of this many forms (0: no sharding)")
+    parser.add_argument('--data-mode', choices=DATA_MODES, default=settings.GENERATION_DATA_MODE,
+                        help="faker: per-form Faker data; batch: vectorized data generated per block")
+    parser.add_argument('--block-size', type=int, default=settings.GENERATION_BLOCK_SIZE,
+                        help="Forms per batch in batch mode; part of what determines the generated data")
+    parser.add_argument('--bundle', choices=BUNDLE_FORMATS, default=settings.GENERATION_BUNDLE,
+                        help="none: one PDF per form; pdf: multi-page PDF bundles; "
+                             "zip: uncompressed ZIP bundles of form PDFs (--shard-size does not apply)")
+    parser.add_argument('--bundle-size', type=int, default=settings.GENERATION_BUNDLE_SIZE,
+                        help="Forms per bundle")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[list] = None):
+    args = parse_args(argv)
+
     try:
         # Validate required files exist
         if not settings.validate_required_files():
             return
-            
-        # Initialize generator and processor
-        generator = FakeFormDataGenerator()
-        processor = FormProcessor()
-        
-        # Load original JSON template
-        with open(settings.FORM_ELEMENTS_JSON, 'r', encoding='utf-8') as f:
-            json_template = json.load(f)
-
-        # List to store all generated data
-        all_data = []
-
-        print("\n=== Starting batch PDF generation ===")
-        
-        # Generate PDFs
-        for i in range(settings.NUM_PDFS_TO_GENERATE):
-            print(f"\nProcessing PDF {i+1}/{settings.NUM_PDFS_TO_GENERATE}")
-            
-            # Generate temporary CSV for this iteration
-            temp_csv_path = settings.TEMP_DIR / f"temp_form_data_{i}.csv"
-            generator.save_to_csv(temp_csv_path)
-            
-            # Update JSON with the generated fake CSV data
-            updated_json = processor.update_json_with_csv(json_template.copy(), temp_csv_path)
-            
-            # Read the generated CSV data and add filename column
-            df = pd.read_csv(temp_csv_path, on_bad_lines='skip', escapechar='\\', quoting=csv.QUOTE_ALL)
-            pdf_filename = f"form_{i+1}.pdf"
-            df['filename'] = pdf_filename
-            
-            # Add data to master list
-            all_data.append(df)
-            
-            # Save updated JSON temporarily
-            temp_json_path = settings.TEMP_DIR / f"temp_form_{i}.json"
-            with open(temp_json_path, 'w', encoding='utf-8') as f:
-                json.dump(updated_json, f, ensure_ascii=False, indent=4)
-            
-            # Generate PDF
-            output_pdf = settings.GENERATED_PDFS_DIR / pdf_filename
-            add_text_to_pdf(
-                settings.RAW_PDF_PATH,
-                output_pdf,
-                temp_json_path,
-                zoom=settings.PDF_ZOOM
-            )
-            
-            # Clean up temporary files
-            Path(temp_csv_path).unlink(missing_ok=True)
-            Path(temp_json_path).unlink(missing_ok=True)
-            
-            print(f"✓ Generated PDF: {pdf_filename}")
-
-        # Create and save master CSV
-        master_df = pd.concat(all_data, ignore_index=True)
-        
-        # Reorder columns to put filename first
-        cols = master_df.columns.tolist()
-        cols.remove('filename')
-        cols = ['filename'] + cols
-        master_df = master_df[cols]
-        
-        master_df.to_csv(settings.MASTER_DATA_CSV, index=False)
-        
+
+        # Bundled forms are recorded a whole bundle at a time, so resume drops the last bundle
+        group = (lambda filename: form_index(filename) // args.bundle_size) if args.bundle != "none" else None
+
+        with MasterCSVWriter(settings.MASTER_DATA_CSV, resume=args.resume, group=group) as writer, \
+                ManifestWriter(settings.GENERATION_MANIFEST,
+                               keep=writer.completed if args.resume else None) as manifest:
+            if args.bundle != "none":
+                _check_bundle_resume(args, writer.completed)
+            tasks = _generation_tasks(args, writer.completed)
+
+            print("\n=== Starting batch PDF generation ===")
+            print(f"Forms: {args.count}, workers: {args.workers}, master seed: {args.seed}, "
+                  f"render mode: {args.render_mode}, data mode: {args.data_mode}, "
+                  f"shard size: {args.shard_size or 'none'}, bundle: {args.bundle}")
+            if args.resume:
+                print(f"Resuming: {len(writer.completed)} forms already in {settings.MASTER_DATA_CSV}")
+
+            output = CorpusOutput(writer, manifest, args.count, args.bundle, args.bundle_size)
+            for form in _generated_forms(args, tasks):
+                output.add(form)
+            output.close()
+
         print("\n=== Batch processing completed successfully! ===")
         print(f"Generated PDFs are saved in: {settings.GENERATED_PDFS_DIR}")
+        print(f"Manifest saved to: {settings.GENERATION_MANIFEST}")
         print(f"Master CSV saved to: {settings.MASTER_DATA_CSV}")
 
     except Exception as e:
@@ -87,4 +296,4 @@ def main():
 
 if __name__ == "__main__":
     main()
-    settings.clean_pycache()
\ No newline at end of file
+    settings.clean_pycache()
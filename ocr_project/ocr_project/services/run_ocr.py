@@ -5,7 +5,7 @@ from datetime import datetime
 import os
 
 from ocr_project.config.settings import settings
-from ocr_project.core.batch_ocr_service import BatchOCRService
+from ocr_project.core.batch_ocr_service import BatchOCRService, directory_entries
 
 def setup_logging():
     """Configure logging for the OCR runner"""
@@ -37,7 +37,8 @@ def main():
             logger.error(f"Generated PDFs directory not found: {settings.GENERATED_PDFS_DIR}")
             return
             
-        pdf_files = list(settings.GENERATED_PDFS_DIR.glob("form_*.pdf"))
+        # The manifest lists every generated form, so large corpora need no directory scan
+        pdf_files = directory_entries(settings.GENERATED_PDFS_DIR)
         if not pdf_files:
             logger.error("No PDF files found in the generated PDFs directory")
             logger.info("Please run gen_files.py first to generate the PDFs")
@@ -47,7 +48,7 @@ def main():
         
         # Initialize and run batch service
         batch_service = BatchOCRService()
-        results = batch_service.process_directory()
+        results = batch_service.process_directory(entries=pdf_files)
         
         # Generate analysis report
         batch_service.generate_analysis_report(results)
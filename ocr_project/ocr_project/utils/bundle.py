@@ -0,0 +1,78 @@
+import os
+import zipfile
+from pathlib import Path
+from typing import Tuple, Union
+
+import fitz  # PyMuPDF
+
+BUNDLE_FORMATS = ("none", "pdf", "zip")
+
+def bundle_filename(index: int, bundle_format: str) -> str:
+    """Name of the bundle file holding a block of forms"""
+    return f"bundle_{index:04d}.{bundle_format}"
+
+class PdfBundleWriter:
+    """Collects single-page form PDFs into one multi-page PDF, page N being the N-th form added."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._document = fitz.open()
+
+    def add(self, name: str, pdf_bytes: bytes) -> int:
+        """Append a form's pages and return the index of its first page"""
+        page = self._document.page_count
+        with fitz.open("pdf", pdf_bytes) as form:
+            self._document.insert_pdf(form)
+        return page
+
+    def close(self) -> None:
+        """Write the bundle; it only appears under its final name once complete"""
+        temp_path = self.path.with_name(self.path.name + ".tmp")
+        self._document.save(temp_path, garbage=3, deflate=True, no_new_id=True)
+        self._document.close()
+        os.replace(temp_path, self.path)
+
+class ZipBundleWriter:
+    """Stores form PDFs uncompressed in a ZIP; the ZIP directory indexes them in insertion order."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._temp_path = self.path.with_name(self.path.name + ".tmp")
+        self._zip = zipfile.ZipFile(self._temp_path, 'w', compression=zipfile.ZIP_STORED)
+        self._count = 0
+
+    def add(self, name: str, pdf_bytes: bytes) -> int:
+        """Store a form PDF under its filename and return its index in the archive"""
+        self._zip.writestr(name, pdf_bytes)
+        self._count += 1
+        return self._count - 1
+
+    def close(self) -> None:
+        """Write the ZIP directory; the bundle only appears under its final name once complete"""
+        self._zip.close()
+        os.replace(self._temp_path, self.path)
+
+def open_bundle_writer(path: Union[str, Path], bundle_format: str):
+    """Create a PdfBundleWriter or ZipBundleWriter for the given format"""
+    if bundle_format == "pdf":
+        return PdfBundleWriter(path)
+    if bundle_format == "zip":
+        return ZipBundleWriter(path)
+    raise ValueError(f"Unknown bundle format: {bundle_format}. Must be one of: {BUNDLE_FORMATS[1:]}")
+
+def open_form_page(path: Union[str, Path], page: int = 0) -> Tuple[fitz.Document, int]:
+    """
+    Open the document holding a form without unpacking its bundle
+
+    Args:
+        path: A single form PDF, a PDF bundle or a ZIP bundle
+        page: Page index in a PDF bundle, or entry index in a ZIP bundle
+
+    Returns:
+        Tuple of (open document, index of the form's page in it)
+    """
+    path = Path(path)
+    if path.suffix == ".zip":
+        with zipfile.ZipFile(path) as bundle:
+            return fitz.open("pdf", bundle.read(bundle.infolist()[page])), 0
+    return fitz.open(str(path)), page
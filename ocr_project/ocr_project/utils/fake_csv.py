@@ -1,21 +1,95 @@
 import random
 from datetime import datetime, timedelta
 import csv
-from typing import List, Dict, Tuple
+from typing import Iterator, List, Dict, Optional, Tuple
 import faker
+import numpy as np
+import pandas as pd
+
+# Value choices shared by the per-form and batch generators
+INJURY_ACTIONS = ["החלקה", "נפילה", "מעידה", "איבוד שיווי משקל"]
+INJURY_LOCATIONS = ["רצפה רטובה", "מדרגה חלקלקה", "שביל רטוב", "משטח חלק"]
+INJURY_CIRCUMSTANCES = ["במהלך העבודה", "בעת ביצוע מטלה", "בעת תפקיד"]
+JOB_TYPES = ['מלצרות', 'מכירות', 'משרד', 'מחסן', 'נהיגה']
+BODY_PARTS = ['יד ימין', 'יד שמאל', 'רגל ימין', 'רגל שמאל', 'גב', 'ראש']
+SIGNATURES = ['signed', '']
+
+# Groups of mutually exclusive checkboxes
+GENDER_FIELDS = ["section2|מין/זכר", "section2|מין/נקבה"]
+ACCIDENT_LOCATION_FIELDS = [
+    "section3|מקום התאונה/מפעל",
+    "section3|מקום התאונה/ת. דרכים בעבודה",
+    "section3|מקום התאונה/ת. דרכים בדרך לעבודה/מהעבודה",
+    "section3|מקום התאונה/תאונה בדרך לא רכב",
+    "section3|מקום התאונה/אחר"
+]
+MEMBER_STATUS_FIELDS = [
+    "section5|סטטוס חברות בקופת חולים/הנפגע חבר בקופת חולים",
+    "section5|סטטוס חברות בקופת חולים/הנפגע אינו חבר בקופת חולים"
+]
+HMO_FIELDS = [
+    "section5|קופת חולים/כללית",
+    "section5|קופת חולים/מאוחדת",
+    "section5|קופת חולים/מכבי",
+    "section5|קופת חולים/לאומית"
+]
+EXCLUSIVE_GROUPS = [GENDER_FIELDS, ACCIDENT_LOCATION_FIELDS, MEMBER_STATUS_FIELDS, HMO_FIELDS]
+
+# Upper bound on the Faker values drawn per batch for each of names, streets and cities
+FAKER_POOL_SIZE = 256
+
+DATE_RANGE_START = np.datetime64('2023-01-01')
+DIGITS = np.array(list("0123456789"))
+
+def _join_chars(chars: np.ndarray, spaces: int) -> np.ndarray:
+    """Join each row of a (n, k) single-character array with the given number of spaces"""
+    n, k = chars.shape
+    if spaces == 0:
+        return np.ascontiguousarray(chars).view(f'U{k}').ravel()
+    width = k + (k - 1) * spaces
+    out = np.full((n, width), ' ', dtype='U1')
+    out[:, ::spaces + 1] = chars
+    return out.view(f'U{width}').ravel()
+
+def _random_digits(rng: np.random.Generator, n: int, k: int) -> np.ndarray:
+    """Draw an (n, k) array of digit characters"""
+    return DIGITS[rng.integers(0, 10, size=(n, k))]
+
+def _random_dates(rng: np.random.Generator, n: int, spaces: int = 0, add_divider: bool = True) -> np.ndarray:
+    """Vectorized generate_date: days in 2023 formatted as DD.MM.YYYY or spaced DDMMYYYY"""
+    # 'YYYY-MM-DD' strings, reordered into DDMMYYYY characters
+    iso = (DATE_RANGE_START + rng.integers(0, 366, size=n)).astype('U10')
+    chars = iso.view('U1').reshape(n, 10)[:, [8, 9, 5, 6, 0, 1, 2, 3]]
+    if add_divider:
+        dotted = np.full((n, 10), '.', dtype='U1')
+        dotted[:, [0, 1, 3, 4, 6, 7, 8, 9]] = chars
+        chars = dotted
+    return _join_chars(chars, spaces)
+
+def _random_ints(rng: np.random.Generator, n: int, low: int, high: int) -> np.ndarray:
+    """Integers in [low, high] as strings"""
+    return rng.integers(low, high + 1, size=n).astype(str)
 
 class FakeFormDataGenerator:
-    def __init__(self):
+    def __init__(self, seed: Optional[int] = None):
         self.fake = faker.Faker(['he_IL'])  # Hebrew locale
+        self.random = random.Random()
+        if seed is not None:
+            self.reseed(seed)
+
+    def reseed(self, seed: int) -> None:
+        """Seed both the random generator and Faker so the next form is reproducible"""
+        self.random.seed(seed)
+        self.fake.seed_instance(seed)
 
     def generate_number(self, length: int) -> str:
         """Generate number without spaces between digits"""
-        digits = [str(random.randint(0, 9)) for _ in range(length)]
+        digits = [str(self.random.randint(0, 9)) for _ in range(length)]
         return " ".join(digits)
         
     def generate_spaced_number(self, length: int) -> str:
         """Generate number with spaces between digits"""
-        digits = [str(random.randint(0, 9)) for _ in range(length)]
+        digits = [str(self.random.randint(0, 9)) for _ in range(length)]
         return "  ".join(digits)
     
     def generate_phone_number(self) -> str:
@@ -24,7 +98,7 @@ class FakeFormDataGenerator:
         prefix = "054"
         
         # Generate remaining 7 digits randomly
-        remaining_digits = [str(random.randint(0, 9)) for _ in range(7)]
+        remaining_digits = [str(self.random.randint(0, 9)) for _ in range(7)]
         
         # Combine prefix and remaining digits, adding two spaces between each digit
         full_number = prefix + "".join(remaining_digits)
@@ -35,7 +109,7 @@ class FakeFormDataGenerator:
     def generate_date(self, start_year: int = 2023, spaces: int = 0, add_divider: bool = True) -> str:
         """Generate a random date in custom format with optional spaces and divider."""
         start_date = datetime(start_year, 1, 1)
-        days = random.randint(0, 365)
+        days = self.random.randint(0, 365)
         random_date = start_date + timedelta(days=days)
         
         # Choose divider based on `add_divider` flag
@@ -53,61 +127,30 @@ class FakeFormDataGenerator:
     
     def generate_time(self) -> str:
         """Generate a random time in HH:MM format"""
-        hour = random.randint(8, 20)  # Business hours
-        minute = random.randint(0, 59)
+        hour = self.random.randint(8, 20)  # Business hours
+        minute = self.random.randint(0, 59)
         return f"{hour:02d}:{minute:02d}"
 
     def generate_exclusive_choices(self, options: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
         """Generate mutually exclusive choices where only one option is selected"""
-        selected_index = random.randrange(len(options))
+        selected_index = self.random.randrange(len(options))
         return [(field, "V" if i == selected_index else "") 
                 for i, (field, _) in enumerate(options)]
     
     def generate_injury_sentence(self):
-        # Possible variations for actions and circumstances
-        actions = ["החלקה", "נפילה", "מעידה", "איבוד שיווי משקל"]
-        locations = ["רצפה רטובה", "מדרגה חלקלקה", "שביל רטוב", "משטח חלק"]
-        circumstances = ["במהלך העבודה", "בעת ביצוע מטלה", "בעת תפקיד"]
-
         # Build the sentence with random choices
-        action = random.choice(actions)
-        location = random.choice(locations)
-        circumstance = random.choice(circumstances)
+        action = self.random.choice(INJURY_ACTIONS)
+        location = self.random.choice(INJURY_LOCATIONS)
+        circumstance = self.random.choice(INJURY_CIRCUMSTANCES)
 
         return f"{action} על {location} {circumstance}."
 
     def generate_fake_data(self) -> List[Dict[str, str]]:
-        # Define groups of mutually exclusive choices
-        gender_fields = [
-            ("section2|מין/זכר", ""),
-            ("section2|מין/נקבה", "")
-        ]
-
-        accident_location_fields = [
-            ("section3|מקום התאונה/מפעל", ""),
-            ("section3|מקום התאונה/ת. דרכים בעבודה", ""),
-            ("section3|מקום התאונה/ת. דרכים בדרך לעבודה/מהעבודה", ""),
-            ("section3|מקום התאונה/תאונה בדרך לא רכב", ""),
-            ("section3|מקום התאונה/אחר", "")
-        ]
-
-        member_status_fields = [
-            ("section5|סטטוס חברות בקופת חולים/הנפגע חבר בקופת חולים", ""),
-            ("section5|סטטוס חברות בקופת חולים/הנפגע אינו חבר בקופת חולים", "")
-        ]
-
-        hmo_fields = [
-            ("section5|קופת חולים/כללית", ""),
-            ("section5|קופת חולים/מאוחדת", ""),
-            ("section5|קופת חולים/מכבי", ""),
-            ("section5|קופת חולים/לאומית", "")
-        ]
-
         # Generate selections for each group
-        gender_choices = self.generate_exclusive_choices(gender_fields)
-        accident_choices = self.generate_exclusive_choices(accident_location_fields)
-        member_choices = self.generate_exclusive_choices(member_status_fields)
-        hmo_choices = self.generate_exclusive_choices(hmo_fields)
+        gender_choices = self.generate_exclusive_choices([(f, "") for f in GENDER_FIELDS])
+        accident_choices = self.generate_exclusive_choices([(f, "") for f in ACCIDENT_LOCATION_FIELDS])
+        member_choices = self.generate_exclusive_choices([(f, "") for f in MEMBER_STATUS_FIELDS])
+        hmo_choices = self.generate_exclusive_choices([(f, "") for f in HMO_FIELDS])
 
         # Combine all data
         data = [
@@ -125,25 +168,25 @@ class FakeFormDataGenerator:
             ("section2|ת.ז", self.generate_spaced_number(10)),
             ("section2|תאריך לידה", self.generate_date(spaces=1, add_divider=False)),
             ("section2|רחוב", self.fake.street_name()),
-            ("section2|מס' בית", str(random.randint(1, 150))),
-            ("section2|כניסה", str(random.randint(1, 4))),
-            ("section2|דירה", str(random.randint(1, 40))),
+            ("section2|מס' בית", str(self.random.randint(1, 150))),
+            ("section2|כניסה", str(self.random.randint(1, 4))),
+            ("section2|דירה", str(self.random.randint(1, 40))),
             ("section2|יישוב", self.fake.city()),
-            ("section2|מיקוד", str(random.randint(100000, 999999))),
+            ("section2|מיקוד", str(self.random.randint(100000, 999999))),
             ("section2|טלפון קווי", self.generate_phone_number()),
             ("section2|טלפון נייד", self.generate_phone_number()),
             
             # Section 3 - Accident Details
             ("section3|בתאריך", self.generate_date()),
             ("section3|בשעה", self.generate_time()),
-            ("section3|כאשר עבדתי ב", random.choice(['מלצרות', 'מכירות', 'משרד', 'מחסן', 'נהיגה'])),
-            ("section3|כתובת מקום התאונה", f"{self.fake.street_name()} {random.randint(1,100)}, {self.fake.city()}"),
+            ("section3|כאשר עבדתי ב", self.random.choice(JOB_TYPES)),
+            ("section3|כתובת מקום התאונה", f"{self.fake.street_name()} {self.random.randint(1,100)}, {self.fake.city()}"),
             ("section3|נסיבות הפגיעה / תיאור התאונה", self.generate_injury_sentence()),
-            ("section3|האיבר שנפגע", random.choice(['יד ימין', 'יד שמאל', 'רגל ימין', 'רגל שמאל', 'גב', 'ראש'])),
+            ("section3|האיבר שנפגע", self.random.choice(BODY_PARTS)),
             
             # Section 4
             ("section4|שם המבקש", f"{self.fake.first_name()} {self.fake.last_name()}"),
-            ("section4|חתימה", random.choice(['signed', ''])),
+            ("section4|חתימה", self.random.choice(SIGNATURES)),
             
             # Section 5 - Medical Details
             ("section5|אבחנה רפואית 1", self.generate_spaced_number(4)),
@@ -158,15 +201,107 @@ class FakeFormDataGenerator:
 
         return data
 
+    def generate_records(self) -> List[Tuple[str, str, str]]:
+        """Generate one form's data as (section, field, value) records"""
+        records = []
+        for field, value in self.generate_fake_data():
+            section, field_name = field.split('|')
+            records.append((section, field_name, value))
+        return records
+
+    def _pool(self, method: str, size: int) -> np.ndarray:
+        """Pre-sample Faker values for a batch"""
+        return np.array([getattr(self.fake, method)() for _ in range(size)], dtype=object)
+
+    def generate_batch(self, n: int, seed: int) -> pd.DataFrame:
+        """
+        Generate n forms at once as a columnar table
+
+        Numeric fields, dates and choices are drawn with NumPy; Faker is only used
+        to pre-sample pools of names, streets and cities that rows are drawn from.
+        The values follow the same formats as generate_fake_data, but a batch is
+        not value-for-value equal to n calls of it.
+
+        Args:
+            n: Number of forms
+            seed: Seed of the batch; the same (n, seed) always gives the same table
+
+        Returns:
+            DataFrame with one row per form and one "section|field" column per field,
+            in generate_fake_data order
+        """
+        rng = np.random.default_rng(seed)
+        self.fake.seed_instance(seed)
+
+        # Fixed pool size, so the pools of a seed do not depend on n
+        cities = self._pool('city', FAKER_POOL_SIZE)
+        last_names = self._pool('last_name', FAKER_POOL_SIZE)
+        first_names = self._pool('first_name', FAKER_POOL_SIZE)
+        streets = self._pool('street_name', FAKER_POOL_SIZE)
+
+        def pick(values, size=n):
+            return np.asarray(values, dtype=object)[rng.integers(0, len(values), size=size)]
+
+        def phones():
+            prefix = np.broadcast_to(np.array(list("054")), (n, 3))
+            return _join_chars(np.hstack([prefix, _random_digits(rng, n, 7)]), 2)
+
+        columns = {
+            "header|אל קופ״ח/בי״ח": pick(cities),
+            "header|תאריך מילוי הטופס": _random_dates(rng, n, spaces=2, add_divider=False),
+            "header|תאריך קבלת הטופס בקופה": _random_dates(rng, n, spaces=2, add_divider=False),
+            "section1|תאריך הפגיעה": _random_dates(rng, n, spaces=2, add_divider=False),
+            "section2|שם משפחה": pick(last_names),
+            "section2|שם פרטי": pick(first_names),
+            "section2|ת.ז": _join_chars(_random_digits(rng, n, 10), 2),
+            "section2|תאריך לידה": _random_dates(rng, n, spaces=1, add_divider=False),
+            "section2|רחוב": pick(streets),
+            "section2|מס' בית": _random_ints(rng, n, 1, 150),
+            "section2|כניסה": _random_ints(rng, n, 1, 4),
+            "section2|דירה": _random_ints(rng, n, 1, 40),
+            "section2|יישוב": pick(cities),
+            "section2|מיקוד": _random_ints(rng, n, 100000, 999999),
+            "section2|טלפון קווי": phones(),
+            "section2|טלפון נייד": phones(),
+            "section3|בתאריך": _random_dates(rng, n),
+            "section3|בשעה": np.char.add(
+                np.char.add(np.char.zfill(_random_ints(rng, n, 8, 20), 2), ":"),
+                np.char.zfill(_random_ints(rng, n, 0, 59), 2)
+            ),
+            "section3|כאשר עבדתי ב": pick(JOB_TYPES),
+            "section3|כתובת מקום התאונה": (
+                pick(streets) + " " + _random_ints(rng, n, 1, 100).astype(object) + ", " + pick(cities)
+            ),
+            "section3|נסיבות הפגיעה / תיאור התאונה": (
+                pick(INJURY_ACTIONS) + " על " + pick(INJURY_LOCATIONS) + " " + pick(INJURY_CIRCUMSTANCES) + "."
+            ),
+            "section3|האיבר שנפגע": pick(BODY_PARTS),
+            "section4|שם המבקש": pick(first_names) + " " + pick(last_names),
+            "section4|חתימה": pick(SIGNATURES),
+            "section5|אבחנה רפואית 1": _join_chars(_random_digits(rng, n, 4), 2),
+            "section5|אבחנה רפואית 2": _join_chars(_random_digits(rng, n, 4), 2),
+        }
+
+        for group in EXCLUSIVE_GROUPS:
+            selected = rng.integers(0, len(group), size=n)
+            for i, field in enumerate(group):
+                columns[field] = np.where(selected == i, "V", "")
+
+        return pd.DataFrame({field: np.asarray(values).astype(object) for field, values in columns.items()})
+
     def save_to_csv(self, filename: str):
-        data = self.generate_fake_data()
         with open(filename, 'w', newline='', encoding='utf-8') as f:
             writer = csv.writer(f, delimiter='|')
             writer.writerow(['section', 'field', 'value'])  # Header
-            for field, value in data:
-                section, field_name = field.split('|')
+            for section, field_name, value in self.generate_records():
                 writer.writerow([section, field_name, value])
 
+def iter_batch_records(batch: pd.DataFrame) -> Iterator[List[Tuple[str, str, str]]]:
+    """Yield the (section, field, value) records of each form in a generate_batch table"""
+    keys = [tuple(column.split('|', 1)) for column in batch.columns]
+    for row in batch.itertuples(index=False, name=None):
+        yield [(section, field, value) for (section, field), value in zip(keys, row)]
+
 # Example usage:
 if __name__ == "__main__":
     generator = FakeFormDataGenerator()
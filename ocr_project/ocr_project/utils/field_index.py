@@ -0,0 +1,93 @@
+import json
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+FieldMap = Dict[str, Optional[str]]
+
+def field_key(section: str, field: str) -> str:
+    """Build the lookup key for a field, where field is a label or label/sub_label"""
+    return f"{section}/{field}"
+
+def parse_analysis_json(content: str) -> Dict:
+    """Parse analysis results JSON, unwrapping it if it was saved as an escaped JSON string"""
+    content = content.strip()
+    if content.startswith('"') and content.endswith('"'):
+        content = content[1:-1].replace('\\n', '\n').replace('\\"', '"')
+    return json.loads(content)
+
+def load_analysis_json(json_path: Union[str, Path]) -> Dict:
+    """Load an analysis JSON file (see parse_analysis_json)"""
+    with open(json_path, 'r', encoding='utf-8') as f:
+        return parse_analysis_json(f.read())
+
+def flatten_analysis(data: Dict) -> FieldMap:
+    """
+    Flatten analysis results into a section/label[/sub_label] -> value map
+
+    Values are converted to strings (None stays None). When a label appears
+    more than once in a section, the first occurrence wins.
+
+    Args:
+        data: Analysis results in the section/fields/sub_fields layout
+
+    Returns:
+        Dict mapping field keys (see field_key) to values
+    """
+    field_map = {}
+    for section, section_data in data.items():
+        if not isinstance(section_data, dict):
+            continue
+        for field in section_data.get('fields') or []:
+            label = field.get('label')
+            if label is None:
+                continue
+            value = field.get('value')
+            field_map.setdefault(
+                field_key(section, label), str(value) if value is not None else None
+            )
+
+            for sub in field.get('sub_fields') or []:
+                sub_label = sub.get('label')
+                if sub_label is None:
+                    continue
+                sub_value = sub.get('value')
+                field_map.setdefault(
+                    field_key(section, f"{label}/{sub_label}"),
+                    str(sub_value) if sub_value is not None else None
+                )
+    return field_map
+
+class FieldIndex:
+    """Per-file cache of flattened analysis JSON, refreshed when a file changes on disk."""
+
+    def __init__(self, max_files: Optional[int] = None):
+        """
+        Args:
+            max_files: Optional bound on the number of cached files (least recently used are evicted)
+        """
+        self.max_files = max_files
+        self._cache: "OrderedDict[str, Tuple[Tuple[int, int], FieldMap]]" = OrderedDict()
+
+    def get(self, json_path: Union[str, Path]) -> FieldMap:
+        """Return the flattened field map of an analysis JSON file"""
+        key = str(json_path)
+        stat = Path(json_path).stat()
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        cached = self._cache.get(key)
+        if cached and cached[0] == signature:
+            self._cache.move_to_end(key)
+            return cached[1]
+
+        field_map = flatten_analysis(load_analysis_json(json_path))
+        self._cache[key] = (signature, field_map)
+        self._cache.move_to_end(key)
+        if self.max_files is not None:
+            while len(self._cache) > self.max_files:
+                self._cache.popitem(last=False)
+        return field_map
+
+    def clear(self) -> None:
+        """Drop all cached field maps"""
+        self._cache.clear()
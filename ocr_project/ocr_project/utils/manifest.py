@@ -0,0 +1,78 @@
+import csv
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+MANIFEST_COLUMNS = ['filename', 'file', 'page', 'seed', 'sha256', 'shard']
+
+def shard_name(index: int, shard_size: int) -> str:
+    """Name of the shard directory of a form index, or "" when output is not sharded"""
+    if shard_size <= 0:
+        return ""
+    return f"shard_{index // shard_size:04d}"
+
+def read_manifest(path: Union[str, Path]) -> List[Dict[str, str]]:
+    """Read the manifest rows of a generated corpus, in form order"""
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        return list(csv.DictReader(f))
+
+def manifest_entries(path: Union[str, Path], base_dir: Optional[Path] = None) -> List[Tuple[Path, int, str]]:
+    """
+    Resolve the forms listed in a manifest
+
+    Args:
+        path: Manifest CSV path
+        base_dir: Directory the "file" column is relative to. Defaults to the manifest's directory
+
+    Returns:
+        (file path, page index, form filename) tuples in manifest order; the file is
+        either the form's own PDF (page 0) or a bundle holding it
+    """
+    base_dir = Path(base_dir or Path(path).parent)
+    return [
+        (base_dir / row['file'], int(row.get('page') or 0), row['filename'])
+        for row in read_manifest(path)
+    ]
+
+class ManifestWriter:
+    """
+    Append-only writer for the corpus manifest (filename, file, page, seed, sha256, shard).
+
+    "file" is the PDF or bundle path relative to the generated PDFs directory and
+    "page" the form's index in it (always 0 for single form PDFs). When resuming,
+    only the rows of forms listed in keep are carried over.
+    """
+
+    def __init__(self, path: Union[str, Path], keep: Optional[Iterable[str]] = None):
+        """
+        Args:
+            path: Manifest CSV path
+            keep: Filenames whose existing rows are kept; None starts a new manifest
+        """
+        self.path = Path(path)
+        rows = []
+        if keep is not None and self.path.exists():
+            keep = set(keep)
+            rows = [row for row in read_manifest(self.path) if row['filename'] in keep]
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'w', encoding='utf-8', newline='')
+        self._writer = csv.DictWriter(self._file, fieldnames=MANIFEST_COLUMNS, lineterminator='\n')
+        self._writer.writeheader()
+        self._writer.writerows(rows)
+        self._file.flush()
+
+    def write(self, filename: str, file: str, page: int, seed: int, sha256: str, shard: str) -> None:
+        """Append the manifest row of one generated form"""
+        self._writer.writerow({
+            'filename': filename, 'file': file, 'page': page, 'seed': seed, 'sha256': sha256, 'shard': shard
+        })
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> 'ManifestWriter':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
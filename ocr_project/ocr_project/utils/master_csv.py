@@ -0,0 +1,96 @@
+import csv
+from pathlib import Path
+from typing import Callable, Hashable, Iterable, List, Optional, Set, Tuple, Union
+
+MASTER_COLUMNS = ['filename', 'section|field|value']
+
+class MasterCSVWriter:
+    """
+    Append-only writer for master_data.csv, one form at a time.
+
+    Rows are flushed after every form, so an interrupted run keeps everything
+    written so far. With resume=True an existing file is kept: a partially
+    written trailing line is cut off, and the rows of the last form in the file
+    are dropped too, since that form may not have been written completely.
+    """
+
+    def __init__(self, path: Union[str, Path], resume: bool = False,
+                 group: Optional[Callable[[str], Hashable]] = None):
+        """
+        Args:
+            path: Master CSV path
+            resume: Continue an existing file instead of overwriting it
+            group: Maps a filename to the unit forms are written in (e.g. its bundle).
+                   On resume all forms of the last unit are dropped, not only the last form
+        """
+        self.path = Path(path)
+        self.completed: Set[str] = set()
+
+        if resume and self._has_header():
+            self.completed = self._truncate_to_complete_forms(group)
+            self._file = open(self.path, 'a', encoding='utf-8', newline='')
+            self._writer = csv.writer(self._file, lineterminator='\n')
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, 'w', encoding='utf-8', newline='')
+            self._writer = csv.writer(self._file, lineterminator='\n')
+            self._writer.writerow(MASTER_COLUMNS)
+            self._file.flush()
+
+    def _has_header(self) -> bool:
+        """Check that the file exists and starts with a complete header line"""
+        if not self.path.exists():
+            return False
+        with open(self.path, 'rb') as f:
+            return f.readline().endswith(b'\n')
+
+    def _truncate_to_complete_forms(self, group: Optional[Callable[[str], Hashable]] = None) -> Set[str]:
+        """Cut the file back to the end of its last complete form (or group) and return the completed filenames"""
+        forms: List[Tuple[str, int]] = []  # (filename, offset of its first row)
+
+        with open(self.path, 'rb') as f:
+            offset = len(f.readline())
+            end = offset  # End of the last complete record
+            record = b''
+
+            for line in f:
+                record += line
+                offset += len(line)
+                # An odd quote count means a quoted value continues on the next line
+                if record.count(b'"') % 2 or not line.endswith(b'\n'):
+                    continue
+
+                filename = next(csv.reader([record.decode('utf-8')]))[0]
+                if not forms or forms[-1][0] != filename:
+                    forms.append((filename, end))
+                end, record = offset, b''
+
+        # Drop the last form, and with grouping every form of the last form's group
+        keep = len(forms) - 1 if forms else 0
+        if group is not None and forms:
+            last_group = group(forms[-1][0])
+            while keep > 0 and group(forms[keep - 1][0]) == last_group:
+                keep -= 1
+
+        cut = forms[keep][1] if keep < len(forms) else end
+        with open(self.path, 'r+b') as f:
+            f.truncate(cut)
+
+        return {filename for filename, _ in forms[:keep]}
+
+    def write_form(self, filename: str, records: Iterable[Tuple[str, str, str]]) -> None:
+        """Append the (section, field, value) records of one form and flush them to disk"""
+        self._writer.writerows(
+            (filename, f"{section}|{field}|{value}") for section, field, value in records
+        )
+        self._file.flush()
+        self.completed.add(filename)
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> 'MasterCSVWriter':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
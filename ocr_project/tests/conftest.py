@@ -0,0 +1,13 @@
+import pytest
+
+from ocr_project.config.settings import settings
+
+@pytest.fixture
+def generation_output(tmp_path, monkeypatch):
+    """Point the generated PDFs, master CSV and manifest at a temporary directory"""
+    pdfs_dir = tmp_path / "generated_pdfs"
+    pdfs_dir.mkdir()
+    monkeypatch.setattr(settings, "GENERATED_PDFS_DIR", pdfs_dir)
+    monkeypatch.setattr(settings, "MASTER_DATA_CSV", tmp_path / "master_data.csv")
+    monkeypatch.setattr(settings, "GENERATION_MANIFEST", pdfs_dir / "manifest.csv")
+    return tmp_path
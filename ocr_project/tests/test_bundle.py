@@ -0,0 +1,34 @@
+import fitz  # PyMuPDF
+import pytest
+
+from ocr_project.utils.bundle import bundle_filename, open_bundle_writer, open_form_page
+from ocr_project.utils.manifest import ManifestWriter, manifest_entries
+
+def _form_pdf(text):
+    with fitz.open() as document:
+        document.new_page().insert_text((72, 72), text)
+        return document.tobytes()
+
+@pytest.mark.parametrize('bundle_format', ['pdf', 'zip'])
+def test_bundle_round_trip_through_manifest(tmp_path, bundle_format):
+    """Every form listed in the manifest opens to its own page inside the bundle"""
+    bundle = bundle_filename(0, bundle_format)
+    writer = open_bundle_writer(tmp_path / bundle, bundle_format)
+    with ManifestWriter(tmp_path / "manifest.csv") as manifest:
+        for i in range(3):
+            name = f'form_{i}.pdf'
+            page = writer.add(name, _form_pdf(name))
+            manifest.write(name, bundle, page, i, '', '')
+    writer.close()
+    assert not list(tmp_path.glob('*.tmp'))
+
+    entries = manifest_entries(tmp_path / "manifest.csv")
+    assert [(path.name, page) for path, page, _ in entries] == [(bundle, i) for i in range(3)]
+    for path, page, name in entries:
+        document, index = open_form_page(path, page)
+        with document:
+            assert document[index].get_text().strip() == name
+
+def test_unknown_bundle_format(tmp_path):
+    with pytest.raises(ValueError):
+        open_bundle_writer(tmp_path / 'bundle.tar', 'tar')
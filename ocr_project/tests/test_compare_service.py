@@ -0,0 +1,100 @@
+import csv
+import json
+
+import pandas as pd
+import pytest
+
+from ocr_project.config.settings import settings
+from ocr_project.core.result_store import ResultStore
+from ocr_project.services.compare_service import CompareService
+
+SECTION = 'פרטי התובע'
+
+# (field, expected value, extracted value)
+CASES = [
+    ('ת.ז', '123 456 789', '123456789'),
+    ('ת.ז', '123456789', '123456780'),
+    ('טלפון נייד', '050 1234567', '0501234567'),
+    ('תאריך לידה', '01/02/1990', '01.02.1990'),
+    ('תאריך לידה', '01/02/1990', '02.01.1990'),
+    ('שם המבקש', 'ישראל ישראלי', 'ישראל  ישראלי'),
+    ('כתובת', 'רחוב הרצל 1.', 'רחוב הרצל 1'),
+    ('מין/זכר', 'V', 'True'),
+    ('מין/נקבה', '', 'false'),
+    ('מין/נקבה', 'V', 'False'),
+    ('מקום התאונה/אחר', 'X', None),
+    ('אבחנה רפואית 1', 'A12', 'A12.5'),
+    ('אבחנה רפואית 2', 'B7', 'C7'),
+    ('שדה חסר', 'ערך', None),
+]
+
+def _form(field, extracted):
+    """Analysis results holding a single field (or a sub-field of an empty field)"""
+    label, _, sub_label = field.partition('/')
+    if sub_label:
+        entry = {'label': label, 'value': None, 'sub_fields': [{'label': sub_label, 'value': extracted}]}
+    else:
+        entry = {'label': label, 'value': extracted}
+    return {SECTION: {'fields': [entry] if extracted is not None else []}}
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    """A CompareService over one stored form per case and the matching master rows"""
+    monkeypatch.setattr(settings, 'MASTER_DATA_CSV', tmp_path / 'master_data.csv')
+    monkeypatch.setattr(settings, 'COMPARISON_CACHE_PATH', tmp_path / 'comparison_cache.pkl')
+    monkeypatch.setattr(settings, 'ANALYZED_FORMS_DIR', tmp_path / 'analyzed_forms')
+    settings.ANALYZED_FORMS_DIR.mkdir()
+
+    store = ResultStore(tmp_path / 'results.db')
+    with open(settings.MASTER_DATA_CSV, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['filename', 'section|field|value'])
+        for i, (field, expected, extracted) in enumerate(CASES):
+            store.save_form(f'form_{i:02d}.pdf', _form(field, extracted))
+            writer.writerow([f'form_{i:02d}.pdf', f"{SECTION}|{field}|{expected}"])
+        writer.writerow(['form_99.pdf', f"{SECTION}|ת.ז|1"])  # No stored results, filtered out
+    return CompareService(store=store)
+
+def test_vectorized_compare_matches_row_wise(service):
+    """The vectorized comparison agrees with _compare_values applied row by row"""
+    result = service.compare_data()
+    assert list(result['field']) == [field for field, _, _ in CASES]
+
+    row_wise = [
+        service._compare_values(pd.Series({'field': field, 'expected_value': expected, 'extracted_value': extracted}))
+        for field, expected, extracted in CASES
+    ]
+    assert list(result['matches']) == row_wise
+    assert row_wise == [True, False, True, True, False, True, True, True, True, False, True, True, False, False]
+
+def test_incremental_matches_full_comparison(service):
+    full = service.generate_report()
+    assert service.generate_report(incremental=True) == full
+    assert service.generate_report(incremental=True) == full  # Served from the cache
+
+    # A changed form is recompared, the others come from the cache
+    service.store.save_form('form_01.pdf', _form('ת.ז', '123456789'))
+    updated = service.generate_report(incremental=True)
+    assert updated == service.generate_report()
+    assert updated['matched_fields'] == full['matched_fields'] + 1
+
+def test_streaming_matches_full_comparison(service, tmp_path):
+    full = service.generate_report()
+    details_path = tmp_path / 'details.csv'
+    assert service.compare_streaming(details_path=details_path, chunksize=4) == full
+    assert full['total_files'] == len(CASES)
+    assert full['matched_fields'] == 9
+
+    details = pd.read_csv(details_path)
+    assert len(details) == len(CASES)
+    assert list(details['matches']) == list(service.compare_data()['matches'])
+
+def test_forms_missing_from_store_are_read_from_json(service):
+    """Results analyzed before the store existed, or whose save failed, are still compared"""
+    json_path = settings.ANALYZED_FORMS_DIR / 'form_99_analysis.json'
+    json_path.write_text(json.dumps(_form('ת.ז', '1'), ensure_ascii=False), encoding='utf-8')
+
+    result = service.compare_data()
+    assert result[result['filename'] == 'form_99.pdf']['matches'].tolist() == [True]
+    assert service.generate_report(incremental=True) == service.generate_report()
+    assert service.generate_report()['total_files'] == len(CASES) + 1
@@ -0,0 +1,34 @@
+import json
+
+from ocr_project.utils.field_index import FieldIndex, flatten_analysis
+
+FORM = {
+    'פרטי התובע': {
+        'fields': [
+            {'label': 'ת.ז', 'value': '123456789'},
+            {'label': 'מין', 'value': None, 'sub_fields': [
+                {'label': 'זכר', 'value': True},
+                {'label': 'נקבה', 'value': False}
+            ]},
+            {'label': 'ת.ז', 'value': 'duplicate'}
+        ]
+    },
+    'metadata': 'not a section'
+}
+
+def test_flatten_analysis():
+    assert flatten_analysis(FORM) == {
+        'פרטי התובע/ת.ז': '123456789',
+        'פרטי התובע/מין': None,
+        'פרטי התובע/מין/זכר': 'True',
+        'פרטי התובע/מין/נקבה': 'False'
+    }
+
+def test_field_index_reloads_changed_files(tmp_path):
+    path = tmp_path / "form_1_analysis.json"
+    path.write_text(json.dumps(FORM, ensure_ascii=False), encoding='utf-8')
+    index = FieldIndex(max_files=1)
+    assert index.get(path) is index.get(path)
+
+    path.write_text(json.dumps({'s': {'fields': [{'label': 'a', 'value': 1}]}}), encoding='utf-8')
+    assert index.get(path) == {'s/a': '1'}
@@ -0,0 +1,39 @@
+import csv
+
+import pytest
+
+from ocr_project.services import gen_files
+from ocr_project.utils.manifest import read_manifest
+
+def _run(argv):
+    gen_files.main(argv + ['--workers', '1'])
+    manifest = {row['filename']: row['sha256'] for row in read_manifest(gen_files.settings.GENERATION_MANIFEST)}
+    with open(gen_files.settings.MASTER_DATA_CSV, 'r', encoding='utf-8', newline='') as f:
+        rows = list(csv.DictReader(f))
+    return manifest, rows
+
+def _forms(manifest, rows, count):
+    names = [gen_files.form_filename(i) for i in range(count)]
+    return [manifest[name] for name in names], [row for row in rows if row['filename'] in names]
+
+@pytest.mark.parametrize('data_mode', ['faker', 'batch'])
+def test_forms_do_not_depend_on_count(generation_output, data_mode):
+    """--count 5 and --count 10 give identical forms 0-4 (block size 4 makes the last block partial)"""
+    argv = ['--seed', '7', '--data-mode', data_mode, '--block-size', '4']
+    small = _forms(*_run(argv + ['--count', '5']), 5)
+    large = _forms(*_run(argv + ['--count', '10']), 5)
+    assert small == large
+
+def test_resume_with_larger_count_keeps_forms(generation_output):
+    argv = ['--seed', '3', '--data-mode', 'batch', '--block-size', '4']
+    first, _ = _run(argv + ['--count', '5'])
+    resumed, _ = _run(argv + ['--count', '10', '--resume'])
+    fresh, _ = _run(argv + ['--count', '10'])
+    assert {name: resumed[name] for name in first} == first
+    assert resumed == fresh
+
+def test_generation_tasks_use_full_blocks():
+    args = gen_files.parse_args(['--count', '5', '--data-mode', 'batch', '--block-size', '4', '--seed', '1'])
+    tasks = gen_files._generation_tasks(args, completed=set())
+    assert [(start, size, pending) for start, _, size, pending in tasks] == [(0, 4, (0, 1, 2, 3)), (4, 4, (4,))]
+    assert tasks[1][1] == gen_files.derive_seed(1, 1)
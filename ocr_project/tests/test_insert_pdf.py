@@ -0,0 +1,24 @@
+import fitz  # PyMuPDF
+import pytest
+
+from ocr_project.config.settings import settings
+from ocr_project.processors.insert_pdf import add_elements_to_pdf
+
+ELEMENTS = [
+    {'text': 'ישראל ישראלי', 'x': 100, 'y': 100, 'font_size': 12},
+    {'text': '12/03/2024', 'x': 100, 'y': 130, 'font_size': 10},
+    {'text': '', 'x': 100, 'y': 160, 'font_size': 10},
+]
+
+@pytest.mark.parametrize('extra', ['', '©'], ids=['precomputed-subset', 'subset-per-form'])
+def test_vector_text_is_selectable(extra):
+    elements = ELEMENTS + [{'text': f'שלום{extra}', 'x': 100, 'y': 190, 'font_size': 12}]
+    with fitz.open("pdf", add_elements_to_pdf(settings.RAW_PDF_PATH, None, elements, mode="vector")) as document:
+        text = document[0].get_text()
+    # Extraction puts the right-to-left runs back in reading order
+    assert all(element['text'] in text for element in ELEMENTS)
+    assert 'שלום' in text and extra in text
+
+def test_vector_output_is_deterministic():
+    first = add_elements_to_pdf(settings.RAW_PDF_PATH, None, ELEMENTS, mode="vector")
+    assert add_elements_to_pdf(settings.RAW_PDF_PATH, None, ELEMENTS, mode="vector") == first
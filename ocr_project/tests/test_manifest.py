@@ -0,0 +1,27 @@
+from ocr_project.utils.manifest import ManifestWriter, manifest_entries, read_manifest, shard_name
+
+def test_manifest_entries_resolve_relative_to_manifest(tmp_path):
+    path = tmp_path / "manifest.csv"
+    with ManifestWriter(path) as manifest:
+        for i in range(3):
+            shard = shard_name(i, 2)
+            manifest.write(f'form_{i}.pdf', f'{shard}/form_{i}.pdf', 0, i, 'hash', shard)
+
+    assert manifest_entries(path) == [
+        (tmp_path / 'shard_0000' / 'form_0.pdf', 0, 'form_0.pdf'),
+        (tmp_path / 'shard_0000' / 'form_1.pdf', 0, 'form_1.pdf'),
+        (tmp_path / 'shard_0001' / 'form_2.pdf', 0, 'form_2.pdf'),
+    ]
+
+def test_manifest_keeps_only_listed_rows(tmp_path):
+    path = tmp_path / "manifest.csv"
+    with ManifestWriter(path) as manifest:
+        for i in range(3):
+            manifest.write(f'form_{i}.pdf', f'form_{i}.pdf', 0, i, 'hash', '')
+    with ManifestWriter(path, keep=['form_0.pdf', 'form_2.pdf']):
+        pass
+    assert [row['filename'] for row in read_manifest(path)] == ['form_0.pdf', 'form_2.pdf']
+
+def test_shard_name():
+    assert shard_name(25, 10) == 'shard_0002'
+    assert shard_name(25, 0) == ''
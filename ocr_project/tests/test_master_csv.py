@@ -0,0 +1,52 @@
+import csv
+
+from ocr_project.utils.master_csv import MASTER_COLUMNS, MasterCSVWriter
+
+def _records(filename):
+    return [('section', 'field', f'value of {filename}'), ('section', 'note', 'a\nb')]
+
+def _write(path, forms, resume=False, group=None):
+    with MasterCSVWriter(path, resume=resume, group=group) as writer:
+        for filename in forms:
+            writer.write_form(filename, _records(filename))
+        return writer.completed
+
+def _rows(path):
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        return list(csv.reader(f))
+
+def test_resume_drops_last_form_and_partial_line(tmp_path):
+    path = tmp_path / "master_data.csv"
+    _write(path, ['form_0.pdf', 'form_1.pdf', 'form_2.pdf'])
+    with open(path, 'ab') as f:
+        f.write(b'form_3.pdf,"section|field|trunc')
+
+    with MasterCSVWriter(path, resume=True) as writer:
+        assert writer.completed == {'form_0.pdf', 'form_1.pdf'}
+    rows = _rows(path)
+    assert rows[0] == MASTER_COLUMNS
+    assert [row[0] for row in rows[1:]] == ['form_0.pdf'] * 2 + ['form_1.pdf'] * 2
+    assert rows[2][1] == 'section|note|a\nb'
+
+def test_resume_drops_last_group(tmp_path):
+    path = tmp_path / "master_data.csv"
+    _write(path, [f'form_{i}.pdf' for i in range(4)])
+    completed = _write(path, [], resume=True, group=lambda name: int(name[5]) // 2)
+    assert completed == {'form_0.pdf', 'form_1.pdf'}
+
+def test_resume_then_rewrite_matches_fresh_run(tmp_path):
+    forms = [f'form_{i}.pdf' for i in range(4)]
+    fresh, resumed = tmp_path / "fresh.csv", tmp_path / "resumed.csv"
+    _write(fresh, forms)
+    _write(resumed, forms[:3])
+    with MasterCSVWriter(resumed, resume=True) as writer:
+        for filename in forms:
+            if filename not in writer.completed:
+                writer.write_form(filename, _records(filename))
+    assert resumed.read_bytes() == fresh.read_bytes()
+
+def test_resume_without_header_starts_over(tmp_path):
+    path = tmp_path / "master_data.csv"
+    path.write_bytes(b'filename,sec')
+    assert _write(path, ['form_0.pdf'], resume=True) == {'form_0.pdf'}
+    assert _rows(path)[0] == MASTER_COLUMNS
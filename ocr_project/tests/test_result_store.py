@@ -0,0 +1,76 @@
+import json
+
+import pytest
+
+from ocr_project.core.result_store import ResultStore
+from ocr_project.utils.field_index import field_key
+
+FORM = {
+    'פרטי התובע': {
+        'fields': [
+            {'label': 'ת.ז', 'value': '123456789'},
+            {'label': 'מין', 'value': None, 'sub_fields': [
+                {'label': 'זכר', 'value': True},
+                {'label': 'נקבה', 'value': False}
+            ]},
+            {'label': 'ת.ז', 'value': 'duplicate'}
+        ]
+    },
+    'metadata': 'not a section'
+}
+
+# Repeated labels keep their first value
+FIELD_MAP = {
+    'פרטי התובע/ת.ז': '123456789',
+    'פרטי התובע/מין': None,
+    'פרטי התובע/מין/זכר': 'True',
+    'פרטי התובע/מין/נקבה': 'False'
+}
+
+@pytest.fixture
+def store(tmp_path):
+    with ResultStore(tmp_path / "results.db") as store:
+        yield store
+
+def test_save_and_get_round_trip(store):
+    store.save_form('form_1.pdf', FORM)
+    assert store.get_form('form_1.pdf') == FORM
+    assert store.get_field_map('form_1.pdf') == FIELD_MAP
+    assert store.list_filenames() == ['form_1.pdf']
+
+def test_save_escaped_json_text(store):
+    escaped = '"' + json.dumps(FORM, ensure_ascii=False, indent=2).replace('"', '\\"').replace('\n', '\\n') + '"'
+    store.save_form('form_1.pdf', escaped)
+    assert store.get_form('form_1.pdf') == FORM
+
+def test_save_replaces_previous_version(store):
+    store.save_form('form_1.pdf', FORM)
+    first_hash = store.get_content_hashes()['form_1.pdf']
+    store.save_form('form_1.pdf', {'פרטי התובע': {'fields': [{'label': 'ת.ז', 'value': '1'}]}})
+    assert store.get_field_map('form_1.pdf') == {field_key('פרטי התובע', 'ת.ז'): '1'}
+    assert store.get_content_hashes()['form_1.pdf'] != first_hash
+
+def test_form_without_fields(store):
+    store.save_form('form_1.pdf', {'metadata': 'not a section'})
+    assert store.get_field_map('form_1.pdf') == {}
+
+def test_unknown_form_raises(store):
+    with pytest.raises(KeyError):
+        store.get_form('missing.pdf')
+    with pytest.raises(KeyError):
+        store.get_field_map('missing.pdf')
+
+def test_field_values_and_missing_forms(store):
+    store.save_form('form_1.pdf', FORM)
+    store.save_form('form_2.pdf', {'פרטי התובע': {'fields': [{'label': 'ת.ז', 'value': '  '}]}})
+    store.save_form('form_3.pdf', {'אחר': {'fields': [{'label': 'ת.ז', 'value': '5'}]}})
+
+    assert store.get_field_values('מין/זכר') == {'form_1.pdf': 'True'}
+    assert store.find_forms_missing('ת.ז') == ['form_2.pdf']
+    assert store.find_forms_missing('ת.ז', section='פרטי התובע') == ['form_2.pdf', 'form_3.pdf']
+
+def test_export_json(store, tmp_path):
+    store.save_form('form_1.pdf', FORM)
+    [path] = store.export_json(tmp_path / "analyzed")
+    assert path.name == 'form_1_analysis.json'
+    assert json.loads(path.read_text(encoding='utf-8')) == FORM